@@ -0,0 +1,274 @@
+"""
+Request serialization and LLM admission control.
+
+- ThreadSerializer: one chat turn per thread at a time. A few turns may wait
+  behind the running one; beyond that (or after waiting too long) callers
+  get ThreadBusyError, which the API maps to 409 Conflict.
+- IdempotencyRegistry: remembers client-supplied Idempotency-Key values for
+  a TTL so a resubmitted request is rejected instead of re-running the turn.
+- AdmissionController: caps concurrent LLM calls per worker process with a
+  bounded wait queue, so bursts queue briefly or fail fast with
+  LLMOverloadedError instead of fanning out into provider 429s.
+- request_deadline: binds an absolute deadline to the request context so
+  downstream LLM calls can bound their own timeouts and retries by it.
+
+All state is per process. Run one worker per host or put a sticky
+load balancer (by thread_id) in front when scaling out.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import (
+    LLM_ADMISSION_WAIT,
+    LLM_INFLIGHT,
+    LLM_QUEUE_DEPTH,
+    LLM_REJECTIONS,
+    THREAD_CONFLICTS,
+)
+
+logger = logging.getLogger("resume_agent.concurrency")
+
+
+class ThreadBusyError(Exception):
+    """The thread already has a running turn and its wait queue is full."""
+
+
+class DuplicateRequestError(Exception):
+    """The Idempotency-Key was already submitted within its TTL."""
+
+
+class LLMOverloadedError(Exception):
+    """No LLM slot became available within the admission limits."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request's deadline passed before the work finished."""
+
+
+# --- Request deadlines ---
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[float]:
+    """
+    Bind a deadline `seconds` from now to the current context for the block.
+
+    Nested scopes can only tighten an outer deadline, never extend it.
+
+    Yields:
+        The absolute deadline on the time.monotonic() clock
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError:
+            # Streaming generators may be resumed from a different context
+            _deadline.set(None)
+
+
+def current_deadline() -> Optional[float]:
+    """Absolute deadline (time.monotonic()) of the current request, if any."""
+    return _deadline.get()
+
+
+# --- Per-thread serialization ---
+
+@dataclass
+class _ThreadSlot:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    waiters: int = 0
+
+
+class ThreadLease:
+    """Held turn on a thread; release() is idempotent."""
+
+    def __init__(self, serializer: "ThreadSerializer", thread_id: str):
+        self._serializer = serializer
+        self.thread_id = thread_id
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._serializer._release(self.thread_id)
+
+
+class ThreadSerializer:
+    """Per-thread asyncio locks with a bounded number of waiters."""
+
+    def __init__(self, max_waiters: int, wait_timeout: float):
+        self.max_waiters = max_waiters
+        self.wait_timeout = wait_timeout
+        self._slots: Dict[str, _ThreadSlot] = {}
+
+    async def acquire(self, thread_id: str) -> ThreadLease:
+        """
+        Wait for the thread's turn.
+
+        Args:
+            thread_id: Conversation thread to serialize on
+
+        Returns:
+            ThreadLease to release once the turn (including streaming) ends
+
+        Raises:
+            ThreadBusyError: If the wait queue is full or the wait timed out
+        """
+        slot = self._slots.setdefault(thread_id, _ThreadSlot())
+        if slot.lock.locked() and slot.waiters >= self.max_waiters:
+            THREAD_CONFLICTS.inc(reason="thread_busy")
+            raise ThreadBusyError(f"Thread {thread_id} already has {slot.waiters} queued requests")
+
+        slot.waiters += 1
+        try:
+            await asyncio.wait_for(slot.lock.acquire(), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            THREAD_CONFLICTS.inc(reason="thread_busy")
+            raise ThreadBusyError(f"Timed out waiting for thread {thread_id}")
+        finally:
+            slot.waiters -= 1
+            self._discard_if_idle(thread_id, slot)
+        return ThreadLease(self, thread_id)
+
+    def _release(self, thread_id: str) -> None:
+        slot = self._slots.get(thread_id)
+        if slot is None:
+            return
+        slot.lock.release()
+        self._discard_if_idle(thread_id, slot)
+
+    def _discard_if_idle(self, thread_id: str, slot: _ThreadSlot) -> None:
+        if not slot.lock.locked() and slot.waiters == 0 and self._slots.get(thread_id) is slot:
+            del self._slots[thread_id]
+
+
+# --- Idempotency keys ---
+
+class IdempotencyRegistry:
+    """TTL-bounded set of seen idempotency keys (oldest evicted first)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def claim(self, key: str) -> None:
+        """
+        Record `key`, rejecting it if it was already claimed within the TTL.
+
+        Raises:
+            DuplicateRequestError: If the key is still live
+        """
+        now = time.monotonic()
+        while self._seen:
+            oldest, expires = next(iter(self._seen.items()))
+            if expires > now and len(self._seen) < self.max_entries:
+                break
+            del self._seen[oldest]
+
+        if key in self._seen:
+            THREAD_CONFLICTS.inc(reason="duplicate")
+            raise DuplicateRequestError(f"Duplicate request for idempotency key {key}")
+        self._seen[key] = now + self.ttl_seconds
+
+    def release(self, key: str) -> None:
+        """Forget `key` so a failed request can be retried with it."""
+        self._seen.pop(key, None)
+
+
+# --- LLM admission control ---
+
+class AdmissionController:
+    """
+    Counting semaphore for LLM calls with a bounded queue and wait deadline.
+
+    LLM calls run in worker threads (sync graph nodes), so this uses
+    threading primitives rather than asyncio ones.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, max_wait: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def saturated(self) -> bool:
+        """True when new calls would be rejected immediately."""
+        return self._waiting >= self.max_queue
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Hold an LLM slot for the duration of the block.
+
+        Raises:
+            LLMOverloadedError: If the queue is full or no slot frees up
+                within max_wait seconds
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    LLM_REJECTIONS.inc(reason="queue_full")
+                    logger.warning(f"LLM admission rejected: {self._waiting} calls already queued")
+                    raise LLMOverloadedError("LLM queue is full")
+                self._waiting += 1
+                LLM_QUEUE_DEPTH.set(self._waiting)
+
+            start = time.perf_counter()
+            try:
+                acquired = self._slots.acquire(timeout=self.max_wait)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+                    LLM_QUEUE_DEPTH.set(self._waiting)
+            LLM_ADMISSION_WAIT.observe(time.perf_counter() - start)
+            if not acquired:
+                LLM_REJECTIONS.inc(reason="timeout")
+                logger.warning(f"LLM admission timed out after {self.max_wait}s")
+                raise LLMOverloadedError(f"No LLM slot available after {self.max_wait}s")
+        else:
+            LLM_ADMISSION_WAIT.observe(0.0)
+
+        LLM_INFLIGHT.inc()
+        try:
+            yield
+        finally:
+            LLM_INFLIGHT.dec()
+            self._slots.release()
+
+
+_settings = get_settings()
+
+thread_serializer = ThreadSerializer(
+    max_waiters=_settings.THREAD_QUEUE_LIMIT,
+    wait_timeout=_settings.THREAD_QUEUE_TIMEOUT,
+)
+idempotency_keys = IdempotencyRegistry(ttl_seconds=_settings.IDEMPOTENCY_TTL_SECONDS)
+llm_admission = AdmissionController(
+    max_concurrency=_settings.LLM_MAX_CONCURRENCY,
+    max_queue=_settings.LLM_MAX_QUEUE,
+    max_wait=_settings.LLM_MAX_QUEUE_WAIT,
+)
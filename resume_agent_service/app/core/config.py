@@ -19,6 +19,104 @@ class Settings(BaseSettings):
     GROQ_API_KEY: Optional[str] = os.getenv("GROQ_API_KEY")
     API_SECRET: str = os.getenv("API_SECRET", "default_secret_change_me")
 
+    # Concurrency & Admission Control
+    THREAD_QUEUE_LIMIT: int = 2            # requests allowed to wait behind the running turn
+    THREAD_QUEUE_TIMEOUT: float = 30.0     # seconds a queued turn waits before 409
+    IDEMPOTENCY_TTL_SECONDS: float = 600.0
+    LLM_MAX_CONCURRENCY: int = 8           # concurrent LLM calls per worker
+    LLM_MAX_QUEUE: int = 32                # calls allowed to wait for a slot
+    LLM_MAX_QUEUE_WAIT: float = 10.0       # seconds before a queued call is rejected
+
+    # LLM Gateway
+    REQUEST_DEADLINE_SECONDS: float = 90.0  # budget for a whole chat turn or upload
+    LLM_CALL_TIMEOUT: float = 45.0          # per LLM call, including retries
+    LLM_MAX_RETRIES: int = 2                # retries on transient errors before the first token
+    LLM_RETRY_BASE_DELAY: float = 0.5
+    LLM_RETRY_MAX_DELAY: float = 8.0
+    LLM_HEDGE_AFTER: float = 0.0            # start a backup chat call if no token after N s (0 = off)
+    GEMINI_RPM: float = 60.0                # provider quotas for the token-bucket limiter
+    GEMINI_BURST: int = 10
+    GROQ_RPM: float = 30.0
+    GROQ_BURST: int = 5
+
+    # Tool Execution
+    TOOL_TIMEOUT: float = 15.0              # per tool call; the model gets a fallback message after this
+    WEB_SEARCH_TOOL_TIMEOUT: float = 8.0    # job_search_tool / career_advice_search (and job recommendations)
+
+    # Streaming
+    SSE_FLUSH_INTERVAL_MS: float = 20.0     # longest a streamed token is held for coalescing (0 = frame per token)
+    SSE_FLUSH_BYTES: int = 256              # flush a token frame once this many characters are pending
+    STREAM_REPLAY_MAX_EVENTS: int = 1000    # frames kept per stream for Last-Event-ID reconnects
+    STREAM_REPLAY_TTL_SECONDS: float = 120.0  # finished streams stay replayable this long
+
+    # Embeddings
+    EMBEDDING_WORKERS: int = 0              # processes running the embedding model (0 = in the API process)
+    EMBEDDING_WORKER_BATCH: int = 32        # most texts per worker task; bigger batches use several workers
+
+    # Storage
+    STORAGE_BACKEND: str = "mongo"          # mongo, or sqlite for single-node / edge / CI (one local file)
+    SQLITE_PATH: str = "resume_agent.db"    # database file of the sqlite backend (WAL mode)
+    SQLITE_BUSY_TIMEOUT: float = 5.0        # seconds a write waits for the database lock
+
+    # Checkpoint Storage
+    CHECKPOINT_COMPRESSION: str = "zstd"    # zstd, zlib or none (compressed checkpoints stay readable)
+    CHECKPOINT_COMPRESSION_MIN_BYTES: int = 1024  # smaller payloads are stored as is
+
+    # Checkpoint Retention (python -m app.memory.checkpoint_compaction)
+    CHECKPOINT_KEEP_LATEST: int = 10        # newest checkpoints kept per thread (the newest is the live state)
+    CHECKPOINT_MAX_AGE_DAYS: float = 90.0   # threads idle this long lose their conversation (0 = never)
+    CHECKPOINT_COMPACTION_BATCH: int = 500  # documents fetched and deleted per round trip
+    CHECKPOINT_COMPACTION_PAUSE: float = 0.05  # seconds between delete batches
+
+    # Thread Cleanup (DELETE /threads/{id}, python -m app.services.thread_cleanup)
+    THREAD_DELETE_BATCH: int = 100          # threads removed per delete_many round
+    ORPHAN_GC_GRACE_SECONDS: float = 3600.0  # newer data is never collected (uploads in flight)
+
+    # Shared State (caches shared by the uvicorn workers of a host)
+    SHARED_STATE_BACKEND: str = "local"     # local (per process) or socket (one server for all workers)
+    SHARED_STATE_ADDRESS: str = ""          # unix socket path or host:port ("" = private runtime dir)
+    SHARED_STATE_SECRET: str = ""           # required for host:port; every connection must present it
+    SHARED_STATE_AUTOSTART: bool = True     # first worker that can't connect starts the server
+    SHARED_STATE_TIMEOUT: float = 0.25      # per operation; failures are served as cache misses
+    SHARED_STATE_THREAD_ENTRIES: int = 2000  # threads whose profile / BM25 index stay cached
+
+    # Semantic Answer Cache
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_THRESHOLD: float = 0.9     # MiniLM cosine similarity to reuse an answer
+    ANSWER_CACHE_MAX_ENTRIES: int = 5000    # LRU budget across all threads
+    ANSWER_CACHE_MAX_PER_THREAD: int = 100  # newest answers kept per thread
+
+    # Hybrid Retrieval
+    HYBRID_RETRIEVAL_ENABLED: bool = True   # BM25 + vector fusion (False = vector search only)
+    RETRIEVAL_K: int = 5                    # chunks returned per resume_rag_tool call
+    RRF_K: int = 60                         # reciprocal rank fusion constant
+    LEXICAL_ROUTE_MAX_TERMS: int = 3        # only short keyword queries may skip embedding
+    LEXICAL_ROUTE_MIN_SCORE: float = 0.3    # top BM25 score needed; terms in nearly every chunk score lower
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024  # LRU of embedded questions/queries
+    RAG_CONTEXT_MAX_TOKENS: int = 600       # budget for merged resume_rag_tool output (0 = no limit)
+
+    # Job Matching (POST /resume/{thread_id}/match)
+    MATCH_THRESHOLD: float = 0.5            # MiniLM cosine between a requirement and a chunk to count as met
+    MATCH_KEYWORD_WEIGHT: float = 0.3       # share of the score from ATS keyword overlap
+    MATCH_MAX_JOBS: int = 500               # job descriptions per request
+    MATCH_MAX_REQUIREMENTS: int = 40        # requirement lines kept per job description
+
+    # Job Recommendations (python -m app.services.job_index postings.jsonl)
+    JOB_INDEX_PATH: str = "data/job_index"  # IVF index directory; without one, job_recommendation_tool uses web search
+    JOB_INDEX_NPROBE: int = 16              # index cells scanned per search (more = better recall, slower)
+    JOB_RECOMMENDATIONS_K: int = 5          # postings returned per recommendation
+
+    # Cross-Resume Search (GET /users/{user_id}/search, resume_rag_tool all_resumes)
+    USER_SEARCH_K: int = 30                 # chunks fetched by the one vector query over all of a user's resumes
+    USER_SEARCH_PER_RESUME: int = 3         # best chunks kept per resume
+
+    # Speculative RAG Prefetch
+    RAG_PREFETCH_ENABLED: bool = True       # retrieve for the user's message during the first LLM call
+    RAG_PREFETCH_SIMILARITY: float = 0.75   # MiniLM cosine between message and tool query to reuse it
+    RAG_PREFETCH_TERM_OVERLAP: float = 0.6  # Jaccard overlap of their terms that reuses it without embedding
+    RAG_PREFETCH_WORKERS: int = 4
+    RAG_PREFETCH_TTL_SECONDS: float = 120.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,168 @@
+"""
+Embedding model in a pool of worker processes.
+
+sentence-transformers holds the GIL for much of tokenization and
+inference, so embedding a resume inside the API process slows every other
+request it serves, even from a thread pool. With EMBEDDING_WORKERS > 0,
+`PooledEmbeddings` runs the model in that many spawned processes instead,
+each loading it once at start-up.
+
+Batches are handed over through shared memory. The parent packs the
+texts' UTF-8 bytes behind an offset table in one block and allocates a
+float32 output block of rows x dimension; each task carries only the
+block names and its row range, reads its texts in place and writes its
+vectors in place, so neither texts nor vectors are pickled. A batch is
+split into tasks of at most EMBEDDING_WORKER_BATCH rows, spread over all
+workers, so large batches use every core.
+
+Each uvicorn worker owns its own pool; size EMBEDDING_WORKERS for the host.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger("resume_agent.embedding_pool")
+
+_OFFSET = np.dtype(np.int64)
+
+# The model loaded by this worker process (see _init_worker)
+_model: Any = None
+
+
+def _init_worker(factory: Callable[[], Any], threads: int) -> None:
+    """Load the model once per worker, with the cores split between workers."""
+    global _model
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _model = factory()
+
+
+def _dimension() -> int:
+    return len(_model.embed_query("dimension"))
+
+
+def _embed_query(text: str) -> List[float]:
+    return list(_model.embed_query(text))
+
+
+def _embed_rows(texts_name: str, count: int, out_name: str, dim: int, start: int, stop: int) -> None:
+    """Embed texts [start, stop) of the shared input block into the same rows of the output block."""
+    texts_block = SharedMemory(name=texts_name)
+    out_block = SharedMemory(name=out_name)
+    try:
+        offsets = np.ndarray((count + 1,), dtype=_OFFSET, buffer=texts_block.buf)
+        base = offsets.nbytes
+        texts = [
+            bytes(texts_block.buf[base + offsets[i]:base + offsets[i + 1]]).decode("utf-8")
+            for i in range(start, stop)
+        ]
+        del offsets
+        vectors = np.ndarray((count, dim), dtype=np.float32, buffer=out_block.buf)
+        vectors[start:stop] = np.asarray(_model.embed_documents(texts), dtype=np.float32)
+        del vectors
+    finally:
+        texts_block.close()
+        out_block.close()
+
+
+@contextmanager
+def _shared_block(size: int) -> Iterator[SharedMemory]:
+    block = SharedMemory(create=True, size=max(size, 1))
+    try:
+        yield block
+    finally:
+        block.close()
+        block.unlink()
+
+
+class PooledEmbeddings(Embeddings):
+    """
+    Embeddings computed by a pool of worker processes.
+
+    Attributes:
+        factory: Picklable callable that builds the model in each worker
+        workers: Worker processes
+        batch_size: Most texts per task
+    """
+
+    def __init__(self, factory: Callable[[], Any], workers: int, batch_size: int = 32):
+        self.factory = factory
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self._dim: Optional[int] = None
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the API process holds threads, sockets and Mongo clients
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.factory, threads),
+        )
+
+    def _run(self, func: Callable, *args: Any) -> List[Any]:
+        """Run one task per args tuple and wait for all; restarts the pool if a worker died."""
+        try:
+            futures = [self._executor.submit(func, *task) for task in args]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            logger.error("Embedding worker died; restarting the pool")
+            with self._lock:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+            raise
+
+    @property
+    def dimension(self) -> int:
+        """Embedding size, asked from a worker once."""
+        if self._dim is None:
+            self._dim = self._run(_dimension, ())[0]
+        return self._dim
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch across the workers, passing texts and vectors through shared memory."""
+        count = len(texts)
+        if not count:
+            return []
+        dim = self.dimension
+        encoded = [text.encode("utf-8") for text in texts]
+        offsets = np.zeros(count + 1, dtype=_OFFSET)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        size = min(self.batch_size, -(-count // self.workers))
+
+        with _shared_block(offsets.nbytes + int(offsets[-1])) as texts_block, \
+                _shared_block(count * dim * 4) as out_block:
+            texts_block.buf[:offsets.nbytes] = offsets.tobytes()
+            texts_block.buf[offsets.nbytes:offsets.nbytes + int(offsets[-1])] = b"".join(encoded)
+            self._run(_embed_rows, *[
+                (texts_block.name, count, out_block.name, dim, start, min(start + size, count))
+                for start in range(0, count, size)
+            ])
+            vectors = np.ndarray((count, dim), dtype=np.float32, buffer=out_block.buf)
+            result = vectors.tolist()
+            del vectors
+        return result
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed one query in a worker (small enough to pickle)."""
+        return self._run(_embed_query, (text,))[0]
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,365 @@
+"""
+Lightweight Prometheus metrics for the Resume Agent service.
+
+Histograms and counters are plain Python objects updated without locks.
+Each observation is a bucket lookup plus a couple of in-place increments,
+so the instrumentation is cheap enough to leave on in production. Under
+heavy thread contention an increment can occasionally be lost, which is
+an acceptable trade-off for latency telemetry.
+"""
+from __future__ import annotations
+
+import bisect
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.timing import record_span
+
+# Latency buckets (seconds) covering sub-millisecond Mongo reads up to
+# multi-second LLM calls.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_REGISTRY: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding the name, help text and label names of a metric."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _child(self, labels: Dict[str, str]):
+        key = self._key(labels)
+        child = self._children.get(key)
+        if child is None:
+            # setdefault keeps the first child if two threads race here
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for key, child in list(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key: Tuple[str, ...], child) -> List[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self._child(labels).value += amount
+
+    def value(self, **labels: str) -> float:
+        child = self._children.get(self._key(labels))
+        return child.value if child else 0.0
+
+    def _render_child(self, key, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (queue depths, in-flight calls)."""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def set(self, value: float, **labels: str) -> None:
+        self._child(labels).value = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self._child(labels).value += amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self._child(labels).value -= amount
+
+    def value(self, **labels: str) -> float:
+        child = self._children.get(self._key(labels))
+        return child.value if child else 0.0
+
+    def _render_child(self, key, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class _HistogramChild:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket latency histogram rendered in Prometheus cumulative form.
+
+    If `span` is set (a format string over the label names, e.g. "{stage}"),
+    each observation is also recorded as a span on the current request's
+    timing breakdown.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        span: Optional[str] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.span = span
+
+    def _new_child(self):
+        # One slot per finite bucket plus the implicit +Inf bucket
+        return _HistogramChild(len(self.buckets) + 1)
+
+    def observe(self, value: float, **labels: str) -> None:
+        child = self._child(labels)
+        child.counts[bisect.bisect_left(self.buckets, value)] += 1
+        child.sum += value
+        if self.span is not None:
+            record_span(self.span.format(**labels), value)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the wrapped block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_child(self, key, child) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def timed(histogram: Histogram, **labels: str) -> Callable:
+    """
+    Decorator that records each call's duration in `histogram`.
+
+    Uses functools.wraps so LangChain's @tool still sees the original
+    signature and docstring when stacked underneath it.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- Service metrics ---
+
+STAGE_LATENCY = Histogram(
+    "resume_agent_stage_duration_seconds",
+    "Duration of resume ingest and scoring pipeline stages.",
+    ["stage"],
+    span="{stage}",
+)
+
+LLM_CALL_LATENCY = Histogram(
+    "resume_agent_llm_call_duration_seconds",
+    "Duration of individual LLM calls by call site.",
+    ["call"],
+    span="llm-{call}",
+)
+
+TOOL_LATENCY = Histogram(
+    "resume_agent_tool_duration_seconds",
+    "Duration of agent tool executions.",
+    ["tool"],
+)
+
+TOOL_CALLS = Counter(
+    "resume_agent_tool_calls_total",
+    "Agent tool calls by tool and result (ok, error or timeout).",
+    ["tool", "result"],
+)
+
+MONGO_LATENCY = Histogram(
+    "resume_agent_mongo_operation_duration_seconds",
+    "Duration of MongoDB operations by collection and operation.",
+    ["collection", "operation"],
+    span="mongo",
+)
+
+SQLITE_LATENCY = Histogram(
+    "resume_agent_sqlite_operation_duration_seconds",
+    "Duration of SQLite storage operations by table and operation (STORAGE_BACKEND=sqlite).",
+    ["collection", "operation"],
+    span="sqlite",
+)
+
+TOKENS_STREAMED = Counter(
+    "resume_agent_tokens_streamed_total",
+    "Model tokens streamed to clients over /chat/stream.",
+)
+
+SHARED_STATE_FAILURES = Counter(
+    "resume_agent_shared_state_failures_total",
+    "Shared state operations that failed open (served as a cache miss) by operation.",
+    ["op"],
+)
+
+STREAM_RESUMES = Counter(
+    "resume_agent_stream_resumes_total",
+    "Reconnects to /chat/stream by outcome (attached to a running turn, replayed a finished one, or expired).",
+    ["result"],
+)
+
+SSE_FRAMES = Counter(
+    "resume_agent_sse_frames_total",
+    "SSE frames written on /chat/stream by kind (token frames carry one or more coalesced tokens).",
+    ["kind"],
+)
+
+CLEANUP_DOCUMENTS = Counter(
+    "resume_agent_cleanup_documents_total",
+    "Documents removed by collection and reason (deleted with a thread, or orphan GC).",
+    ["collection", "reason"],
+)
+
+CACHE_REQUESTS = Counter(
+    "resume_agent_cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ["cache", "result"],
+)
+
+RETRIEVAL_ROUTES = Counter(
+    "resume_agent_retrieval_routes_total",
+    "Resume retrievals by route (lexical = BM25 only, hybrid = BM25 + vector, vector).",
+    ["route"],
+)
+
+RAG_PREFETCH = Counter(
+    "resume_agent_rag_prefetch_total",
+    "Speculative resume retrievals by outcome (hit, miss or wasted).",
+    ["result"],
+)
+
+JOB_RECOMMENDATIONS = Counter(
+    "resume_agent_job_recommendations_total",
+    "job_recommendation_tool answers by source (index = local job index, web = search fallback).",
+    ["source"],
+)
+
+LLM_QUEUE_DEPTH = Gauge(
+    "resume_agent_llm_queue_depth",
+    "LLM calls waiting for an admission slot.",
+)
+
+LLM_INFLIGHT = Gauge(
+    "resume_agent_llm_inflight",
+    "LLM calls currently holding an admission slot.",
+)
+
+LLM_ADMISSION_WAIT = Histogram(
+    "resume_agent_llm_admission_wait_seconds",
+    "Time LLM calls spent waiting for an admission slot.",
+)
+
+LLM_REJECTIONS = Counter(
+    "resume_agent_llm_rejections_total",
+    "LLM calls rejected or abandoned, by reason (queue_full, timeout, rate_limited or deadline).",
+    ["reason"],
+)
+
+THREAD_CONFLICTS = Counter(
+    "resume_agent_thread_conflicts_total",
+    "Requests rejected with 409, by reason (thread_busy or duplicate).",
+    ["reason"],
+)
+
+LLM_RETRIES = Counter(
+    "resume_agent_llm_retries_total",
+    "LLM call attempts retried after a transient error, by provider.",
+    ["provider"],
+)
+
+LLM_HEDGES = Counter(
+    "resume_agent_llm_hedges_total",
+    "Hedged (backup) LLM calls by provider and result (launched or won).",
+    ["provider", "result"],
+)
+
+LLM_RATE_LIMIT_WAIT = Histogram(
+    "resume_agent_llm_rate_limit_wait_seconds",
+    "Time LLM calls waited on the provider token bucket.",
+    ["provider"],
+)
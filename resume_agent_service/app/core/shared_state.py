@@ -0,0 +1,548 @@
+"""
+Shared state and cache tier for multi-worker deployments.
+
+Caches that used to be module-level dicts (thread profiles, BM25 indexes,
+query embeddings, cached answers) live behind one `SharedState` backend:
+
+- local: an in-process LRU store. The default, and what tests and
+  single-worker deployments use.
+- socket: the same store served over a unix socket (or host:port) to
+  every uvicorn worker on the host, so a question embedded or answered by
+  one worker is a cache hit on all of them. The first worker that can't
+  connect starts the server in a daemon thread (a lock file makes sure
+  only one does); `python -m app.core.shared_state` runs it standalone.
+
+The store holds cached answers served verbatim to users, so access is
+restricted to the service's OS user: the default socket lives in a 0700
+runtime directory, the socket itself is 0600 and clients refuse a socket
+owned by anyone else. TCP has no such protection and requires
+SHARED_STATE_SECRET, which every connection must present first.
+
+Objects that can't be shared (built retrievers holding Mongo handles) stay
+per process. `invalidate_thread()` drops a thread's shared entries and
+broadcasts the thread id to every worker, whose `on_invalidate` callbacks
+drop their local copies, so a re-uploaded resume is seen everywhere.
+
+Everything in the tier is a cache over MongoDB: when the socket server is
+unreachable, operations fail open (a miss, a dropped write) and the
+client retries the connection after a short back-off.
+"""
+import argparse
+import errno
+import fcntl
+import hmac
+import logging
+import os
+import queue
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import ormsgpack
+
+from app.core.config import get_settings
+from app.core.metrics import SHARED_STATE_FAILURES
+
+logger = logging.getLogger("resume_agent.shared_state")
+
+settings = get_settings()
+
+# Namespaces keyed by thread_id; invalidate_thread() clears these
+THREAD_NAMESPACES = ("profile", "lexical_index", "answers")
+
+# Entry budget per namespace (for "answers", counted in stored answers, not threads)
+NAMESPACE_LIMITS: Dict[str, int] = {
+    "profile": settings.SHARED_STATE_THREAD_ENTRIES,
+    "lexical_index": settings.SHARED_STATE_THREAD_ENTRIES,
+    "query_embedding": settings.QUERY_EMBEDDING_CACHE_SIZE,
+    "answers": settings.ANSWER_CACHE_MAX_ENTRIES,
+}
+
+_HEADER = struct.Struct("!I")
+
+# Longest a broadcast waits on one subscriber before dropping it
+_BROADCAST_TIMEOUT = 1.0
+
+
+class _Store:
+    """Per-namespace LRU maps. Values are plain msgpack-able data."""
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self._data: Dict[str, "OrderedDict[str, Any]"] = {}
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        return len(value) if isinstance(value, OrderedDict) else 1
+
+    def _entries(self, namespace: str) -> "OrderedDict[str, Any]":
+        return self._data.setdefault(namespace, OrderedDict())
+
+    def _put(self, namespace: str, key: str, value: Any) -> None:
+        entries = self._entries(namespace)
+        old = entries.pop(key, None)
+        entries[key] = value
+        size = self._sizes.get(namespace, 0) - (self._size(old) if old is not None else 0) + self._size(value)
+        limit = self.limits.get(namespace, 10_000)
+        while size > limit and len(entries) > 1:
+            _, evicted = entries.popitem(last=False)
+            size -= self._size(evicted)
+        self._sizes[namespace] = size
+
+    def get(self, namespace: str, key: str) -> Any:
+        with self._lock:
+            entries = self._data.get(namespace)
+            if not entries or key not in entries:
+                return None
+            entries.move_to_end(key)
+            value = entries[key]
+            return list(value.values()) if isinstance(value, OrderedDict) else value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._put(namespace, key, value)
+
+    def add(self, namespace: str, key: str, item_key: str, item: Any, limit: int) -> None:
+        with self._lock:
+            items = self._entries(namespace).get(key)
+            items = OrderedDict(items) if items is not None else OrderedDict()
+            items.pop(item_key, None)
+            items[item_key] = item
+            while len(items) > max(1, limit):
+                items.popitem(last=False)
+            self._put(namespace, key, items)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            old = self._data.get(namespace, {}).pop(key, None)
+            if old is not None:
+                self._sizes[namespace] -= self._size(old)
+
+    def invalidate_thread(self, thread_id: str) -> None:
+        for namespace in THREAD_NAMESPACES:
+            self.delete(namespace, thread_id)
+
+
+class SharedState(ABC):
+    """Interface of the shared tier (see module docstring)."""
+
+    def __init__(self):
+        self._callbacks: List[Callable[[str], None]] = []
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Any:
+        """Value stored under `key`, or None (also on backend failure)."""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Store `value`, evicting the namespace's least recently used entries."""
+
+    @abstractmethod
+    def add(self, namespace: str, key: str, item_key: str, item: Any, limit: int) -> None:
+        """Insert `item` into the list stored under `key`, keeping its newest `limit` items."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove `key` from the namespace."""
+
+    @abstractmethod
+    def invalidate_thread(self, thread_id: str) -> None:
+        """Drop a thread's entries everywhere and run every worker's invalidation callbacks."""
+
+    def on_invalidate(self, callback: Callable[[str], None]) -> None:
+        """Register a callback run with the thread id whenever a thread is invalidated."""
+        self._callbacks.append(callback)
+
+    def _run_callbacks(self, thread_id: str) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(thread_id)
+            except Exception as e:
+                logger.error(f"Invalidation callback failed for thread {thread_id}: {str(e)}")
+
+
+class LocalState(SharedState):
+    """In-process backend: one store per worker."""
+
+    def __init__(self, limits: Dict[str, int]):
+        super().__init__()
+        self._store = _Store(limits)
+
+    def get(self, namespace: str, key: str) -> Any:
+        return self._store.get(namespace, key)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        self._store.set(namespace, key, value)
+
+    def add(self, namespace: str, key: str, item_key: str, item: Any, limit: int) -> None:
+        self._store.add(namespace, key, item_key, item, limit)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._store.delete(namespace, key)
+
+    def invalidate_thread(self, thread_id: str) -> None:
+        self._store.invalidate_thread(thread_id)
+        self._run_callbacks(thread_id)
+
+
+# --- Socket protocol: 4-byte length + msgpack [op, *args] / [ok, result] ---
+
+def _send(sock: socket.socket, message: Any) -> None:
+    payload = ormsgpack.packb(message)
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("shared state connection closed")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def _recv(sock: socket.socket) -> Any:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return ormsgpack.unpackb(_recv_exact(sock, size))
+
+
+def _parse_address(address: str) -> Tuple[int, Any]:
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+def resolve_address(address: str) -> str:
+    """
+    The configured address, or by default `state.sock` in a private runtime
+    directory ($XDG_RUNTIME_DIR/resume_agent, else /tmp/resume_agent-<uid>),
+    created 0700.
+
+    Raises:
+        PermissionError: If the default directory exists but isn't private to this user
+    """
+    if address:
+        return address
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    directory = (os.path.join(runtime_dir, "resume_agent") if runtime_dir
+                 else os.path.join(tempfile.gettempdir(), f"resume_agent-{os.getuid()}"))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory owned by this user with mode 0700")
+    return os.path.join(directory, "state.sock")
+
+
+def _check_secret(family: int, secret: str) -> None:
+    if family != socket.AF_UNIX and not secret:
+        raise ValueError("A TCP shared state address requires SHARED_STATE_SECRET")
+
+
+class _StateServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Serves one _Store to all workers; pushes invalidations to subscribers."""
+
+    daemon_threads = True
+
+    def __init__(self, listener: socket.socket, limits: Dict[str, int], lock_file=None, secret: str = ""):
+        super().__init__(listener.getsockname(), _StateHandler, bind_and_activate=False)
+        # Serve on the already bound (unix or TCP) listener
+        self.socket.close()
+        self.socket = listener
+        # Held for the life of the server; the OS releases it if the process dies
+        self.lock_file = lock_file
+        self.secret = secret
+        self.store = _Store(limits)
+        # Subscriber socket -> lock serializing pushes to it
+        self.subscribers: Dict[socket.socket, threading.Lock] = {}
+        self.subscribers_lock = threading.Lock()
+
+    def broadcast(self, message: Any) -> None:
+        # Sent outside subscribers_lock, each with a timeout, so a stalled worker
+        # only delays its own pushes and is dropped
+        with self.subscribers_lock:
+            subscribers = list(self.subscribers.items())
+        for subscriber, send_lock in subscribers:
+            try:
+                with send_lock:
+                    _send(subscriber, message)
+            except OSError:
+                with self.subscribers_lock:
+                    self.subscribers.pop(subscriber, None)
+                subscriber.close()
+
+
+class _StateHandler(socketserver.BaseRequestHandler):
+
+    def handle(self) -> None:
+        server: _StateServer = self.server
+        store = server.store
+        sock: socket.socket = self.request
+        if server.secret:
+            # The first message must be ["auth", secret]
+            try:
+                request = _recv(sock)
+            except (ConnectionError, OSError, ValueError):
+                return
+            if not (isinstance(request, list) and len(request) == 2 and request[0] == "auth"
+                    and hmac.compare_digest(str(request[1]).encode(), server.secret.encode())):
+                logger.warning("Shared state connection rejected: bad secret")
+                return
+            _send(sock, [True, None])
+        while True:
+            try:
+                request = _recv(sock)
+            except (ConnectionError, OSError):
+                return
+            op, args = request[0], request[1:]
+            if op == "subscribe":
+                _send(sock, [True, None])
+                sock.settimeout(_BROADCAST_TIMEOUT)
+                with server.subscribers_lock:
+                    server.subscribers[sock] = threading.Lock()
+                # The connection now only receives pushes; keep it open until the worker goes away
+                while True:
+                    try:
+                        if not sock.recv(1):
+                            break
+                    except socket.timeout:
+                        continue
+                    except OSError:
+                        break
+                with server.subscribers_lock:
+                    server.subscribers.pop(sock, None)
+                return
+            try:
+                if op == "get":
+                    result = store.get(*args)
+                elif op == "set":
+                    result = store.set(*args)
+                elif op == "add":
+                    result = store.add(*args)
+                elif op == "delete":
+                    result = store.delete(*args)
+                elif op == "invalidate":
+                    thread_id, origin = args
+                    store.invalidate_thread(thread_id)
+                    server.broadcast(["invalidate", thread_id, origin])
+                    result = None
+                else:
+                    raise ValueError(f"unknown op {op}")
+                _send(sock, [True, result])
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                _send(sock, [False, str(e)])
+
+
+def bind_server(address: str, limits: Dict[str, int], secret: str = "") -> Optional[_StateServer]:
+    """
+    Bind the shared state server to `address` (call serve_forever() to run it).
+
+    For unix sockets, an exclusive lock on `<address>.lock` elects a single
+    server per host; a stale socket file left by a dead server is replaced.
+    The socket is made 0600.
+
+    Args:
+        address: Unix socket path or host:port
+        limits: Namespace entry budgets
+        secret: Shared secret clients must present (required for TCP)
+
+    Returns:
+        The bound server, or None if another process already serves `address`
+
+    Raises:
+        ValueError: For a TCP address without a secret
+    """
+    family, bind_address = _parse_address(address)
+    _check_secret(family, secret)
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    lock_file = None
+    try:
+        if family == socket.AF_UNIX:
+            lock_file = os.fdopen(os.open(f"{address}.lock", os.O_WRONLY | os.O_CREAT, 0o600), "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                listener.close()
+                return None
+            if os.path.exists(address):
+                os.remove(address)
+        else:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(bind_address)
+        if family == socket.AF_UNIX:
+            os.chmod(address, 0o600)
+        listener.listen(64)
+    except OSError as e:
+        listener.close()
+        if lock_file is not None:
+            lock_file.close()
+        if e.errno == errno.EADDRINUSE:
+            return None
+        raise
+    logger.info(f"Shared state server listening on {address}")
+    return _StateServer(listener, limits, lock_file, secret)
+
+
+class SocketState(SharedState):
+    """Client of the shared state server, with a small connection pool."""
+
+    def __init__(self, address: str, timeout: float, autostart: bool, secret: str = "", retry_seconds: float = 5.0):
+        super().__init__()
+        _check_secret(_parse_address(address)[0], secret)
+        self.address = address
+        self.secret = secret
+        self.timeout = timeout
+        self.autostart = autostart
+        self.retry_seconds = retry_seconds
+        self._origin = uuid4().hex
+        self._pool: "queue.LifoQueue[socket.socket]" = queue.LifoQueue()
+        self._down_until = 0.0
+        self._server: Optional[_StateServer] = None
+        self._subscriber_started = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        family, address = _parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            self._open(sock, family, address)
+        except OSError:
+            sock.close()
+            if not self.autostart:
+                raise
+            # Nobody is serving yet: become the server (only one worker wins the lock)
+            with self._lock:
+                if self._server is not None:
+                    raise
+                self._server = bind_server(self.address, NAMESPACE_LIMITS, self.secret)
+                if self._server is not None:
+                    threading.Thread(target=self._server.serve_forever, name="shared-state-server",
+                                     daemon=True).start()
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                self._open(sock, family, address)
+            except OSError:
+                sock.close()
+                raise
+        return sock
+
+    def _open(self, sock: socket.socket, family: int, address: Any) -> None:
+        """Connect, refusing a unix socket another user owns, and authenticate if a secret is set."""
+        if family == socket.AF_UNIX and os.stat(address).st_uid != os.getuid():
+            raise PermissionError(f"{address} is owned by another user")
+        sock.connect(address)
+        if self.secret:
+            _send(sock, ["auth", self.secret])
+            _recv(sock)
+
+    def _ensure_subscriber(self) -> None:
+        with self._lock:
+            if self._subscriber_started:
+                return
+            self._subscriber_started = True
+        threading.Thread(target=self._listen, name="shared-state-invalidations", daemon=True).start()
+
+    def _listen(self) -> None:
+        """Receive invalidation broadcasts for this worker, reconnecting on failure."""
+        while True:
+            try:
+                sock = self._connect()
+                _send(sock, ["subscribe"])
+                _recv(sock)
+                sock.settimeout(None)
+                while True:
+                    _, thread_id, origin = _recv(sock)
+                    if origin != self._origin:
+                        self._run_callbacks(thread_id)
+            except Exception as e:
+                logger.warning(f"Shared state subscription lost: {str(e)}")
+                time.sleep(self.retry_seconds)
+
+    def _call(self, op: str, *args: Any) -> Any:
+        if time.monotonic() < self._down_until:
+            SHARED_STATE_FAILURES.inc(op=op)
+            return None
+        self._ensure_subscriber()
+        sock = None
+        try:
+            try:
+                sock = self._pool.get_nowait()
+            except queue.Empty:
+                sock = self._connect()
+            _send(sock, [op, *args])
+            ok, result = _recv(sock)
+        except (ConnectionError, OSError) as e:
+            if sock is not None:
+                sock.close()
+            SHARED_STATE_FAILURES.inc(op=op)
+            self._down_until = time.monotonic() + self.retry_seconds
+            logger.warning(f"Shared state {op} failed, serving from origin for {self.retry_seconds:g}s: {str(e)}")
+            return None
+        self._pool.put(sock)
+        if not ok:
+            SHARED_STATE_FAILURES.inc(op=op)
+            logger.error(f"Shared state {op} rejected: {result}")
+            return None
+        return result
+
+    def get(self, namespace: str, key: str) -> Any:
+        return self._call("get", namespace, key)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        self._call("set", namespace, key, value)
+
+    def add(self, namespace: str, key: str, item_key: str, item: Any, limit: int) -> None:
+        self._call("add", namespace, key, item_key, item, limit)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._call("delete", namespace, key)
+
+    def invalidate_thread(self, thread_id: str) -> None:
+        self._run_callbacks(thread_id)
+        self._call("invalidate", thread_id, self._origin)
+
+
+def create_shared_state() -> SharedState:
+    """Backend selected by SHARED_STATE_BACKEND ("local" or "socket")."""
+    if settings.SHARED_STATE_BACKEND == "socket":
+        return SocketState(
+            resolve_address(settings.SHARED_STATE_ADDRESS),
+            timeout=settings.SHARED_STATE_TIMEOUT,
+            autostart=settings.SHARED_STATE_AUTOSTART,
+            secret=settings.SHARED_STATE_SECRET,
+        )
+    if settings.SHARED_STATE_BACKEND != "local":
+        raise ValueError(f"Unknown SHARED_STATE_BACKEND {settings.SHARED_STATE_BACKEND!r}")
+    return LocalState(NAMESPACE_LIMITS)
+
+
+shared_state = create_shared_state()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the shared state server for all workers on this host.")
+    parser.add_argument("--address", default=settings.SHARED_STATE_ADDRESS,
+                        help="unix socket path or host:port (default: state.sock in a private runtime directory)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    args.address = resolve_address(args.address)
+    server = bind_server(args.address, NAMESPACE_LIMITS, settings.SHARED_STATE_SECRET)
+    if server is None:
+        raise SystemExit(f"{args.address} is already being served")
+    server.serve_forever()
@@ -0,0 +1,88 @@
+"""
+Server-Sent Events framing for /chat/stream.
+
+Sending every model token as its own `data: {...}` frame means one
+json.dumps and one socket write per token. `SSEWriter` instead buffers
+tokens and emits them as a single `{"token": ...}` frame once the buffer
+reaches `flush_bytes` or has waited `flush_interval` seconds. The first
+token of a stream and any status/done/error event flush immediately, so
+time to first token is unchanged and frames never arrive out of order.
+Clients already concatenate `token` values, so a coalesced frame reads
+the same as the tokens it replaces.
+
+The writer only builds frames; the stream's generation (see
+app/core/stream_replay.py) numbers them and runs the timer that flushes
+pending tokens when the model pauses (e.g. before a tool call).
+"""
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.metrics import SSE_FRAMES
+
+DONE_FRAME = b"data: [DONE]\n\n"
+
+_EVENT_PREFIX = b"data: "
+_TOKEN_PREFIX = b'data: {"token": '
+_EVENT_END = b"\n\n"
+_TOKEN_END = b"}\n\n"
+
+
+def encode_event(payload: Dict[str, Any]) -> bytes:
+    """Encode one SSE `data:` frame."""
+    SSE_FRAMES.inc(kind="event")
+    return _EVENT_PREFIX + json.dumps(payload).encode() + _EVENT_END
+
+
+class SSEWriter:
+    """
+    Coalesces streamed tokens into SSE frames on a size-or-time policy.
+
+    Every method returns the frames to send now (empty while tokens are held).
+
+    Attributes:
+        flush_bytes: Flush once this many characters are pending (<= 1 sends one frame per token)
+        flush_interval: Maximum seconds a token is held (<= 0 sends one frame per token)
+    """
+
+    def __init__(self, flush_bytes: int, flush_interval: float):
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._pending_since = 0.0
+        self._started = False
+
+    def token(self, text: str) -> List[bytes]:
+        """Buffer a token, flushing if the policy says so."""
+        if not text:
+            return []
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if (not self._started or self._pending_size >= self.flush_bytes or
+                time.monotonic() - self._pending_since >= self.flush_interval):
+            return self.flush()
+        return []
+
+    def event(self, payload: Dict[str, Any]) -> List[bytes]:
+        """Pending tokens followed by a non-token event (status, done, error)."""
+        return self.flush() + [encode_event(payload)]
+
+    def flush(self) -> List[bytes]:
+        """Emit all pending tokens as one frame."""
+        if not self._pending:
+            return []
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        self._started = True
+        SSE_FRAMES.inc(kind="token")
+        return [_TOKEN_PREFIX + json.dumps(text).encode() + _TOKEN_END]
+
+    def flush_due_in(self) -> Optional[float]:
+        """Seconds until pending tokens must be sent, or None if nothing is pending."""
+        if not self._pending:
+            return None
+        return max(0.0, self._pending_since + self.flush_interval - time.monotonic())
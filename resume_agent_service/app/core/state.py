@@ -3,6 +3,16 @@ from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage
 from pydantic import BaseModel
 
+class ResumeProfile(BaseModel):
+    """Structured facts extracted from the resume at ingest time."""
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    links: List[str] = []
+    skills: List[str] = []
+    education: List[str] = []
+    experience_years: Optional[float] = None
+
 class ResumeAnalysisResult(BaseModel):
     """Result of the resume analysis phase."""
     filename: str
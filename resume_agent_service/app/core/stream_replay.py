@@ -0,0 +1,228 @@
+"""
+Resumable /chat/stream generations with Last-Event-ID replay.
+
+A chat turn streamed over SSE runs as a background task (a "generation")
+instead of inside the HTTP response, so a dropped connection doesn't
+cancel the LangGraph run. Every frame the generation publishes gets an
+SSE id of the form `<stream_id>:<seq>` and is kept in a bounded replay
+buffer. A client that reconnects with `Last-Event-ID` (or resubmits the
+same Idempotency-Key) is served the frames after that id and then
+follows the live generation, without a second LLM/tool run or checkpoint
+write.
+
+Finished generations stay replayable for `ttl_seconds`. Like the thread
+serializer, the registry is per process, so reconnects must reach the
+worker that started the stream.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.core.config import get_settings
+from app.core.metrics import STREAM_RESUMES
+from app.core.sse import SSEWriter, encode_event
+
+logger = logging.getLogger("resume_agent.stream_replay")
+
+
+class StreamExpiredError(Exception):
+    """The stream, or the events after the requested id, is no longer buffered."""
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    Split a `Last-Event-ID` header into (stream_id, seq).
+
+    Returns:
+        The parsed id, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    stream_id, _, seq = value.strip().rpartition(":")
+    if not stream_id or not seq.isdigit():
+        return None
+    return stream_id, int(seq)
+
+
+class StreamGeneration:
+    """
+    One streamed chat turn: the running task plus its replay buffer.
+
+    Attributes:
+        stream_id: Stable id sent in every event id and the X-Stream-Id header
+        thread_id: Thread the turn belongs to
+        writer: Token coalescing policy for the stream
+        succeeded: Set by the producer once the turn completed normally
+        on_finished: Called with the generation once its producer is done
+    """
+
+    def __init__(self, stream_id: str, thread_id: str, writer: SSEWriter, max_events: int):
+        self.stream_id = stream_id
+        self.thread_id = thread_id
+        self.writer = writer
+        self.succeeded = False
+        self.finished_at: Optional[float] = None
+        self.on_finished: Optional[Callable[["StreamGeneration"], None]] = None
+        self._frames: Deque[Tuple[int, bytes]] = deque(maxlen=max_events)
+        self._seq = 0
+        self._id_prefix = f"id: {stream_id}:".encode()
+        self._changed = asyncio.Event()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self, producer: AsyncIterator[List[bytes]]) -> None:
+        """Run `producer` (frames from the writer, in order) as a background task."""
+        self._task = asyncio.get_running_loop().create_task(self._pump(producer))
+
+    async def _pump(self, producer: AsyncIterator[List[bytes]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            async for frames in producer:
+                self._publish(frames)
+                if self._timer is None:
+                    delay = self.writer.flush_due_in()
+                    if delay is not None:
+                        self._timer = loop.call_later(delay, self._flush_due)
+        except Exception as e:
+            logger.error(f"Stream {self.stream_id} producer failed: {str(e)}")
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._publish(self.writer.flush())
+            self.finished_at = time.monotonic()
+            self._notify()
+            if self.on_finished is not None:
+                self.on_finished(self)
+
+    def _flush_due(self) -> None:
+        self._timer = None
+        self._publish(self.writer.flush())
+
+    def _publish(self, frames: List[bytes]) -> None:
+        if not frames:
+            return
+        for frame in frames:
+            self._seq += 1
+            self._frames.append((self._seq, self._id_prefix + str(self._seq).encode() + b"\n" + frame))
+        self._notify()
+
+    def _notify(self) -> None:
+        # Waiters hold the old event; the next wait gets a fresh one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def events(self, after: int = 0) -> AsyncIterator[bytes]:
+        """
+        Frames after sequence number `after`, then the live generation's
+        frames until it finishes.
+
+        Raises:
+            StreamExpiredError: If frames after `after` were already evicted
+        """
+        oldest = self._frames[0][0] if self._frames else self._seq + 1
+        if after + 1 < oldest:
+            raise StreamExpiredError(f"Events after {self.stream_id}:{after} are no longer buffered")
+        return self._follow(after + 1)
+
+    async def _follow(self, next_seq: int) -> AsyncIterator[bytes]:
+        while True:
+            changed = self._changed
+            if self._frames and next_seq < self._frames[0][0]:
+                # The reader fell more than max_events behind; end with an error rather than a gap.
+                # The frame has no id, so a reconnect with the last delivered id gets a 410.
+                logger.warning(f"Stream {self.stream_id} reader fell behind; events after {next_seq - 1} evicted")
+                yield encode_event({
+                    'error': 'This stream fell too far behind and can no longer be continued.',
+                    'code': 'stream_expired',
+                })
+                return
+            batch = [frame for seq, frame in self._frames if seq >= next_seq]
+            if batch:
+                next_seq = self._seq + 1
+                yield b"".join(batch)
+                continue
+            if self.finished:
+                return
+            await changed.wait()
+
+
+class StreamRegistry:
+    """
+    Live and recently finished generations, by stream id and Idempotency-Key.
+
+    A finished generation is evicted `ttl_seconds` after it finishes, by a
+    timer on the event loop, so an idle registry doesn't keep them. Creates
+    and lookups also sweep out any that are past their TTL.
+    """
+
+    def __init__(self, max_events: int, ttl_seconds: float):
+        self.max_events = max_events
+        self.ttl_seconds = ttl_seconds
+        self._streams: Dict[str, StreamGeneration] = {}
+        self._by_key: Dict[str, str] = {}
+
+    def create(self, thread_id: str, writer: SSEWriter, idempotency_key: Optional[str] = None) -> StreamGeneration:
+        """Register a new generation (not started yet)."""
+        self._evict()
+        generation = StreamGeneration(uuid4().hex, thread_id, writer, self.max_events)
+        generation.on_finished = self._schedule_eviction
+        self._streams[generation.stream_id] = generation
+        if idempotency_key:
+            self._by_key[idempotency_key] = generation.stream_id
+        return generation
+
+    def get(self, stream_id: str) -> Optional[StreamGeneration]:
+        self._evict()
+        return self._streams.get(stream_id)
+
+    def for_key(self, idempotency_key: Optional[str]) -> Optional[StreamGeneration]:
+        """The generation started with `idempotency_key`, if it is running or succeeded."""
+        self._evict()
+        generation = self._streams.get(self._by_key.get(idempotency_key, "")) if idempotency_key else None
+        if generation is None or (generation.finished and not generation.succeeded):
+            return None
+        return generation
+
+    def resume(self, generation: StreamGeneration, after: int) -> AsyncIterator[bytes]:
+        """
+        Replay a generation's frames after `after`, counting the resume.
+
+        Raises:
+            StreamExpiredError: If the generation or those frames were already evicted
+        """
+        if self._expired(generation, time.monotonic()):
+            raise StreamExpiredError(f"Stream {generation.stream_id} is no longer buffered")
+        iterator = generation.events(after)
+        outcome = "replayed" if generation.finished else "attached"
+        STREAM_RESUMES.inc(result=outcome)
+        logger.info(f"Resuming stream {generation.stream_id} after event {after} ({outcome})")
+        return iterator
+
+    def _expired(self, generation: StreamGeneration, now: float) -> bool:
+        return generation.finished and now - generation.finished_at >= self.ttl_seconds
+
+    def _schedule_eviction(self, generation: StreamGeneration) -> None:
+        asyncio.get_running_loop().call_later(self.ttl_seconds, self._evict)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [stream_id for stream_id, generation in self._streams.items() if self._expired(generation, now)]
+        for stream_id in expired:
+            del self._streams[stream_id]
+        if expired:
+            self._by_key = {key: sid for key, sid in self._by_key.items() if sid in self._streams}
+
+
+_settings = get_settings()
+
+stream_registry = StreamRegistry(
+    max_events=_settings.STREAM_REPLAY_MAX_EVENTS,
+    ttl_seconds=_settings.STREAM_REPLAY_TTL_SECONDS,
+)
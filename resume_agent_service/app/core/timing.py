@@ -0,0 +1,129 @@
+"""
+Per-request timing breakdown.
+
+A `RequestTimings` object is bound to the current request through a
+ContextVar. Spans are collected from two sources:
+
+- LangGraph `astream_events` events (time to first token, each graph node,
+  each tool call), fed in by the endpoint via `observe_event`.
+- Instrumented code paths (Mongo operations, ingest stages) that report
+  through `record_span` while a request is in scope. LangChain copies the
+  context into executor threads, so sync nodes and tools report too.
+
+The breakdown is rendered as a `Server-Timing` header for regular responses
+and as a dict for the final SSE `done` event.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Spans that are summed into a single entry instead of listed one by one
+_AGGREGATED_SPANS = {"mongo"}
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Collects named spans (in seconds) for a single request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.ttft: Optional[float] = None
+        self.spans: List[Tuple[str, float]] = []
+        self.totals: Dict[str, float] = {}
+        self._open: Dict[str, Tuple[str, float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record a completed span."""
+        if name in _AGGREGATED_SPANS:
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+        else:
+            self.spans.append((name, seconds))
+
+    def mark_first_token(self, now: Optional[float] = None) -> None:
+        """Record time to first token, if not already recorded."""
+        if self.ttft is None:
+            self.ttft = (now if now is not None else time.perf_counter()) - self.start
+
+    def observe_event(self, event: Dict[str, Any]) -> None:
+        """Derive spans from a LangGraph `astream_events` (v2) event."""
+        event_type = event.get("event", "")
+        now = time.perf_counter()
+
+        if event_type == "on_chat_model_stream":
+            # Tool-call chunks carry no text; TTFT is the first visible token
+            chunk = event.get("data", {}).get("chunk")
+            if getattr(chunk, "content", None):
+                self.mark_first_token(now)
+            return
+
+        name = event.get("name", "")
+        run_id = str(event.get("run_id", ""))
+        if event_type == "on_tool_start":
+            self._open[run_id] = (f"tool-{name}", now)
+        elif event_type == "on_chain_start" and _is_graph_node(event):
+            self._open[run_id] = (f"node-{name}", now)
+        elif event_type in ("on_tool_end", "on_tool_error", "on_chain_end", "on_chain_error"):
+            opened = self._open.pop(run_id, None)
+            if opened:
+                self.add(opened[0], now - opened[1])
+
+    def entries(self) -> List[Tuple[str, float]]:
+        """All spans in milliseconds, in the order they completed."""
+        entries = []
+        if self.ttft is not None:
+            entries.append(("ttft", self.ttft * 1000))
+        entries.extend((name, seconds * 1000) for name, seconds in self.spans)
+        entries.extend((name, seconds * 1000) for name, seconds in self.totals.items())
+        entries.append(("total", (time.perf_counter() - self.start) * 1000))
+        return entries
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Breakdown for the SSE `done` event."""
+        return {
+            "spans": [{"name": name, "ms": round(ms, 1)} for name, ms in self.entries()],
+        }
+
+    def server_timing_header(self) -> str:
+        """Render the spans as a `Server-Timing` header value."""
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.entries())
+
+
+def _is_graph_node(event: Dict[str, Any]) -> bool:
+    # A node's own run is the chain whose name matches its langgraph_node tag;
+    # runnables nested inside the node carry the tag but a different name.
+    # Internal nodes such as __start__ are skipped.
+    metadata = event.get("metadata") or {}
+    name = event.get("name", "")
+    return metadata.get("langgraph_node") == name and not name.startswith("__")
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return the timings bound to the current request, if any."""
+    return _current.get()
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Add a span to the current request's timings; no-op outside a request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """Bind a fresh `RequestTimings` to the current context for the block."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Streaming generators may be resumed from a different context
+            # than the one that entered the block; just clear the binding.
+            _current.set(None)
@@ -3,6 +3,7 @@ from langgraph.prebuilt import ToolNode, tools_condition
 
 from app.core.state import AgentState
 from app.graph.nodes import mode_router, resume_analyzer_node, chat_node
+from app.graph.tool_execution import abounded_tool_call, bounded_tool_call
 from app.tools import tools
 from app.memory.checkpointer import get_checkpointer
 
@@ -15,14 +16,19 @@ def build_resume_agent_graph():
         START → mode_router
             → resume_analyzer_node (if mode == 'resume_analysis')
             → chat_node (if mode == 'chat')
-        chat_node ↔ tools (tool calls loop)
+        chat_node ↔ tools (tool calls loop; a turn's calls run concurrently,
+                          each bounded by its own timeout)
     """
     graph = StateGraph(AgentState)
     
     # Add nodes
     graph.add_node("resume_analyzer_node", resume_analyzer_node)
     graph.add_node("chat_node", chat_node)
-    graph.add_node("tools", ToolNode(tools))
+    graph.add_node("tools", ToolNode(
+        tools,
+        wrap_tool_call=bounded_tool_call,
+        awrap_tool_call=abounded_tool_call,
+    ))
     
     # Add edges
     graph.add_conditional_edges(START, mode_router)
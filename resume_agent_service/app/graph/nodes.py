@@ -7,9 +7,15 @@ from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 
+from app.core.concurrency import DeadlineExceededError, LLMOverloadedError
 from app.core.config import get_settings
+from app.core.metrics import LLM_CALL_LATENCY
 from app.core.state import AgentState, ResumeAnalysisResult
-from app.services.resume_service import get_retriever, get_thread_metadata, thread_has_resume
+from app.memory.thread_store import get_thread_analysis, update_thread_analysis
+from app.services.llm_gateway import GatewayChatModel
+from app.services.profile_extractor import format_profile
+from app.services.rag_prefetch import rag_prefetcher
+from app.services.resume_service import get_resume_profile, get_retriever
 from app.tools import tools
 from app.tools.ats_scorer import calculate_ats_score
 
@@ -19,9 +25,21 @@ settings = get_settings()
 # Configure logging
 logger = logging.getLogger("resume_agent.nodes")
 
-# Initialize LLM with Google Gemini
-llm = ChatGoogleGenerativeAI(model="gemini-3-flash-preview")
-llm_with_tools = llm.bind_tools(tools)
+# Initialize LLM with Google Gemini; the gateway owns timeouts and retries
+llm = ChatGoogleGenerativeAI(
+    model="gemini-3-flash-preview",
+    timeout=settings.LLM_CALL_TIMEOUT,
+    max_retries=0,
+)
+
+# Reply checkpointed when the chat LLM call fails (never cached)
+LLM_ERROR_REPLY = "I encountered an error while processing your request. Please try again."
+
+llm_with_tools = GatewayChatModel(
+    runnable=llm.bind_tools(tools),
+    provider="gemini",
+    hedge_after=settings.LLM_HEDGE_AFTER,
+)
 
 
 def mode_router(state: AgentState, config: Optional[Dict] = None) -> str:
@@ -44,13 +62,16 @@ def resume_analyzer_node(state: AgentState, config: Optional[Dict] = None) -> Di
     """
     Analyze the uploaded resume. Runs exactly once per thread.
     
-    - Retrieves resume chunks from the FAISS index.
-    - Calculates ATS score.
+    - Loads the full text, ATS result and profile stored at upload
+      (one indexed read; no retrieval and no rescoring).
+    - Falls back to scoring the stored text for threads uploaded before
+      ATS results were persisted.
     - Stores results in state.
     """
     thread_id = state.get("thread_id")
     
-    if not thread_has_resume(thread_id):
+    stored = get_thread_analysis(str(thread_id)) if thread_id else None
+    if not stored:
         error_msg = AIMessage(content="No resume found. Please upload a resume first using the /resume/upload endpoint.")
         return {
             "messages": [error_msg],
@@ -58,23 +79,34 @@ def resume_analyzer_node(state: AgentState, config: Optional[Dict] = None) -> Di
             "analysis_complete": False
         }
     
-    retriever = get_retriever(thread_id)
-    metadata = get_thread_metadata(thread_id)
-    
-    # Get full resume text by retrieving many chunks
-    all_chunks = retriever.invoke("skills experience education projects summary")
-    full_text = "\n".join([doc.page_content for doc in all_chunks])
-    
-    # Calculate ATS score
-    ats_result = calculate_ats_score(full_text)
+    if stored.get("ats_breakdown") is not None:
+        ats_result = {
+            "total_score": stored.get("ats_score", 0),
+            "breakdown": stored["ats_breakdown"],
+            "found_skills": stored.get("found_skills", []),
+            "found_verbs": stored.get("found_verbs", []),
+            "suggestions": stored.get("suggestions", []),
+        }
+    else:
+        # Legacy thread: score once from the stored text (or retrieved chunks) and persist it
+        full_text = stored.get("full_text")
+        if not full_text:
+            retriever = get_retriever(thread_id)
+            all_chunks = retriever.invoke("skills experience education projects summary") if retriever else []
+            full_text = "\n".join([doc.page_content for doc in all_chunks])
+        ats_result = calculate_ats_score(full_text)
+        update_thread_analysis(str(thread_id), ats_result)
     
     # Build analysis result
+    profile = stored.get("profile") or {}
     analysis = ResumeAnalysisResult(
-        filename=metadata.get("filename", "unknown"),
-        pages=metadata.get("pages", 0),
-        chunks=metadata.get("chunks", 0),
+        filename=stored.get("filename", "unknown"),
+        pages=stored.get("pages", 0),
+        chunks=stored.get("chunks", 0),
         ats_score=ats_result["total_score"],
-        skills_extracted=ats_result["found_skills"]
+        skills_extracted=ats_result["found_skills"],
+        experience_years=profile.get("experience_years"),
+        education_summary="; ".join(profile.get("education") or []) or None
     )
     
     # Generate summary message
@@ -115,8 +147,17 @@ def chat_node(state: AgentState, config: Optional[Dict] = None) -> Dict[str, Any
     if last_msg:
         logger.info(f"User message: {last_msg.content[:100] if hasattr(last_msg, 'content') else str(last_msg)[:100]}...")
     
+    profile_text = format_profile(get_resume_profile(thread_id))
+    profile_section = f"""
+RESUME PROFILE (extracted from the uploaded resume):
+{profile_text}
+
+Answer questions about the candidate's name, contact details, skills, education or
+years of experience directly from this profile WITHOUT calling any tool.
+""" if profile_text else ""
+    
     system_prompt = f"""You are a helpful, concise resume assistant. You have analyzed the user's resume.
-
+{profile_section}
 CRITICAL RULES:
 1. NEVER show raw JSON, tool outputs, or query metadata to the user
 2. Keep answers SHORT and DIRECT - 2-4 sentences for simple questions
@@ -124,9 +165,10 @@ CRITICAL RULES:
 4. Use bullet points sparingly, only when listing multiple items
 
 AVAILABLE TOOLS (use internally, don't mention to user):
-- `resume_rag_tool` with thread_id="{thread_id}" - for resume content questions
+- `resume_rag_tool` with thread_id="{thread_id}" - for resume content questions not covered by the profile (all_resumes=true to compare the user's resume versions)
 - `ats_score_tool` - for ATS score calculations
-- `job_search_tool` - for job opportunities
+- `job_recommendation_tool` with thread_id="{thread_id}" - for jobs that fit the resume (ranked postings)
+- `job_search_tool` - for other job market searches (companies, salaries, specific openings)
 - `career_advice_search` - for career advice
 
 RESPONSE LENGTH GUIDE:
@@ -140,14 +182,23 @@ Never expose raw data."""
     system_message = SystemMessage(content=system_prompt)
     messages = [system_message, *state["messages"]]
     
+    # First LLM call of the turn: retrieve for the user's message while the model decides
+    # which tool to call, so a matching resume_rag_tool call is served immediately
+    if settings.RAG_PREFETCH_ENABLED and isinstance(last_msg, HumanMessage):
+        rag_prefetcher.start(thread_id, last_msg.content)
+    
     try:
         logger.info(f"Invoking LLM with {len(messages)} messages")
-        response = llm_with_tools.invoke(messages, config=config)
+        with LLM_CALL_LATENCY.time(call="chat_node"):
+            response = llm_with_tools.invoke(messages, config=config)
         logger.info(f"LLM response type: {type(response).__name__}")
         logger.info(f"LLM response content: {response.content[:100] if hasattr(response, 'content') and response.content else 'No content'}...")
         return {"messages": [response]}
+    except (LLMOverloadedError, DeadlineExceededError):
+        # Surface overload (503) and timeouts (504) to the API instead of checkpointing an error reply
+        raise
     except Exception as e:
         logger.error(f"LLM invocation error: {str(e)}\n{traceback.format_exc()}")
-        error_msg = AIMessage(content=f"I encountered an error while processing your request. Please try again.")
+        error_msg = AIMessage(content=LLM_ERROR_REPLY)
         return {"messages": [error_msg]}
 
@@ -0,0 +1,113 @@
+"""
+Timeout-bounded tool execution for the graph's ToolNode.
+
+ToolNode already runs the tool calls of one turn concurrently (a thread
+pool for sync runs, asyncio.gather for async ones). These wrappers, passed
+as its `wrap_tool_call`/`awrap_tool_call`, give each call its own time
+limit: TOOL_TIMEOUT, or WEB_SEARCH_TOOL_TIMEOUT for the DuckDuckGo tools,
+capped by whatever is left of the request deadline. A call that times out
+or raises is answered with an error ToolMessage telling the model to carry
+on with the other results, so one hung search can't stall the turn.
+
+Outcomes are counted per tool in resume_agent_tool_calls_total.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Awaitable, Callable, Dict
+
+from langchain_core.messages import ToolMessage
+from langgraph.errors import GraphBubbleUp
+from langgraph.prebuilt.tool_node import ToolCallRequest
+
+from app.core.concurrency import current_deadline
+from app.core.config import get_settings
+from app.core.metrics import TOOL_CALLS
+from app.core.timing import record_span
+
+logger = logging.getLogger("resume_agent.tool_execution")
+
+settings = get_settings()
+
+TOOL_TIMEOUTS: Dict[str, float] = {
+    "job_search_tool": settings.WEB_SEARCH_TOOL_TIMEOUT,
+    "job_recommendation_tool": settings.WEB_SEARCH_TOOL_TIMEOUT,  # may fall back to web search
+    "career_advice_search": settings.WEB_SEARCH_TOOL_TIMEOUT,
+}
+
+# Sync runs only: abandoned (timed-out) calls keep their worker until they return
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="tool-call")
+
+
+def tool_timeout(name: str) -> float:
+    """Seconds the named tool may run, bounded by the request deadline if one is set."""
+    timeout = TOOL_TIMEOUTS.get(name, settings.TOOL_TIMEOUT)
+    deadline = current_deadline()
+    if deadline is not None:
+        timeout = min(timeout, max(0.1, deadline - time.monotonic()))
+    return timeout
+
+
+def _fallback(request: ToolCallRequest, reason: str) -> ToolMessage:
+    name = request.tool_call["name"]
+    return ToolMessage(
+        content=f"{name} {reason}, so no result is available from it. Answer using the other "
+                f"tool results and what you already know, and mention that this source was unavailable.",
+        name=name,
+        tool_call_id=request.tool_call["id"],
+        status="error",
+    )
+
+
+def _timed_out(request: ToolCallRequest, timeout: float, elapsed: float) -> ToolMessage:
+    name = request.tool_call["name"]
+    TOOL_CALLS.inc(tool=name, result="timeout")
+    # The tool's end event never arrives, so report its span here
+    record_span(f"tool-{name}", elapsed)
+    logger.warning(f"Tool {name} timed out after {timeout:g}s")
+    return _fallback(request, f"did not finish within {timeout:g}s")
+
+
+def _failed(request: ToolCallRequest, exc: Exception) -> ToolMessage:
+    name = request.tool_call["name"]
+    TOOL_CALLS.inc(tool=name, result="error")
+    logger.error(f"Tool {name} failed: {type(exc).__name__}: {str(exc)}")
+    return _fallback(request, f"failed ({type(exc).__name__})")
+
+
+def _completed(request: ToolCallRequest, result):
+    status = getattr(result, "status", "success")
+    TOOL_CALLS.inc(tool=request.tool_call["name"], result="ok" if status != "error" else "error")
+    return result
+
+
+def bounded_tool_call(request: ToolCallRequest, execute: Callable[[ToolCallRequest], ToolMessage]):
+    """Sync ToolNode wrapper: run the call on a worker thread and stop waiting at its timeout."""
+    timeout = tool_timeout(request.tool_call["name"])
+    start = time.perf_counter()
+    # Keep the run's callbacks and request timings on the worker thread
+    future = _executor.submit(contextvars.copy_context().run, execute, request)
+    try:
+        return _completed(request, future.result(timeout=timeout))
+    except FutureTimeoutError:
+        return _timed_out(request, timeout, time.perf_counter() - start)
+    except GraphBubbleUp:
+        raise
+    except Exception as e:
+        return _failed(request, e)
+
+
+async def abounded_tool_call(request: ToolCallRequest, execute: Callable[[ToolCallRequest], Awaitable[ToolMessage]]):
+    """Async ToolNode wrapper: cancel the call once its timeout passes."""
+    timeout = tool_timeout(request.tool_call["name"])
+    start = time.perf_counter()
+    try:
+        return _completed(request, await asyncio.wait_for(execute(request), timeout=timeout))
+    except asyncio.TimeoutError:
+        return _timed_out(request, timeout, time.perf_counter() - start)
+    except GraphBubbleUp:
+        raise
+    except Exception as e:
+        return _failed(request, e)
@@ -1,27 +1,49 @@
 from uuid import uuid4
-import json
 import asyncio
 import logging
 import traceback
 import re
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from datetime import datetime
+from fastapi import FastAPI, UploadFile, File, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-from langchain_core.messages import HumanMessage, AIMessageChunk
-
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Tuple
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk
+
+from app.core.concurrency import (
+    DeadlineExceededError,
+    DuplicateRequestError,
+    LLMOverloadedError,
+    ThreadBusyError,
+    ThreadLease,
+    idempotency_keys,
+    llm_admission,
+    request_deadline,
+    thread_serializer,
+)
 from app.core.config import get_settings
+from app.core.state import ResumeProfile
+from app.core.metrics import render_metrics, STAGE_LATENCY, STREAM_RESUMES, TOKENS_STREAMED
+from app.core.sse import DONE_FRAME, SSEWriter
+from app.core.stream_replay import StreamExpiredError, StreamGeneration, parse_last_event_id, stream_registry
+from app.core.timing import request_timings
+from app.services.answer_cache import answer_cache, cacheable_turn, context_digest
+from app.services.job_match import score_job_descriptions
+from app.services.thread_cleanup import delete_threads, delete_user_threads
 from app.services.resume_service import (
     ingest_resume_pdf, 
     thread_has_resume, 
+    search_user_resumes,
     get_thread_metadata,
-    get_retriever
+    get_retriever,
+    embed_query
 )
 from app.tools.ats_scorer import calculate_ats_score
 from app.graph import resume_agent
+from app.graph.nodes import LLM_ERROR_REPLY
 from app.memory.checkpointer import list_all_threads
-from app.memory.thread_store import get_user_threads, update_thread_ats_score
+from app.memory.thread_store import get_user_threads, update_thread_analysis
 
 # Configure logging
 logging.basicConfig(
@@ -32,10 +54,6 @@ logger = logging.getLogger("resume_agent")
 
 settings = get_settings()
 
-# Track which threads have completed analysis
-_THREAD_ANALYSIS_COMPLETE: Dict[str, bool] = {}
-
-
 def clean_tool_output_from_response(text: str) -> str:
     """
     Remove raw JSON tool outputs from LLM response text.
@@ -69,6 +87,188 @@ def clean_tool_output_from_response(text: str) -> str:
     
     return cleaned
 
+# Phrases that mark where the model's actual answer starts after a tool call
+ANSWER_INDICATORS = (
+    "the resume belongs to",
+    "this resume is for",
+    "the owner of this resume",
+    "based on the resume",
+    "according to the resume",
+    "the resume shows",
+    "from the resume",
+    "i can see that",
+    "the name on the resume",
+    "your resume",
+)
+
+
+def find_answer_start(text_lower: str) -> int:
+    """
+    Return the index where the answer starts in lower-cased buffered text.
+    
+    Indicators are checked in priority order; the first one present wins.
+    Returns -1 if no indicator has appeared yet.
+    """
+    for indicator in ANSWER_INDICATORS:
+        idx = text_lower.find(indicator)
+        if idx != -1:
+            return idx
+    return -1
+
+
+async def _previous_answer(config: Dict[str, Any]) -> Optional[str]:
+    """The thread's last AI reply (not a tool-call request), or None for a new thread."""
+    state = await resume_agent.aget_state(config)
+    for message in reversed((state.values or {}).get("messages", [])):
+        if isinstance(message, AIMessage) and not message.tool_calls and isinstance(message.content, str):
+            return message.content
+    return None
+
+
+async def _lookup_cached_answer(
+    thread_id: str, message: str, config: Dict[str, Any]
+) -> Tuple[Optional[str], Optional[List[float]], str]:
+    """
+    Look up a semantically equivalent earlier question on this thread,
+    asked after the same AI reply.
+    
+    Returns:
+        (cached answer or None, question embedding to store the new answer
+        under or None if caching is disabled or embedding failed, context
+        digest of the previous reply)
+    """
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None, None, ""
+    try:
+        with STAGE_LATENCY.time(stage="answer_cache_lookup"):
+            context = context_digest(await _previous_answer(config))
+            vector = await asyncio.to_thread(embed_query, message)
+            return answer_cache.lookup(thread_id, vector, context), vector, context
+    except Exception as e:
+        logger.warning(f"Answer cache lookup failed for thread {thread_id}: {str(e)}")
+        return None, None, ""
+
+
+def _cache_answer(
+    thread_id: str,
+    message: str,
+    vector: Optional[List[float]],
+    context: str,
+    answer: Any,
+    tools_called: List[str],
+) -> None:
+    """Store a freshly generated answer, skipping errors, empty replies and web-tool turns."""
+    if vector is None or not isinstance(answer, str) or not answer.strip() or answer == LLM_ERROR_REPLY:
+        return
+    if not cacheable_turn(tools_called):
+        return
+    answer_cache.store(thread_id, message, vector, context, answer)
+
+
+async def _record_cached_turn(config: Dict[str, Any], message: str, answer: str) -> None:
+    """Append a cache-served turn to the thread's history as if chat_node had answered."""
+    await resume_agent.aupdate_state(
+        config,
+        {"messages": [HumanMessage(content=message), AIMessage(content=answer)]},
+        as_node="chat_node",
+    )
+
+
+def _deadline_error() -> HTTPException:
+    return HTTPException(
+        status_code=504,
+        detail="The assistant took too long to respond. Please try again."
+    )
+
+
+def _overloaded_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="The assistant is handling too many requests. Please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _scoped_key(thread_id: str, idempotency_key: Optional[str]) -> Optional[str]:
+    return f"{thread_id}:{idempotency_key}" if idempotency_key else None
+
+
+async def _begin_turn(thread_id: str, idempotency_key: Optional[str]) -> Tuple[ThreadLease, Optional[str]]:
+    """
+    Admit a chat turn for a thread.
+    
+    Rejects resubmitted Idempotency-Keys, sheds load when the LLM queue is
+    already full, then waits (briefly) for any running turn on the thread.
+    
+    Returns:
+        (lease, scoped idempotency key) to pass to `_end_turn`
+    
+    Raises:
+        HTTPException: 409 on duplicates or a full thread queue, 503 on overload
+    """
+    scoped_key = _scoped_key(thread_id, idempotency_key)
+    if scoped_key:
+        try:
+            idempotency_keys.claim(scoped_key)
+        except DuplicateRequestError:
+            raise HTTPException(
+                status_code=409,
+                detail="Duplicate request: this Idempotency-Key was already submitted for this thread."
+            )
+    try:
+        if llm_admission.saturated():
+            raise _overloaded_error()
+        try:
+            lease = await thread_serializer.acquire(thread_id)
+        except ThreadBusyError:
+            raise HTTPException(
+                status_code=409,
+                detail="Another request for this thread is still running. Please retry when it finishes."
+            )
+    except HTTPException:
+        if scoped_key:
+            idempotency_keys.release(scoped_key)
+        raise
+    return lease, scoped_key
+
+
+def _end_turn(lease: ThreadLease, scoped_key: Optional[str], succeeded: bool) -> None:
+    """Release the thread; failed turns free their Idempotency-Key for a retry."""
+    lease.release()
+    if scoped_key and not succeeded:
+        idempotency_keys.release(scoped_key)
+
+
+def _sse_response(frames, stream_id: str) -> StreamingResponse:
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+            "X-Stream-Id": stream_id,
+        },
+    )
+
+
+def _stream_expired(thread_id: str) -> HTTPException:
+    STREAM_RESUMES.inc(result="expired")
+    return HTTPException(
+        status_code=410,
+        detail=f"This stream is no longer available. The finished answer is in /threads/{thread_id}/history."
+    )
+
+
+def _resume_stream(generation: StreamGeneration, after: int) -> StreamingResponse:
+    """Replay a generation from event `after` and follow it if it is still running (410 if evicted)."""
+    try:
+        frames = stream_registry.resume(generation, after)
+    except StreamExpiredError:
+        raise _stream_expired(generation.thread_id)
+    return _sse_response(frames, generation.stream_id)
+
+
 app = FastAPI(
     title="Resume Agent Service",
     description="Microservice for Resume Analysis and Agentic Chat powered by LangGraph",
@@ -113,9 +313,67 @@ class ResumeAnalysisResponse(BaseModel):
     skills_found: List[str]
     action_verbs_found: List[str]
     suggestions: List[str]
+    profile: Optional[ResumeProfile] = None
     message: str
 
 
+class JobDescription(BaseModel):
+    id: Optional[str] = None
+    text: str
+
+
+class MatchRequest(BaseModel):
+    job_descriptions: List[JobDescription] = Field(..., min_length=1)
+    threshold: Optional[float] = None
+
+
+class MatchedRequirement(BaseModel):
+    requirement: str
+    similarity: float
+    evidence: str
+
+
+class MissingRequirement(BaseModel):
+    requirement: str
+    similarity: float
+
+
+class JobMatch(BaseModel):
+    id: str
+    score: float
+    coverage: float
+    keyword_overlap: Optional[float] = None
+    matched_requirements: List[MatchedRequirement]
+    missing_requirements: List[MissingRequirement]
+    matched_keywords: List[str]
+    missing_keywords: List[str]
+
+
+class MatchResponse(BaseModel):
+    thread_id: str
+    matches: List[JobMatch]
+
+
+class SearchChunk(BaseModel):
+    text: str
+    score: float
+    sections: List[str] = []
+
+
+class ResumeSearchResult(BaseModel):
+    thread_id: str
+    filename: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    score: float
+    chunks: List[SearchChunk]
+
+
+class UserSearchResponse(BaseModel):
+    user_id: str
+    query: str
+    resumes: List[ResumeSearchResult]
+
+
 # --- Endpoints ---
 @app.get("/health")
 async def health_check():
@@ -128,14 +386,24 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint with per-stage latency histograms and counters."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/resume/upload", response_model=ResumeAnalysisResponse)
 async def upload_resume(
+    response: Response,
     file: UploadFile = File(...),
     thread_id: Optional[str] = None,
     user_id: str = Query(..., description="User ID to associate this resume with")
 ):
     """
     Upload a PDF resume for analysis.
+    
+    The response carries a `Server-Timing` header with the ingest stage,
+    LLM and Mongo breakdown for this request.
     """
     logger.info(f"Resume upload requested: filename={file.filename}, thread_id={thread_id}, user_id={user_id}")
     
@@ -149,94 +417,190 @@ async def upload_resume(
     file_bytes = await file.read()
     logger.info(f"Read {len(file_bytes)} bytes from file")
     
-    try:
-        # Step 1: Ingest PDF and build vector store
-        logger.info(f"Ingesting PDF for thread {thread_id}, user {user_id}")
-        ingest_result = ingest_resume_pdf(file_bytes, thread_id, user_id, file.filename)
-        logger.info(f"Ingest result: pages={ingest_result['pages']}, chunks={ingest_result['chunks']}")
-        
-        # Step 2: Use full text directly from ingest (retriever may be empty due to eventual consistency)
-        full_text = ingest_result.get("full_text", "")
-        logger.info(f"Using {len(full_text)} chars for ATS analysis")
-        
-        # Step 3: Run ATS scoring
-        logger.info("Calculating ATS score")
-        ats_result = calculate_ats_score(full_text)
-        logger.info(f"ATS score: {ats_result['total_score']}")
-        
-        # Update ATS score in MongoDB
-        update_thread_ats_score(thread_id, ats_result["total_score"])
-        _THREAD_ANALYSIS_COMPLETE[thread_id] = True
-        
-        return ResumeAnalysisResponse(
-            thread_id=thread_id,
-            filename=ingest_result["filename"],
-            pages=ingest_result["pages"],
-            chunks=ingest_result["chunks"],
-            ats_score=ats_result["total_score"],
-            ats_breakdown=ATSBreakdown(**ats_result["breakdown"]),
-            skills_found=ats_result["found_skills"],
-            action_verbs_found=ats_result["found_verbs"],
-            suggestions=ats_result["suggestions"],
-            message="Resume analyzed successfully! You can now chat about your resume."
-        )
-    except Exception as e:
-        logger.error(f"Upload error: {str(e)}\n{traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Failed to process resume: {str(e)}")
+    with request_timings() as timings, request_deadline(settings.REQUEST_DEADLINE_SECONDS):
+        try:
+            # Step 1: Ingest PDF and build vector store
+            logger.info(f"Ingesting PDF for thread {thread_id}, user {user_id}")
+            # Off the event loop: parsing and embedding take hundreds of milliseconds
+            ingest_result = await asyncio.to_thread(ingest_resume_pdf, file_bytes, thread_id, user_id, file.filename)
+            logger.info(f"Ingest result: pages={ingest_result['pages']}, chunks={ingest_result['chunks']}")
+            
+            # Step 2: Use full text directly from ingest (retriever may be empty due to eventual consistency)
+            full_text = ingest_result.get("full_text", "")
+            logger.info(f"Using {len(full_text)} chars for ATS analysis")
+            
+            # Step 3: Run ATS scoring
+            logger.info("Calculating ATS score")
+            # Also off the loop: the LLM suggestion call waits on admission, rate limits and retry backoff
+            ats_result = await asyncio.to_thread(calculate_ats_score, full_text)
+            logger.info(f"ATS score: {ats_result['total_score']}")
+            
+            # Store the full ATS result so the analyzer node never recomputes it
+            await asyncio.to_thread(update_thread_analysis, thread_id, ats_result)
+            
+            response.headers["Server-Timing"] = timings.server_timing_header()
+            return ResumeAnalysisResponse(
+                thread_id=thread_id,
+                filename=ingest_result["filename"],
+                pages=ingest_result["pages"],
+                chunks=ingest_result["chunks"],
+                ats_score=ats_result["total_score"],
+                ats_breakdown=ATSBreakdown(**ats_result["breakdown"]),
+                skills_found=ats_result["found_skills"],
+                action_verbs_found=ats_result["found_verbs"],
+                suggestions=ats_result["suggestions"],
+                profile=ingest_result.get("profile"),
+                message="Resume analyzed successfully! You can now chat about your resume."
+            )
+        except Exception as e:
+            logger.error(f"Upload error: {str(e)}\n{traceback.format_exc()}")
+            raise HTTPException(status_code=500, detail=f"Failed to process resume: {str(e)}")
+
+
+@app.post("/resume/{thread_id}/match", response_model=MatchResponse)
+async def match_resume(thread_id: str, request: MatchRequest, response: Response):
+    """
+    Score the thread's resume against one or many job descriptions.
+    
+    Requirements of all JDs are embedded in one batch and compared with the
+    stored resume chunks in one matrix product (see app/services/job_match.py).
+    Results keep the input order.
+    """
+    if len(request.job_descriptions) > settings.MATCH_MAX_JOBS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.MATCH_MAX_JOBS} job descriptions per request.")
+    if not thread_has_resume(thread_id):
+        raise HTTPException(status_code=404, detail="Thread not found or no resume uploaded.")
+    logger.info(f"Matching thread {thread_id} against {len(request.job_descriptions)} job descriptions")
+    
+    with request_timings() as timings:
+        try:
+            matches = await asyncio.to_thread(
+                score_job_descriptions,
+                thread_id,
+                [jd.model_dump() for jd in request.job_descriptions],
+                request.threshold,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        response.headers["Server-Timing"] = timings.server_timing_header()
+    return MatchResponse(thread_id=thread_id, matches=matches)
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Send a message to the Resume Agent (non-streaming).
+    
+    The agent runs through `astream_events` so the response can carry a
+    `Server-Timing` header with per-node, per-tool and Mongo timings.
+    Turns on the same thread run one at a time (409 when the queue is full).
     """
     thread_id = request.thread_id
     logger.info(f"Chat request: thread_id={thread_id}, message={request.message[:50]}...")
     
-    if not thread_has_resume(thread_id):
-        logger.warning(f"No resume found for thread {thread_id}")
-        raise HTTPException(
-            status_code=400,
-            detail="No resume found for this thread. Please upload a resume first."
-        )
-    
-    config = {
-        "configurable": {"thread_id": thread_id},
-        "recursion_limit": 10  # Prevent infinite tool call loops
-    }
-    input_state = {
-        "messages": [HumanMessage(content=request.message)],
-        "mode": "chat",
-        "thread_id": thread_id,
-        "resume_analysis": None,
-        "analysis_complete": True
-    }
-    
-    try:
-        logger.info(f"Invoking agent for thread {thread_id}")
-        result = resume_agent.invoke(input_state, config=config)
+    with request_timings() as timings, request_deadline(settings.REQUEST_DEADLINE_SECONDS):
+        if not thread_has_resume(thread_id):
+            logger.warning(f"No resume found for thread {thread_id}")
+            raise HTTPException(
+                status_code=400,
+                detail="No resume found for this thread. Please upload a resume first."
+            )
         
-        messages = result.get("messages", [])
-        last_message = messages[-1].content if messages else "No response generated."
-        logger.info(f"Agent response: {last_message[:100]}...")
+        config = {
+            "configurable": {"thread_id": thread_id},
+            "recursion_limit": 10  # Prevent infinite tool call loops
+        }
+        input_state = {
+            "messages": [HumanMessage(content=request.message)],
+            "mode": "chat",
+            "thread_id": thread_id,
+            "resume_analysis": None,
+            "analysis_complete": True
+        }
         
-        return ChatResponse(
-            thread_id=thread_id,
-            response=last_message
-        )
-    except Exception as e:
-        logger.error(f"Chat error: {str(e)}\n{traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Agent error: {str(e)}")
+        lease, scoped_key = await _begin_turn(thread_id, idempotency_key)
+        succeeded = False
+        try:
+            cached_answer, question_vector, context = await _lookup_cached_answer(thread_id, request.message, config)
+            if cached_answer is not None:
+                logger.info(f"Answer cache hit for thread {thread_id}")
+                await _record_cached_turn(config, request.message, cached_answer)
+                response.headers["Server-Timing"] = timings.server_timing_header()
+                succeeded = True
+                return ChatResponse(thread_id=thread_id, response=cached_answer)
+            
+            logger.info(f"Invoking agent for thread {thread_id}")
+            result: Dict[str, Any] = {}
+            tools_called: List[str] = []
+            async for event in resume_agent.astream_events(input_state, config=config, version="v2"):
+                timings.observe_event(event)
+                if event.get("event") == "on_tool_start":
+                    tools_called.append(event.get("name", ""))
+                # The root run (no parents) ending carries the final graph state
+                if event.get("event") == "on_chain_end" and not event.get("parent_ids"):
+                    result = event.get("data", {}).get("output") or {}
+            
+            messages = result.get("messages", [])
+            last_message = messages[-1].content if messages else "No response generated."
+            logger.info(f"Agent response: {last_message[:100]}...")
+            _cache_answer(thread_id, request.message, question_vector, context, last_message, tools_called)
+            
+            response.headers["Server-Timing"] = timings.server_timing_header()
+            succeeded = True
+            return ChatResponse(
+                thread_id=thread_id,
+                response=last_message
+            )
+        except LLMOverloadedError:
+            raise _overloaded_error()
+        except DeadlineExceededError:
+            raise _deadline_error()
+        except Exception as e:
+            logger.error(f"Chat error: {str(e)}\n{traceback.format_exc()}")
+            raise HTTPException(status_code=500, detail=f"Agent error: {str(e)}")
+        finally:
+            _end_turn(lease, scoped_key, succeeded)
 
 
 @app.post("/chat/stream")
-async def chat_stream(request: ChatRequest):
+async def chat_stream(
+    request: ChatRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    flush_ms: Optional[float] = Query(None, ge=0, description="Max ms a token is held for coalescing (0 = frame per token)"),
+    flush_bytes: Optional[int] = Query(None, ge=0, description="Flush a token frame once this many characters are pending"),
+):
     """
     Stream chat responses token by token using Server-Sent Events (SSE).
+    
+    Tokens are coalesced into `{"token": ...}` frames (see app/core/sse.py);
+    `flush_ms`/`flush_bytes` override SSE_FLUSH_INTERVAL_MS/SSE_FLUSH_BYTES
+    for this request. The thread stays locked until the stream ends, so a
+    second turn on the same thread waits (or gets 409) instead of racing on
+    the checkpoint.
+    
+    The turn runs in the background (app/core/stream_replay.py) and every
+    event carries an id `<stream_id>:<seq>`. Resending the request with a
+    `Last-Event-ID` header, or with the same Idempotency-Key, resumes that
+    stream instead of starting a new turn (410 once it is no longer buffered).
     """
     thread_id = request.thread_id
     logger.info(f"Stream chat request: thread_id={thread_id}, message={request.message[:50]}...")
     
+    resume_from = parse_last_event_id(last_event_id)
+    if resume_from is not None:
+        generation = stream_registry.get(resume_from[0])
+        if generation is None or generation.thread_id != thread_id:
+            raise _stream_expired(thread_id)
+        return _resume_stream(generation, resume_from[1])
+    generation = stream_registry.for_key(_scoped_key(thread_id, idempotency_key))
+    if generation is not None:
+        return _resume_stream(generation, 0)
+    
     if not thread_has_resume(thread_id):
         logger.warning(f"No resume found for thread {thread_id}")
         raise HTTPException(
@@ -256,109 +620,153 @@ async def chat_stream(request: ChatRequest):
         "analysis_complete": True
     }
     
+    lease, scoped_key = await _begin_turn(thread_id, idempotency_key)
+    writer = SSEWriter(
+        flush_bytes=settings.SSE_FLUSH_BYTES if flush_bytes is None else flush_bytes,
+        flush_interval=(settings.SSE_FLUSH_INTERVAL_MS if flush_ms is None else flush_ms) / 1000,
+    )
+    generation = stream_registry.create(thread_id, writer, scoped_key)
+    
     async def event_generator():
-        """Generate SSE events from the LangGraph stream."""
+        """
+        Generate SSE frames from the LangGraph stream (one list per step).
+        
+        Repeated questions are served from the semantic answer cache. The
+        final `done` event carries `cached` and the request's timing breakdown.
+        """
         full_response = ""
         in_tool_call = False
         buffered_content = ""  # Buffer all content during/after tool calls
         has_tool_been_called = False
         final_answer_started = False
+        tools_called: List[str] = []
+        succeeded = False
         
-        try:
-            logger.info(f"Starting stream for thread {thread_id}")
+        with request_timings() as timings, request_deadline(settings.REQUEST_DEADLINE_SECONDS):
+            try:
+                logger.info(f"Starting stream for thread {thread_id}")
+                
+                cached_answer, question_vector, context = await _lookup_cached_answer(thread_id, request.message, config)
+                if cached_answer is not None:
+                    logger.info(f"Answer cache hit for thread {thread_id}")
+                    await _record_cached_turn(config, request.message, cached_answer)
+                    # Replay word by word so clients render it like a live answer
+                    for token in re.findall(r"\s*\S+", cached_answer):
+                        timings.mark_first_token()
+                        TOKENS_STREAMED.inc()
+                        yield writer.token(token)
+                    succeeded = generation.succeeded = True
+                    yield writer.event({'done': True, 'full_response': cached_answer, 'cached': True, 'timings': timings.as_dict()})
+                    yield [DONE_FRAME]
+                    return
             
-            # Use astream_events for token-level streaming
-            async for event in resume_agent.astream_events(input_state, config=config, version="v2"):
-                event_type = event.get("event", "")
+                # Use astream_events for token-level streaming
+                async for event in resume_agent.astream_events(input_state, config=config, version="v2"):
+                    timings.observe_event(event)
+                    event_type = event.get("event", "")
                 
-                # Track tool call state
-                if event_type == "on_tool_start":
-                    in_tool_call = True
-                    has_tool_been_called = True
-                    tool_name = event.get("name", "tool")
-                    logger.info(f"Tool started: {tool_name}")
-                    yield f"data: {json.dumps({'status': 'Analyzing your resume...'})}\n\n"
+                    # Track tool call state
+                    if event_type == "on_tool_start":
+                        in_tool_call = True
+                        has_tool_been_called = True
+                        tool_name = event.get("name", "tool")
+                        tools_called.append(tool_name)
+                        logger.info(f"Tool started: {tool_name}")
+                        yield writer.event({'status': 'Analyzing your resume...'})
                 
-                elif event_type == "on_tool_end":
-                    in_tool_call = False
-                    tool_name = event.get("name", "tool")
-                    logger.info(f"Tool ended: {tool_name}")
-                    # Reset buffer for fresh capture of LLM's synthesized response
-                    buffered_content = ""
+                    elif event_type == "on_tool_end":
+                        in_tool_call = False
+                        tool_name = event.get("name", "tool")
+                        logger.info(f"Tool ended: {tool_name}")
+                        # Reset buffer for fresh capture of LLM's synthesized response
+                        buffered_content = ""
                 
-                # Stream tokens from the chat model
-                elif event_type == "on_chat_model_stream" and not in_tool_call:
-                    chunk = event.get("data", {}).get("chunk")
-                    if chunk and hasattr(chunk, "content") and chunk.content:
-                        token = chunk.content
+                    # Stream tokens from the chat model
+                    elif event_type == "on_chat_model_stream" and not in_tool_call:
+                        chunk = event.get("data", {}).get("chunk")
+                        if chunk and hasattr(chunk, "content") and chunk.content:
+                            token = chunk.content
                         
-                        if has_tool_been_called:
-                            # After a tool call, buffer content and look for answer patterns
-                            buffered_content += token
+                            if has_tool_been_called:
+                                # After a tool call, buffer content and look for answer patterns
+                                buffered_content += token
                             
-                            # Check if we've reached the actual answer portion
-                            # Look for common answer patterns
-                            buffer_lower = buffered_content.lower()
-                            answer_indicators = [
-                                "the resume belongs to",
-                                "this resume is for",
-                                "the owner of this resume",
-                                "based on the resume",
-                                "according to the resume",
-                                "the resume shows",
-                                "from the resume",
-                                "i can see that",
-                                "the name on the resume",
-                                "your resume",
-                            ]
-                            
-                            for indicator in answer_indicators:
-                                if indicator in buffer_lower and not final_answer_started:
-                                    # Found the answer! Stream from this point
-                                    final_answer_started = True
-                                    idx = buffer_lower.find(indicator)
-                                    answer_text = buffered_content[idx:]
-                                    full_response = answer_text
-                                    yield f"data: {json.dumps({'token': answer_text})}\n\n"
-                                    break
-                            
-                            if final_answer_started:
-                                # Continue streaming subsequent tokens
+                                # Check if we've reached the actual answer portion
+                                if not final_answer_started:
+                                    idx = find_answer_start(buffered_content.lower())
+                                    if idx != -1:
+                                        # Found the answer! Stream from this point (the
+                                        # current token is already part of answer_text)
+                                        final_answer_started = True
+                                        answer_text = buffered_content[idx:]
+                                        full_response = answer_text
+                                        TOKENS_STREAMED.inc()
+                                        yield writer.token(answer_text)
+                                
+                                elif final_answer_started:
+                                    # Continue streaming subsequent tokens
+                                    full_response += token
+                                    TOKENS_STREAMED.inc()
+                                    yield writer.token(token)
+                            else:
+                                # No tool call, stream directly
                                 full_response += token
-                                yield f"data: {json.dumps({'token': token})}\n\n"
-                        else:
-                            # No tool call, stream directly
-                            full_response += token
-                            yield f"data: {json.dumps({'token': token})}\n\n"
+                                TOKENS_STREAMED.inc()
+                                yield writer.token(token)
             
-            # If we buffered content but never found an answer pattern, send it all
-            if has_tool_been_called and not final_answer_started and buffered_content:
-                # Just send the last part (likely the answer)
-                lines = buffered_content.strip().split('\n')
-                # Take last few lines as the answer
-                answer = '\n'.join(lines[-3:]) if len(lines) > 3 else buffered_content
-                full_response = answer
-                yield f"data: {json.dumps({'token': answer})}\n\n"
+                # If we buffered content but never found an answer pattern, send it all
+                if has_tool_been_called and not final_answer_started and buffered_content:
+                    # Just send the last part (likely the answer)
+                    lines = buffered_content.strip().split('\n')
+                    # Take last few lines as the answer
+                    answer = '\n'.join(lines[-3:]) if len(lines) > 3 else buffered_content
+                    full_response = answer
+                    yield writer.token(answer)
             
-            logger.info(f"Stream complete, total response: {len(full_response)} chars")
-            yield f"data: {json.dumps({'done': True, 'full_response': full_response})}\n\n"
-            yield "data: [DONE]\n\n"
+                logger.info(f"Stream complete, total response: {len(full_response)} chars")
+                _cache_answer(thread_id, request.message, question_vector, context, full_response, tools_called)
+                succeeded = generation.succeeded = True
+                yield writer.event({'done': True, 'full_response': full_response, 'cached': False, 'timings': timings.as_dict()})
+                yield [DONE_FRAME]
             
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"Stream error: {error_msg}\n{traceback.format_exc()}")
-            yield f"data: {json.dumps({'error': error_msg})}\n\n"
-            yield "data: [DONE]\n\n"
+            except LLMOverloadedError:
+                logger.warning(f"Stream rejected by LLM admission control for thread {thread_id}")
+                yield writer.event({'error': 'The assistant is handling too many requests. Please retry shortly.', 'code': 'overloaded'})
+                yield [DONE_FRAME]
+            except DeadlineExceededError:
+                logger.warning(f"Stream deadline exceeded for thread {thread_id}")
+                yield writer.event({'error': 'The assistant took too long to respond. Please try again.', 'code': 'deadline_exceeded'})
+                yield [DONE_FRAME]
+            except Exception as e:
+                error_msg = str(e)
+                logger.error(f"Stream error: {error_msg}\n{traceback.format_exc()}")
+                yield writer.event({'error': error_msg})
+                yield [DONE_FRAME]
+            finally:
+                _end_turn(lease, scoped_key, succeeded)
     
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        }
-    )
+    generation.start(event_generator())
+    return _sse_response(generation.events(), generation.stream_id)
+
+
+@app.get("/chat/stream/{stream_id}")
+async def resume_chat_stream(
+    stream_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Reattach to a /chat/stream generation by its X-Stream-Id.
+    
+    Replays the events after `Last-Event-ID` (from the start without it),
+    then follows the turn if it is still running.
+    """
+    generation = stream_registry.get(stream_id)
+    if generation is None:
+        STREAM_RESUMES.inc(result="expired")
+        raise HTTPException(status_code=410, detail="This stream is no longer available.")
+    resume_from = parse_last_event_id(last_event_id)
+    after = resume_from[1] if resume_from is not None and resume_from[0] == stream_id else 0
+    return _resume_stream(generation, after)
 
 
 @app.get("/threads")
@@ -393,6 +801,26 @@ async def get_user_conversation_history(user_id: str):
     }
 
 
+@app.get("/users/{user_id}/search", response_model=UserSearchResponse)
+async def search_user_resume_versions(
+    user_id: str,
+    response: Response,
+    query: str = Query(..., min_length=1, description="What to look for, e.g. \"Kubernetes\""),
+    k: Optional[int] = Query(None, ge=1, le=200, description="Chunks fetched across all resumes"),
+    per_resume: Optional[int] = Query(None, ge=1, le=20, description="Best chunks kept per resume"),
+):
+    """
+    Search all of a user's resumes in one vector query.
+    Results are grouped by thread, best-matching resume first
+    (e.g. which version highlights Kubernetes best).
+    """
+    logger.info(f"Searching resumes of user {user_id}")
+    with request_timings() as timings:
+        resumes = await asyncio.to_thread(search_user_resumes, user_id, query, k, per_resume)
+        response.headers["Server-Timing"] = timings.server_timing_header()
+    return UserSearchResponse(user_id=user_id, query=query, resumes=resumes)
+
+
 @app.get("/threads/{thread_id}/history")
 async def get_thread_message_history(thread_id: str):
     """
@@ -434,6 +862,45 @@ async def get_thread_message_history(thread_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to retrieve history: {str(e)}")
 
 
+@app.delete("/threads/{thread_id}")
+async def delete_thread(thread_id: str):
+    """
+    Delete a thread: its resume chunks, metadata, conversation checkpoints
+    and every worker's cached state for it.
+    
+    Waits for a running turn on the thread to finish first (409 if the
+    thread's queue is full).
+    """
+    logger.info(f"Deleting thread {thread_id}")
+    try:
+        lease = await thread_serializer.acquire(thread_id)
+    except ThreadBusyError:
+        raise HTTPException(
+            status_code=409,
+            detail="Another request for this thread is still running. Please retry when it finishes."
+        )
+    try:
+        report = await asyncio.to_thread(delete_threads, [thread_id])
+    finally:
+        lease.release()
+    if report.documents == 0:
+        raise HTTPException(status_code=404, detail="Thread not found.")
+    return {"thread_id": thread_id, "deleted": report.as_dict()}
+
+
+@app.delete("/users/{user_id}/threads")
+async def delete_user_conversation_history(user_id: str):
+    """
+    Delete every thread of a user, in batches of THREAD_DELETE_BATCH threads.
+    
+    Turns still running on those threads are not waited for; anything they
+    write afterwards is removed by the orphan GC.
+    """
+    logger.info(f"Deleting all threads of user {user_id}")
+    report = await asyncio.to_thread(delete_user_threads, user_id)
+    return {"user_id": user_id, "deleted": report.as_dict()}
+
+
 @app.get("/debug/vectorstore/{thread_id}")
 async def debug_vectorstore(thread_id: str):
     """
@@ -2,9 +2,13 @@ from app.memory.checkpointer import get_checkpointer, list_all_threads
 from app.memory.thread_store import (
     save_thread_metadata,
     get_thread_metadata_from_db,
+    get_thread_analysis,
+    get_lexical_index,
     get_user_threads,
     thread_exists,
-    update_thread_ats_score
+    update_thread_ats_score,
+    update_thread_analysis,
+    update_lexical_index
 )
 
 __all__ = [
@@ -12,7 +16,11 @@ __all__ = [
     "list_all_threads",
     "save_thread_metadata",
     "get_thread_metadata_from_db",
+    "get_thread_analysis",
+    "get_lexical_index",
     "get_user_threads",
     "thread_exists",
-    "update_thread_ats_score"
+    "update_thread_ats_score",
+    "update_thread_analysis",
+    "update_lexical_index"
 ]
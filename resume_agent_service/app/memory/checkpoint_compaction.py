@@ -0,0 +1,260 @@
+"""
+Retention and compaction for the LangGraph checkpoint collections.
+
+MongoDBSaver writes a full checkpoint (plus pending writes) for every
+step of every turn and never deletes any, while the service only ever
+reads a thread's newest checkpoint. The compactor enforces two rules per
+thread (and checkpoint namespace):
+
+- keep the newest CHECKPOINT_KEEP_LATEST checkpoints and delete older ones
+  together with their pending writes;
+- if the newest checkpoint is older than CHECKPOINT_MAX_AGE_DAYS, delete
+  the thread's checkpoint data altogether (its resume and metadata stay,
+  so the user can start a new conversation on it).
+
+Checkpoint ids are uuid6 values that sort by creation time, so every
+delete is bounded by a checkpoint id found during the scan. Turns that
+run while the job does only add newer checkpoints, which are never
+touched. Documents are deleted in batches of CHECKPOINT_COMPACTION_BATCH,
+pending writes before their checkpoints, with an optional pause between
+batches to spare the primary.
+
+Run it from cron (prints a JSON report):
+    python -m app.memory.checkpoint_compaction [--dry-run]
+"""
+import argparse
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+from uuid import UUID
+
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+
+from app.core.config import get_settings
+from app.memory.checkpointer import get_checkpointer
+
+logger = logging.getLogger("resume_agent.checkpoint_compaction")
+
+settings = get_settings()
+
+# 100 ns intervals between the uuid epoch (1582-10-15) and the Unix epoch
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def checkpoint_time(checkpoint_id: str) -> Optional[float]:
+    """
+    Unix time at which a checkpoint was created, decoded from its uuid6 id.
+
+    Returns:
+        Seconds since the epoch, or None if the id is not a uuid6
+    """
+    try:
+        value = UUID(checkpoint_id).int
+    except (TypeError, ValueError):
+        return None
+    if (value >> 76) & 0xF != 6:
+        return None
+    timestamp = ((value >> 80) & 0xFFFFFFFFFFFF) << 12 | ((value >> 64) & 0x0FFF)
+    return (timestamp - _UUID_EPOCH_OFFSET) / 1e7
+
+
+@dataclass
+class CompactionReport:
+    """What one compaction run deleted (or would delete, on a dry run)."""
+
+    dry_run: bool = False
+    threads_scanned: int = 0
+    threads_compacted: int = 0  # older checkpoints trimmed to the newest N
+    threads_expired: int = 0    # all checkpoint data removed
+    checkpoints_deleted: int = 0
+    writes_deleted: int = 0
+    bytes_reclaimed: int = 0    # BSON size of the deleted documents
+    duration_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CheckpointCompactor:
+    """
+    Applies the retention policy to a checkpoint and a pending-writes collection.
+
+    Attributes:
+        keep_latest: Checkpoints kept per thread and namespace (at least 1)
+        max_age_seconds: Age of the newest checkpoint after which a thread expires (<= 0 = never)
+        batch_size: Documents fetched and deleted per round trip
+        pause: Seconds to sleep between delete batches
+        measure_bytes: Whether bytes_reclaimed is measured (turned off if the server lacks $bsonSize)
+    """
+
+    def __init__(
+        self,
+        checkpoints: Collection,
+        writes: Collection,
+        keep_latest: int,
+        max_age_seconds: float,
+        batch_size: int,
+        pause: float = 0.0,
+    ):
+        if keep_latest < 1:
+            raise ValueError("keep_latest must be at least 1; the newest checkpoint is the thread's state")
+        self.checkpoints = checkpoints
+        self.writes = writes
+        self.keep_latest = keep_latest
+        self.max_age_seconds = max_age_seconds
+        self.batch_size = max(1, batch_size)
+        self.pause = pause
+        self.measure_bytes = True
+
+    def run(self, dry_run: bool = False, max_threads: Optional[int] = None) -> CompactionReport:
+        """
+        Compact every thread (or the first `max_threads` needing work).
+
+        Args:
+            dry_run: Count what would be deleted without deleting it
+            max_threads: Stop after this many threads were compacted or expired
+
+        Returns:
+            The run's CompactionReport
+        """
+        start = time.monotonic()
+        report = CompactionReport(dry_run=dry_run)
+        expire_before = time.time() - self.max_age_seconds if self.max_age_seconds > 0 else None
+        compacted, expired = set(), set()
+
+        for thread_id, checkpoint_ns, count, latest in self._threads():
+            report.threads_scanned += 1
+            scope = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}
+            created = checkpoint_time(latest)
+            if expire_before is not None and created is not None and created < expire_before:
+                bound = {"$lte": latest}
+                expired.add(thread_id)
+            elif count > self.keep_latest:
+                bound = {"$lt": self._cutoff(scope)}
+                compacted.add(thread_id)
+            else:
+                continue
+
+            query = {**scope, "checkpoint_id": bound}
+            docs, size = self._delete(self.writes, query, dry_run)
+            report.writes_deleted += docs
+            report.bytes_reclaimed += size
+            docs, size = self._delete(self.checkpoints, query, dry_run)
+            report.checkpoints_deleted += docs
+            report.bytes_reclaimed += size
+
+            if max_threads is not None and len(compacted | expired) >= max_threads:
+                break
+
+        report.threads_expired = len(expired)
+        report.threads_compacted = len(compacted - expired)
+        report.duration_seconds = round(time.monotonic() - start, 3)
+        logger.info(
+            f"Checkpoint compaction{' (dry run)' if dry_run else ''}: "
+            f"{report.checkpoints_deleted} checkpoints and {report.writes_deleted} writes "
+            f"({report.bytes_reclaimed} bytes) from {report.threads_compacted} compacted and "
+            f"{report.threads_expired} expired threads in {report.duration_seconds}s"
+        )
+        return report
+
+    def _threads(self) -> Iterator[Tuple[str, str, int, str]]:
+        """(thread_id, checkpoint_ns, checkpoint count, newest checkpoint id) for every thread."""
+        pipeline = [
+            {"$group": {
+                "_id": {"thread_id": "$thread_id", "checkpoint_ns": "$checkpoint_ns"},
+                "count": {"$sum": 1},
+                "latest": {"$max": "$checkpoint_id"},
+            }},
+        ]
+        for row in self.checkpoints.aggregate(pipeline, allowDiskUse=True, batchSize=self.batch_size):
+            yield row["_id"]["thread_id"], row["_id"]["checkpoint_ns"], row["count"], row["latest"]
+
+    def _cutoff(self, scope: Dict[str, str]) -> str:
+        """Id of the oldest checkpoint to keep: the `keep_latest`-th newest."""
+        cursor = (
+            self.checkpoints.find(scope, {"_id": 0, "checkpoint_id": 1})
+            .sort("checkpoint_id", -1)
+            .skip(self.keep_latest - 1)
+            .limit(1)
+        )
+        return next(cursor)["checkpoint_id"]
+
+    def _delete(self, collection: Collection, query: Dict[str, Any], dry_run: bool) -> Tuple[int, int]:
+        """Delete matching documents in batches; returns (documents, bytes)."""
+        deleted = size = 0
+        ids = []
+        for doc in collection.find(query, {"_id": 1}, batch_size=self.batch_size):
+            ids.append(doc["_id"])
+            if len(ids) >= self.batch_size:
+                size += self._batch_bytes(collection, ids)
+                deleted += self._delete_batch(collection, ids, dry_run)
+                ids = []
+        if ids:
+            size += self._batch_bytes(collection, ids)
+            deleted += self._delete_batch(collection, ids, dry_run)
+        return deleted, size
+
+    def _batch_bytes(self, collection: Collection, ids: list) -> int:
+        """BSON size of a batch, summed server-side so the documents never leave the database."""
+        if not self.measure_bytes:
+            return 0
+        pipeline = [
+            {"$match": {"_id": {"$in": ids}}},
+            {"$group": {"_id": None, "bytes": {"$sum": {"$bsonSize": "$$ROOT"}}}},
+        ]
+        try:
+            rows = list(collection.aggregate(pipeline))
+        except OperationFailure as e:
+            # $bsonSize needs MongoDB 4.4+; keep compacting, just without the byte count
+            logger.warning(f"Not measuring reclaimed bytes: {e}")
+            self.measure_bytes = False
+            return 0
+        return rows[0]["bytes"] if rows else 0
+
+    def _delete_batch(self, collection: Collection, ids: list, dry_run: bool) -> int:
+        if dry_run:
+            return len(ids)
+        result = collection.delete_many({"_id": {"$in": ids}})
+        if self.pause > 0:
+            time.sleep(self.pause)
+        return result.deleted_count
+
+
+def create_compactor(**overrides: Any) -> CheckpointCompactor:
+    """
+    Compactor for the service's checkpointer, configured from settings.
+
+    Raises:
+        RuntimeError: If STORAGE_BACKEND is not mongo
+    """
+    if settings.STORAGE_BACKEND != "mongo":
+        raise RuntimeError(f"Checkpoint compaction runs on the mongo backend only (STORAGE_BACKEND={settings.STORAGE_BACKEND})")
+    checkpointer = get_checkpointer()
+    options = {
+        "keep_latest": settings.CHECKPOINT_KEEP_LATEST,
+        "max_age_seconds": settings.CHECKPOINT_MAX_AGE_DAYS * 86400,
+        "batch_size": settings.CHECKPOINT_COMPACTION_BATCH,
+        "pause": settings.CHECKPOINT_COMPACTION_PAUSE,
+    }
+    options.update(overrides)
+    return CheckpointCompactor(checkpointer.checkpoint_collection, checkpointer.writes_collection, **options)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the checkpoint retention policy.")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be deleted")
+    parser.add_argument("--keep", type=int, default=settings.CHECKPOINT_KEEP_LATEST)
+    parser.add_argument("--max-age-days", type=float, default=settings.CHECKPOINT_MAX_AGE_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.CHECKPOINT_COMPACTION_BATCH)
+    parser.add_argument("--max-threads", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    compactor = create_compactor(
+        keep_latest=args.keep,
+        max_age_seconds=args.max_age_days * 86400,
+        batch_size=args.batch_size,
+    )
+    print(json.dumps(compactor.run(dry_run=args.dry_run, max_threads=args.max_threads).as_dict(), indent=2))
@@ -0,0 +1,93 @@
+"""
+Compressed serialization for checkpoint payloads.
+
+Checkpoints carry the whole message history, including every
+resume_rag_tool excerpt and web search result, so a long thread's
+checkpoint is mostly repeated prose. `CompressedSerializer` wraps the
+saver's serializer and compresses payloads of at least `min_bytes` with
+zstd (zlib if `zstandard` isn't installed), keeping the result only if it
+is smaller. The codec is recorded in the stored type tag ("msgpack+zstd"),
+so documents written before compression (plain "msgpack") and small
+uncompressed payloads read back unchanged.
+
+Compressed documents stay readable with CHECKPOINT_COMPRESSION=none,
+which only stops new payloads from being compressed. Workers that predate
+this serializer can't read them: upgrade every worker before enabling it
+on a shared database.
+"""
+import logging
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+from app.core.config import get_settings
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger("resume_agent.checkpoint_serde")
+
+settings = get_settings()
+
+# codec -> (compress, decompress)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if ZSTD_AVAILABLE:
+    CODECS["zstd"] = (lambda data: zstandard.compress(data, 3), zstandard.decompress)
+
+_SEPARATOR = "+"
+
+
+class CompressedSerializer:
+    """
+    Serializer that compresses large payloads of an inner serializer.
+
+    Attributes:
+        inner: Serializer producing the uncompressed (type, bytes)
+        codec: Codec for new payloads ("zstd" or "zlib"; None stores them uncompressed)
+        min_bytes: Payloads smaller than this are stored uncompressed
+    """
+
+    def __init__(self, inner: SerializerProtocol, codec: Optional[str] = "zstd", min_bytes: int = 1024):
+        if codec == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard is not installed; compressing checkpoints with zlib")
+            codec = "zlib"
+        if codec is not None and codec not in CODECS:
+            raise ValueError(f"Unknown checkpoint compression codec {codec!r}")
+        self.inner = inner
+        self.codec = codec
+        self.min_bytes = min_bytes
+        self._compress = CODECS[codec][0] if codec else None
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.inner.dumps_typed(obj)
+        if self._compress is None or len(data) < self.min_bytes:
+            return type_, data
+        compressed = self._compress(data)
+        if len(compressed) >= len(data):
+            return type_, data
+        return f"{type_}{_SEPARATOR}{self.codec}", compressed
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        base, _, codec = type_.rpartition(_SEPARATOR)
+        if base and codec in CODECS:
+            return self.inner.loads_typed((base, CODECS[codec][1](payload)))
+        if base and codec == "zstd":
+            raise RuntimeError("Checkpoint is zstd-compressed but zstandard is not installed")
+        return self.inner.loads_typed(data)
+
+
+def create_serde(inner: SerializerProtocol) -> CompressedSerializer:
+    """Wrap `inner` as configured by CHECKPOINT_COMPRESSION (zstd, zlib or none)."""
+    codec = settings.CHECKPOINT_COMPRESSION
+    return CompressedSerializer(
+        inner,
+        codec=None if codec == "none" else codec,
+        min_bytes=settings.CHECKPOINT_COMPRESSION_MIN_BYTES,
+    )
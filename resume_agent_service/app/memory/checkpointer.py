@@ -1,24 +1,129 @@
 """
 Checkpointer for LangGraph thread persistence.
 
-Uses MongoDB for persistent checkpoint storage across server restarts.
+Uses MongoDB (or the SQLite database with STORAGE_BACKEND=sqlite) for
+persistent checkpoint storage across server restarts.
 """
 import os
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
+from langchain_core.runnables import RunnableConfig, run_in_executor
+from langgraph.checkpoint.base import CheckpointTuple
 from langgraph.checkpoint.mongodb import MongoDBSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
 from pymongo import MongoClient
 
+from app.core.config import get_settings
+from app.core.metrics import MONGO_LATENCY, SQLITE_LATENCY
+from app.memory.checkpoint_serde import create_serde
+from app.storage import sqlite_database
+
 # Load .env BEFORE accessing environment variables
 load_dotenv()
 
-checkpointer = MongoDBSaver(
-    client=MongoClient(os.getenv("MONGODB_URI")),
-    db_name=os.getenv("DB_NAME", "test"),
-    collection_name="checkpoints",
-)
+
+class InstrumentedMongoDBSaver(MongoDBSaver):
+    """
+    MongoDBSaver that records the latency of every checkpoint read and write.
+
+    The async variants of MongoDBSaver delegate to these sync methods in an
+    executor, so overriding the sync methods covers both code paths.
+    """
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with MONGO_LATENCY.time(collection="checkpoints", operation="get_tuple"):
+            return super().get_tuple(config)
+
+    def list(self, config: Optional[RunnableConfig], **kwargs: Any) -> Iterator[CheckpointTuple]:
+        with MONGO_LATENCY.time(collection="checkpoints", operation="list"):
+            yield from super().list(config, **kwargs)
+
+    def put(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        with MONGO_LATENCY.time(collection="checkpoints", operation="put"):
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        with MONGO_LATENCY.time(collection="checkpoint_writes", operation="put_writes"):
+            return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_threads(self, thread_ids: List[str]) -> Tuple[int, int]:
+        """Delete the checkpoints and pending writes of `thread_ids`; returns (checkpoints, writes)."""
+        query = {"thread_id": {"$in": list(thread_ids)}}
+        with MONGO_LATENCY.time(collection="checkpoint_writes", operation="delete_many"):
+            writes = self.writes_collection.delete_many(query).deleted_count
+        with MONGO_LATENCY.time(collection="checkpoints", operation="delete_many"):
+            checkpoints = self.checkpoint_collection.delete_many(query).deleted_count
+        return checkpoints, writes
+
+
+class InstrumentedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver with latency metrics and async support.
+
+    SqliteSaver is sync-only (its async methods raise). Like MongoDBSaver,
+    this runs the sync methods in an executor; they serialize on the
+    saver's own connection and lock.
+    """
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with SQLITE_LATENCY.time(collection="checkpoints", operation="get_tuple"):
+            return super().get_tuple(config)
+
+    def list(self, config: Optional[RunnableConfig], **kwargs: Any) -> Iterator[CheckpointTuple]:
+        with SQLITE_LATENCY.time(collection="checkpoints", operation="list"):
+            yield from super().list(config, **kwargs)
+
+    def put(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        with SQLITE_LATENCY.time(collection="checkpoints", operation="put"):
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        with SQLITE_LATENCY.time(collection="writes", operation="put_writes"):
+            return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_threads(self, thread_ids: List[str]) -> Tuple[int, int]:
+        """Delete the checkpoints and pending writes of `thread_ids`; returns (checkpoints, writes)."""
+        placeholders = ",".join("?" * len(thread_ids))
+        with SQLITE_LATENCY.time(collection="checkpoints", operation="delete"), self.cursor() as cur:
+            writes = cur.execute(f"DELETE FROM writes WHERE thread_id IN ({placeholders})", thread_ids).rowcount
+            checkpoints = cur.execute(f"DELETE FROM checkpoints WHERE thread_id IN ({placeholders})", thread_ids).rowcount
+        return checkpoints, writes
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await run_in_executor(None, self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], **kwargs: Any) -> AsyncIterator[CheckpointTuple]:
+        for item in await run_in_executor(None, lambda: [*self.list(config, **kwargs)]):
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        return await run_in_executor(None, self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        return await run_in_executor(None, self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await run_in_executor(None, self.delete_thread, thread_id)
+
+
+def create_checkpointer():
+    """Checkpointer for the configured STORAGE_BACKEND, with compressed payloads."""
+    serde = create_serde(JsonPlusSerializer())
+    if get_settings().STORAGE_BACKEND == "sqlite":
+        return InstrumentedSqliteSaver(sqlite_database().connect(), serde=serde)
+    return InstrumentedMongoDBSaver(
+        client=MongoClient(os.getenv("MONGODB_URI")),
+        db_name=os.getenv("DB_NAME", "test"),
+        collection_name="checkpoints",
+        serde=serde,
+    )
+
+
+checkpointer = create_checkpointer()
 
 
-def get_checkpointer() -> MongoDBSaver:
+def get_checkpointer():
     """
     Get the memory checkpointer instance for thread memory.
     
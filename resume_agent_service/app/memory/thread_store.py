@@ -1,22 +1,15 @@
 """
-MongoDB-backed thread metadata storage.
-Replaces in-memory _THREAD_METADATA with persistent storage.
+Persistent thread metadata storage.
+Replaces in-memory _THREAD_METADATA with the configured storage backend
+(MongoDB `threads` collection or SQLite, see app/storage).
 """
-import os
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List, Set
 from datetime import datetime
-from dotenv import load_dotenv
-from pymongo import MongoClient
 
-# Load .env to ensure env vars are available
-load_dotenv()
+from app.storage import thread_documents
 
-
-def _get_threads_collection():
-    """Get the MongoDB threads collection."""
-    client = MongoClient(os.getenv("MONGODB_URI"))
-    db = client[os.getenv("DB_NAME", "test")]
-    return db["threads"]
+# Large fields read only by the analyzer or the retriever; left out of metadata and listings
+_HEAVY_FIELDS = ("full_text", "lexical_index")
 
 
 def save_thread_metadata(
@@ -25,10 +18,13 @@ def save_thread_metadata(
     filename: str,
     pages: int,
     chunks: int,
-    ats_score: float = None
+    ats_score: float = None,
+    profile: Optional[Dict] = None,
+    full_text: Optional[str] = None,
+    lexical_index: Optional[Dict] = None
 ) -> None:
     """
-    Save or update thread metadata in MongoDB.
+    Save or update thread metadata in storage.
     
     Args:
         thread_id: Unique thread identifier
@@ -37,23 +33,23 @@ def save_thread_metadata(
         pages: Number of pages in PDF
         chunks: Number of text chunks created
         ats_score: Optional ATS score
+        profile: Optional structured resume profile (see ResumeProfile)
+        full_text: Optional full resume text, reused by the analyzer node
+        lexical_index: Optional serialized BM25 index over the chunks
     """
-    collection = _get_threads_collection()
-    collection.update_one(
-        {"thread_id": thread_id},
+    thread_documents().set(
+        thread_id,
         {
-            "$set": {
-                "thread_id": thread_id,
-                "user_id": user_id,
-                "filename": filename,
-                "pages": pages,
-                "chunks": chunks,
-                "ats_score": ats_score,
-                "updated_at": datetime.utcnow(),
-            },
-            "$setOnInsert": {
-                "created_at": datetime.utcnow(),
-            }
+            "thread_id": thread_id,
+            "user_id": user_id,
+            "filename": filename,
+            "pages": pages,
+            "chunks": chunks,
+            "ats_score": ats_score,
+            "profile": profile,
+            "full_text": full_text,
+            "lexical_index": lexical_index,
+            "updated_at": datetime.utcnow(),
         },
         upsert=True
     )
@@ -61,7 +57,7 @@ def save_thread_metadata(
 
 def get_thread_metadata_from_db(thread_id: str) -> Optional[Dict]:
     """
-    Retrieve thread metadata from MongoDB.
+    Retrieve thread metadata from storage.
     
     Args:
         thread_id: Thread ID to lookup
@@ -69,12 +65,46 @@ def get_thread_metadata_from_db(thread_id: str) -> Optional[Dict]:
     Returns:
         dict with thread metadata or None if not found
     """
-    collection = _get_threads_collection()
-    doc = collection.find_one({"thread_id": thread_id})
-    if doc:
-        doc.pop("_id", None)  # Remove MongoDB ObjectId
-        return doc
-    return None
+    return thread_documents().get(thread_id, exclude=_HEAVY_FIELDS)
+
+
+def get_thread_analysis(thread_id: str) -> Optional[Dict]:
+    """
+    Retrieve everything stored for a thread at upload, including the
+    full resume text and ATS results, in a single indexed read.
+    
+    Args:
+        thread_id: Thread ID to lookup
+        
+    Returns:
+        dict with the full thread document or None if not found
+    """
+    return thread_documents().get(thread_id, exclude=("lexical_index",))
+
+
+def get_lexical_index(thread_id: str) -> Optional[Dict]:
+    """
+    Retrieve the serialized BM25 index stored for a thread at ingest.
+    
+    Args:
+        thread_id: Thread ID to lookup
+        
+    Returns:
+        Serialized index, or None if the thread or its index doesn't exist
+    """
+    doc = thread_documents().get(thread_id, fields=("lexical_index",))
+    return (doc or {}).get("lexical_index")
+
+
+def update_lexical_index(thread_id: str, lexical_index: Dict) -> None:
+    """
+    Store a BM25 index backfilled for a thread ingested before indexes existed.
+    
+    Args:
+        thread_id: Thread ID to update
+        lexical_index: Serialized BM25 index
+    """
+    thread_documents().set(thread_id, {"lexical_index": lexical_index})
 
 
 def get_user_threads(user_id: str) -> List[Dict]:
@@ -87,16 +117,49 @@ def get_user_threads(user_id: str) -> List[Dict]:
     Returns:
         List of thread metadata dictionaries
     """
-    collection = _get_threads_collection()
-    cursor = collection.find(
-        {"user_id": user_id}
-    ).sort("updated_at", -1)
+    return thread_documents().list_for_user(user_id, exclude=_HEAVY_FIELDS)
+
+
+def get_user_thread_ids(user_id: str) -> List[str]:
+    """
+    Get the IDs of every thread a user owns.
     
-    threads = []
-    for doc in cursor:
-        doc.pop("_id", None)
-        threads.append(doc)
-    return threads
+    Args:
+        user_id: User ID to get threads for
+        
+    Returns:
+        Thread IDs (unordered)
+    """
+    return [doc["thread_id"] for doc in thread_documents().list_for_user(user_id, fields=("thread_id",))]
+
+
+def existing_thread_ids(thread_ids: List[str]) -> Set[str]:
+    """
+    Return which of `thread_ids` have a thread document.
+    
+    One query on the unique thread_id index per call, so callers can join
+    other collections against threads in batches.
+    
+    Args:
+        thread_ids: Thread IDs to look up
+        
+    Returns:
+        The subset that exists
+    """
+    return thread_documents().existing(thread_ids)
+
+
+def delete_thread_metadata(thread_ids: List[str]) -> int:
+    """
+    Delete the thread documents of `thread_ids`.
+    
+    Args:
+        thread_ids: Thread IDs to delete
+        
+    Returns:
+        Number of documents deleted
+    """
+    return thread_documents().delete(thread_ids)
 
 
 def thread_exists(thread_id: str) -> bool:
@@ -109,8 +172,7 @@ def thread_exists(thread_id: str) -> bool:
     Returns:
         True if thread exists, False otherwise
     """
-    collection = _get_threads_collection()
-    return collection.find_one({"thread_id": thread_id}) is not None
+    return bool(thread_documents().existing([thread_id]))
 
 
 def update_thread_ats_score(thread_id: str, ats_score: float) -> None:
@@ -121,8 +183,22 @@ def update_thread_ats_score(thread_id: str, ats_score: float) -> None:
         thread_id: Thread ID to update
         ats_score: New ATS score
     """
-    collection = _get_threads_collection()
-    collection.update_one(
-        {"thread_id": thread_id},
-        {"$set": {"ats_score": ats_score, "updated_at": datetime.utcnow()}}
-    )
+    thread_documents().set(thread_id, {"ats_score": ats_score, "updated_at": datetime.utcnow()})
+
+
+def update_thread_analysis(thread_id: str, ats_result: Dict[str, Any]) -> None:
+    """
+    Store the full ATS result computed at upload so it is never recomputed.
+    
+    Args:
+        thread_id: Thread ID to update
+        ats_result: Output of calculate_ats_score
+    """
+    thread_documents().set(thread_id, {
+        "ats_score": ats_result["total_score"],
+        "ats_breakdown": ats_result["breakdown"],
+        "found_skills": ats_result["found_skills"],
+        "found_verbs": ats_result["found_verbs"],
+        "suggestions": ats_result["suggestions"],
+        "updated_at": datetime.utcnow(),
+    })
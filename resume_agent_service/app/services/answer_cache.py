@@ -0,0 +1,105 @@
+"""
+Per-thread semantic cache of chat answers.
+
+Questions are embedded with the same MiniLM model as the resume chunks.
+A new question whose cosine similarity to a cached question on the same
+thread clears the threshold reuses that answer, which skips both LLM calls
+and the retrieval in between.
+
+An answer is only reused in the same conversational context: each entry
+records a digest of the AI reply the question followed, and a lookup must
+match it. A follow-up such as "make it shorter" after a different answer
+therefore misses. Turns that called a web search tool are never stored,
+since their answers go stale. Entries live in the shared state tier
+(app/core/shared_state.py), so an answer cached by one worker is served by
+all of them. They are dropped when the thread's resume is re-ingested, and
+evicted least-recently-used by thread once the entry budget is reached.
+"""
+import hashlib
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.metrics import CACHE_REQUESTS
+from app.core.shared_state import SharedState, shared_state
+
+_NAMESPACE = "answers"
+
+# Tools whose results change over time; answers built on them aren't cached
+UNCACHEABLE_TOOLS = frozenset({"job_search_tool", "career_advice_search", "job_recommendation_tool"})
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else array
+
+
+def _question_key(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+def context_digest(previous_answer: Optional[str]) -> str:
+    """Digest of the AI reply a question follows ("" at the start of a thread)."""
+    if not previous_answer:
+        return ""
+    return hashlib.sha1(previous_answer.encode("utf-8")).hexdigest()[:16]
+
+
+def cacheable_turn(tools_called: Iterable[str]) -> bool:
+    """Whether an answer produced with these tools may be cached."""
+    return not UNCACHEABLE_TOOLS.intersection(tools_called)
+
+
+class SemanticAnswerCache:
+    """thread_id -> {question: answer} with similarity lookup, stored in a SharedState."""
+
+    def __init__(self, state: SharedState, threshold: float, max_per_thread: int):
+        self.state = state
+        self.threshold = threshold
+        self.max_per_thread = max_per_thread
+
+    def lookup(self, thread_id: str, vector: Sequence[float], context: str) -> Optional[str]:
+        """
+        Find a cached answer for a question on this thread.
+
+        Args:
+            thread_id: Conversation thread
+            vector: Embedding of the incoming question
+            context: context_digest of the reply the question follows
+
+        Returns:
+            The best-matching cached answer at or above the threshold, else None
+        """
+        query = _normalize(vector)
+        # Entries are [question, unit float32 vector bytes, answer, context digest]
+        entries = [entry for entry in (self.state.get(_NAMESPACE, thread_id) or [])
+                   if len(entry) == 4 and entry[3] == context and len(entry[1]) == query.nbytes]
+        if entries:
+            vectors = np.frombuffer(b"".join(entry[1] for entry in entries), dtype=np.float32)
+            scores = vectors.reshape(len(entries), -1) @ query
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                CACHE_REQUESTS.inc(cache="answer", result="hit")
+                return entries[best][2]
+        CACHE_REQUESTS.inc(cache="answer", result="miss")
+        return None
+
+    def store(self, thread_id: str, question: str, vector: Sequence[float], context: str, answer: str) -> None:
+        """Cache `answer` for `question` in `context`, keeping the thread's newest `max_per_thread` answers."""
+        entry = [question, _normalize(vector).tobytes(), answer, context]
+        self.state.add(_NAMESPACE, thread_id, f"{context}:{_question_key(question)}", entry, self.max_per_thread)
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop every cached answer for a thread (its resume changed)."""
+        self.state.delete(_NAMESPACE, thread_id)
+
+
+_settings = get_settings()
+
+answer_cache = SemanticAnswerCache(
+    shared_state,
+    threshold=_settings.ANSWER_CACHE_THRESHOLD,
+    max_per_thread=_settings.ANSWER_CACHE_MAX_PER_THREAD,
+)
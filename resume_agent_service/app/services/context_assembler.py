@@ -0,0 +1,171 @@
+"""
+Token-budgeted assembly of retrieved resume chunks into tool output.
+
+Top-k results often repeat or continue each other (oversized entries and
+threads ingested with the old character splitter overlap by 150
+characters), and whatever the tool returns is stored in the checkpoint for
+the rest of the thread. The assembler:
+
+- merges chunks that overlap or touch on the same page into one span,
+- keeps the highest-ranked spans that fit the token budget (the last one
+  may be cut at a line or word boundary),
+- emits the kept spans in document order (page, then offset), so the LLM
+  reads the resume top to bottom.
+
+Positions come from the splitter's `start_index` metadata. Chunks without
+it (threads ingested before it was recorded) are merged by matching the
+overlapping text instead.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+# No tokenizer ships with the service; ~4 characters per token is the usual
+# estimate for English text with Gemini/Llama-style tokenizers.
+CHARS_PER_TOKEN = 4
+
+# Shortest overlap accepted when merging chunks by text (no start_index)
+_MIN_TEXT_OVERLAP = 20
+
+# Don't bother including a truncated span shorter than this many tokens
+_MIN_PARTIAL_TOKENS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of `text`."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class _Span:
+    page: int
+    start: Optional[int]  # offset in the page text, if known
+    text: str
+    rank: int  # best retrieval rank among the merged chunks
+    order: int = 0
+    end: Optional[int] = field(default=None)
+
+    def __post_init__(self):
+        if self.start is not None and self.end is None:
+            self.end = self.start + len(self.text)
+
+
+def _merge_by_offset(spans: List[_Span]) -> List[_Span]:
+    spans.sort(key=lambda s: s.start)
+    merged = [spans[0]]
+    for span in spans[1:]:
+        current = merged[-1]
+        if span.start <= current.end:
+            # Overlapping (or contained) chunk: append only the new tail
+            if span.end > current.end:
+                current.text += span.text[current.end - span.start:]
+        elif span.start - current.end <= 2:
+            # Adjacent: the splitter dropped only the separator between them
+            current.text += "\n" + span.text
+        else:
+            merged.append(span)
+            continue
+        current.end = max(current.end, span.end)
+        current.rank = min(current.rank, span.rank)
+    return merged
+
+
+def _text_overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of `left` that is a prefix of `right`."""
+    probe = right[:_MIN_TEXT_OVERLAP]
+    position = left.find(probe)
+    while position != -1:
+        if right.startswith(left[position:]):
+            return len(left) - position
+        position = left.find(probe, position + 1)
+    return 0
+
+
+def _merge_by_text(spans: List[_Span]) -> List[_Span]:
+    # A merged span can bridge two earlier ones, so repeat until nothing changes
+    while True:
+        merged = _merge_by_text_once(spans)
+        if len(merged) == len(spans):
+            return merged
+        spans = merged
+
+
+def _merge_by_text_once(spans: List[_Span]) -> List[_Span]:
+    merged: List[_Span] = []
+    for span in spans:
+        for current in merged:
+            if span.text in current.text:
+                current.rank = min(current.rank, span.rank)
+                break
+            overlap = _text_overlap(current.text, span.text)
+            if overlap >= _MIN_TEXT_OVERLAP:
+                current.text += span.text[overlap:]
+                current.rank = min(current.rank, span.rank)
+                break
+            overlap = _text_overlap(span.text, current.text)
+            if overlap >= _MIN_TEXT_OVERLAP:
+                current.text = span.text + current.text[overlap:]
+                current.rank = min(current.rank, span.rank)
+                current.order = min(current.order, span.order)
+                break
+        else:
+            merged.append(span)
+    return merged
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    cut = text[:max_chars]
+    boundary = cut.rfind("\n")
+    if boundary < max_chars // 2:
+        boundary = cut.rfind(" ")
+    return (cut[:boundary] if boundary > 0 else cut).rstrip() + " ..."
+
+
+def assemble_context(docs: Sequence[Document], max_tokens: int) -> str:
+    """
+    Merge, budget and order retrieved chunks into a single context string.
+
+    Args:
+        docs: Retrieved chunks, most relevant first
+        max_tokens: Token budget for the returned text (0 = unlimited)
+
+    Returns:
+        Deduplicated resume excerpts in document order, separated by blank lines
+    """
+    by_page = {}
+    for rank, doc in enumerate(docs):
+        page = doc.metadata.get("page", 0)
+        start = doc.metadata.get("start_index")
+        span = _Span(page=page if isinstance(page, int) else 0,
+                     start=start if isinstance(start, int) and start >= 0 else None,
+                     text=doc.page_content, rank=rank, order=rank)
+        by_page.setdefault(span.page, []).append(span)
+
+    spans: List[_Span] = []
+    for page_spans in by_page.values():
+        positioned = [s for s in page_spans if s.start is not None]
+        unpositioned = [s for s in page_spans if s.start is None]
+        if positioned:
+            spans.extend(_merge_by_offset(positioned))
+        if unpositioned:
+            spans.extend(_merge_by_text(unpositioned))
+
+    # Spend the budget on the most relevant spans first
+    selected: List[_Span] = []
+    remaining = max_tokens if max_tokens > 0 else math.inf
+    for span in sorted(spans, key=lambda s: s.rank):
+        tokens = estimate_tokens(span.text)
+        if tokens <= remaining:
+            selected.append(span)
+            remaining -= tokens
+        elif remaining >= _MIN_PARTIAL_TOKENS:
+            span.text = _truncate(span.text, int(remaining) * CHARS_PER_TOKEN - 4)
+            selected.append(span)
+            remaining = 0
+        if remaining <= 0:
+            break
+
+    selected.sort(key=lambda s: (s.page, s.start if s.start is not None else math.inf, s.order))
+    return "\n\n".join(span.text.strip() for span in selected)
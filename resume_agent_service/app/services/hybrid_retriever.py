@@ -0,0 +1,133 @@
+"""
+Hybrid lexical + vector retrieval over one thread's resume chunks.
+
+Each query is first ranked by the thread's BM25 index (microseconds, no
+model call). A router then decides whether that ranking is decisive:
+
+- lexical: short keyword queries ("AWS", "Kubernetes experience") whose
+  top hit contains every query term with a strong BM25 score are answered
+  from the index alone, so no query embedding and no vector search.
+- hybrid: otherwise the query is embedded (through the query-embedding
+  LRU) and the vector and BM25 rankings are merged with reciprocal rank
+  fusion, so paraphrased questions still find semantically close chunks.
+
+Route decisions are exported as resume_agent_retrieval_routes_total.
+"""
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from app.core.config import get_settings
+from app.core.metrics import MONGO_LATENCY, RETRIEVAL_ROUTES, STAGE_LATENCY
+from app.services.lexical_index import BM25Index, tokenize
+
+settings = get_settings()
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int, rrf_k: int = 60) -> List[Document]:
+    """
+    Merge ranked document lists with reciprocal rank fusion.
+
+    Documents are identified by their text, since the same chunk comes back
+    from both the BM25 index and the vector store as separate objects.
+
+    Args:
+        rankings: Ranked lists, best first
+        k: Number of documents to return
+        rrf_k: Fusion constant; larger values flatten the rank weighting
+
+    Returns:
+        Top `k` documents by summed 1 / (rrf_k + rank)
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            scores[doc.page_content] = scores.get(doc.page_content, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(doc.page_content, doc)
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    return [documents[text] for text in ordered[:k]]
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever that routes between the BM25 index and fused hybrid search.
+
+    Attributes:
+        thread_id: Thread whose chunks are searched (vector pre-filter)
+        vector_store: Vector search over the chunk store (MongoDBAtlasVectorSearch or SQLite)
+        embed_query: Cached query embedding function
+        lexical: BM25 index for the thread, or None for vector-only search
+        latency: Histogram vector searches are timed with (the chunk store's)
+        k: Number of chunks returned
+    """
+    thread_id: str
+    vector_store: Any
+    embed_query: Callable[[str], List[float]]
+    lexical: Optional[BM25Index] = None
+    latency: Any = MONGO_LATENCY
+    k: int = settings.RETRIEVAL_K
+    rrf_k: int = settings.RRF_K
+    route_max_terms: int = settings.LEXICAL_ROUTE_MAX_TERMS
+    route_min_score: float = settings.LEXICAL_ROUTE_MIN_SCORE
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _lexical_documents(self, hits) -> List[Document]:
+        return [
+            Document(page_content=self.lexical.texts[position], metadata=dict(self.lexical.metadatas[position]))
+            for position, _, _ in hits
+        ]
+
+    def _is_decisive(self, query: str, hits) -> bool:
+        if not hits:
+            return False
+        _, score, coverage = hits[0]
+        terms = len(set(tokenize(query)))
+        return terms <= self.route_max_terms and coverage == 1.0 and score >= self.route_min_score
+
+    def _vector_search(self, query: str, k: int, section: Optional[str] = None) -> List[Document]:
+        vector = self.embed_query(query)
+        pre_filter: Dict[str, Any] = {"thread_id": {"$eq": self.thread_id}}
+        if section:
+            pre_filter["sections"] = {"$eq": section}
+        with self.latency.time(collection="vectorstore", operation="vector_search"):
+            return self.vector_store.similarity_search_by_vector(vector, k=k, pre_filter=pre_filter)
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        return self.search(query)
+
+    def search(self, query: str, section: Optional[str] = None) -> List[Document]:
+        """
+        Retrieve the thread's most relevant chunks.
+
+        Args:
+            query: Free-text query
+            section: Optional resume section ("experience", "skills", ...) to
+                restrict the search to. Ignored when no chunk is tagged with
+                it (e.g. threads ingested before chunks carried sections).
+
+        Returns:
+            Up to `k` chunks, most relevant first
+        """
+        if self.lexical is None or not len(self.lexical):
+            RETRIEVAL_ROUTES.inc(route="vector")
+            docs = self._vector_search(query, self.k, section) if section else []
+            return docs or self._vector_search(query, self.k)
+
+        allowed = self.lexical.positions_in_section(section) if section else None
+        if not allowed:
+            allowed, section = None, None
+
+        # Over-fetch both rankings so fusion can promote chunks ranked lower by one side
+        fetch_k = self.k * 2
+        with STAGE_LATENCY.time(stage="lexical_search"):
+            hits = self.lexical.search(query, fetch_k, allowed)
+        if self._is_decisive(query, hits):
+            RETRIEVAL_ROUTES.inc(route="lexical")
+            return self._lexical_documents(hits[:self.k])
+
+        RETRIEVAL_ROUTES.inc(route="hybrid")
+        vector_docs = self._vector_search(query, fetch_k, section)
+        return reciprocal_rank_fusion([self._lexical_documents(hits), vector_docs], self.k, self.rrf_k)
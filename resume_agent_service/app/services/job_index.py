@@ -0,0 +1,296 @@
+"""
+Local job-posting corpus with an IVF (inverted file) vector index.
+
+Postings are imported from JSONL, one object per line with at least
+`title` and `description` (`id`, `company`, `location`, `url` are kept
+when present). Each posting is embedded with the resume model, and the
+normalized vectors are clustered with k-means into `lists` cells. On disk
+(JOB_INDEX_PATH) the vectors are stored sorted by cell, so each cell is
+one contiguous block of `vectors.npy`:
+
+    meta.json       dimension, count, cell offsets, build info
+    centroids.npy   lists x dimension
+    vectors.npy     count x dimension, float32, memory-mapped on load
+    postings.jsonl  posting metadata in vector order
+
+A search scores the query against the centroids, then only the rows of
+the JOB_INDEX_NPROBE closest cells, read straight from the memory map.
+Large corpora stay on disk, and most of the index is never touched.
+Recall against an exact search is reported by `python -m
+benchmarks.job_index`.
+
+Build or replace the index (workers pick it up on their next search):
+    python -m app.services.job_index postings.jsonl [--lists 256]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.metrics import STAGE_LATENCY
+from app.services.resume_service import embed_documents
+
+logger = logging.getLogger("resume_agent.job_index")
+
+settings = get_settings()
+
+_FILES = ("centroids.npy", "vectors.npy", "postings.jsonl", "meta.json")
+_DESCRIPTION_CHARS = 1000   # of each description embedded (MiniLM reads ~256 tokens anyway)
+_SNIPPET_CHARS = 300        # of each description kept for tool output
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def posting_text(posting: Dict[str, Any]) -> str:
+    """The text embedded for a posting."""
+    head = " - ".join(filter(None, (posting.get("title"), posting.get("company"), posting.get("location"))))
+    return f"{head}\n{(posting.get('description') or '')[:_DESCRIPTION_CHARS]}"
+
+
+def read_postings(path: str) -> Iterator[Dict[str, Any]]:
+    """Postings from a JSONL file, skipping blank lines and lines without a title."""
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            posting = json.loads(line)
+            if not posting.get("title"):
+                logger.warning(f"{path}:{number}: posting without a title skipped")
+                continue
+            posting.setdefault("id", str(number))
+            yield posting
+
+
+def kmeans(vectors: np.ndarray, lists: int, iterations: int = 10, sample: int = 256, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means centroids of normalized vectors.
+
+    Args:
+        vectors: Normalized row vectors
+        lists: Number of centroids
+        iterations: Lloyd iterations
+        sample: Training rows per centroid (a random sample of at most lists * sample rows)
+        seed: Random seed
+
+    Returns:
+        lists x dimension normalized centroids
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > lists * sample:
+        vectors = vectors[rng.choice(len(vectors), lists * sample, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = (vectors @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = np.bincount(assignment, minlength=lists) == 0
+        # Empty cells restart from random points
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+@dataclass
+class JobMatch:
+    """A posting returned by a search, with its cosine similarity."""
+
+    score: float
+    posting: Dict[str, Any]
+
+
+class JobIndex:
+    """
+    IVF index over posting embeddings (see module docstring for the layout).
+
+    Attributes:
+        centroids: lists x dimension cell centroids
+        vectors: count x dimension normalized vectors, sorted by cell (memory-mapped)
+        offsets: Cell boundaries in `vectors` (lists + 1)
+        postings: Posting metadata in vector order
+    """
+
+    def __init__(self, centroids: np.ndarray, vectors: np.ndarray, offsets: np.ndarray, postings: List[Dict[str, Any]]):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.offsets = offsets
+        self.postings = postings
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    @classmethod
+    def build(cls, postings: List[Dict[str, Any]], vectors: np.ndarray, lists: Optional[int] = None) -> "JobIndex":
+        """
+        Cluster posting vectors into cells.
+
+        Args:
+            postings: Posting metadata, one per row of `vectors`
+            vectors: Posting embeddings
+            lists: Cells (default about sqrt(count))
+        """
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        lists = max(1, min(lists or int(np.sqrt(len(vectors))), len(vectors)))
+        centroids = kmeans(vectors, lists)
+        assignment = (vectors @ centroids.T).argmax(axis=1)
+        order = np.argsort(assignment, kind="stable")
+        offsets = np.zeros(lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=lists), out=offsets[1:])
+        return cls(centroids, vectors[order], offsets, [postings[i] for i in order])
+
+    def save(self, path: str) -> None:
+        """Write the index to `path`; meta.json is replaced last, so readers never see a partial index."""
+        os.makedirs(path, exist_ok=True)
+        meta = {
+            "dimension": int(self.vectors.shape[1]),
+            "count": len(self.postings),
+            "offsets": self.offsets.tolist(),
+            "built_at": time.time(),
+        }
+        with open(os.path.join(path, "centroids.npy.tmp"), "wb") as f:
+            np.save(f, self.centroids)
+        with open(os.path.join(path, "vectors.npy.tmp"), "wb") as f:
+            np.save(f, np.ascontiguousarray(self.vectors))
+        with open(os.path.join(path, "postings.jsonl.tmp"), "w", encoding="utf-8") as f:
+            for posting in self.postings:
+                f.write(json.dumps(posting, ensure_ascii=False) + "\n")
+        with open(os.path.join(path, "meta.json.tmp"), "w") as f:
+            json.dump(meta, f)
+        for name in _FILES:
+            os.replace(os.path.join(path, f"{name}.tmp"), os.path.join(path, name))
+
+    @classmethod
+    def load(cls, path: str) -> "JobIndex":
+        """Open an index written by `save`, memory-mapping its vectors."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "postings.jsonl"), encoding="utf-8") as f:
+            postings = [json.loads(line) for line in f]
+        vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        if len(postings) != meta["count"] or len(vectors) != meta["count"]:
+            raise ValueError(f"Job index at {path} is inconsistent; rebuild it")
+        return cls(
+            np.load(os.path.join(path, "centroids.npy")),
+            vectors,
+            np.asarray(meta["offsets"], dtype=np.int64),
+            postings,
+        )
+
+    def search(self, query: np.ndarray, k: int = 5, nprobe: Optional[int] = None) -> List[JobMatch]:
+        """
+        Approximate top-k postings by cosine similarity.
+
+        Args:
+            query: Query embedding
+            k: Postings returned
+            nprobe: Cells scanned (default JOB_INDEX_NPROBE; all cells = exact search)
+
+        Returns:
+            Best matches first
+        """
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        nprobe = min(nprobe or settings.JOB_INDEX_NPROBE, len(self.centroids))
+        cells = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in cells])
+        if not len(rows):
+            return []
+        # Each cell is contiguous, so this reads nprobe blocks of the memory map
+        scores = np.concatenate([np.asarray(self.vectors[self.offsets[c]:self.offsets[c + 1]]) @ query for c in cells])
+        top = np.argsort(-scores)[:k] if len(scores) <= k else np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [JobMatch(round(float(scores[i]), 4), self.postings[rows[i]]) for i in top]
+
+
+def build_index(path: str, out: str, lists: Optional[int] = None, batch_size: int = 256) -> JobIndex:
+    """
+    Import a JSONL posting file and write its index.
+
+    Args:
+        path: JSONL postings
+        out: Index directory
+        lists: Cells (default about sqrt(count))
+        batch_size: Postings embedded per batch
+
+    Returns:
+        The new index
+    """
+    start = time.monotonic()
+    postings, texts = [], []
+    for posting in read_postings(path):
+        texts.append(posting_text(posting))
+        postings.append({**posting, "description": (posting.get("description") or "")[:_SNIPPET_CHARS]})
+    if not postings:
+        raise ValueError(f"No postings in {path}")
+    vectors = []
+    for i in range(0, len(texts), batch_size):
+        vectors.extend(embed_documents(texts[i:i + batch_size]))
+    index = JobIndex.build(postings, np.asarray(vectors, dtype=np.float32), lists)
+    index.save(out)
+    logger.info(f"Indexed {len(index)} postings in {len(index.centroids)} cells in {time.monotonic() - start:.1f}s")
+    return index
+
+
+_index: Optional[JobIndex] = None
+_index_version: Optional[float] = None
+
+
+def get_job_index() -> Optional[JobIndex]:
+    """
+    The index at JOB_INDEX_PATH, reloaded when it is rebuilt; None if there is none.
+    """
+    global _index, _index_version
+    try:
+        version = os.stat(os.path.join(settings.JOB_INDEX_PATH, "meta.json")).st_mtime
+    except OSError:
+        _index = _index_version = None
+        return None
+    if version != _index_version:
+        try:
+            _index = JobIndex.load(settings.JOB_INDEX_PATH)
+            logger.info(f"Loaded job index with {len(_index)} postings from {settings.JOB_INDEX_PATH}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load job index: {str(e)}")
+            _index = None
+        _index_version = version
+    return _index
+
+
+def recommend_jobs(resume_vectors: np.ndarray, query_vector: Optional[List[float]] = None, k: Optional[int] = None) -> List[JobMatch]:
+    """
+    Postings closest to a resume, optionally steered by a query.
+
+    Args:
+        resume_vectors: The resume's chunk embeddings (averaged into one profile vector)
+        query_vector: Embedded user request ("remote backend roles"), weighted equally with the resume
+        k: Postings returned (default JOB_RECOMMENDATIONS_K)
+
+    Returns:
+        Best matches first, or [] without an index
+    """
+    index = get_job_index()
+    if index is None or not len(resume_vectors):
+        return []
+    query = _normalize(_normalize(np.asarray(resume_vectors, dtype=np.float32)).mean(axis=0))
+    if query_vector is not None:
+        query = query + _normalize(np.asarray(query_vector, dtype=np.float32))
+    with STAGE_LATENCY.time(stage="job_index_search"):
+        return index.search(query, k or settings.JOB_RECOMMENDATIONS_K)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import job postings (JSONL) into the local job index.")
+    parser.add_argument("postings", help="JSONL file, one posting per line (title, description, ...)")
+    parser.add_argument("--out", default=settings.JOB_INDEX_PATH, help="index directory")
+    parser.add_argument("--lists", type=int, default=None, help="IVF cells (default about sqrt(count))")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    index = build_index(args.postings, args.out, args.lists)
+    print(json.dumps({"postings": len(index), "lists": len(index.centroids), "path": args.out}))
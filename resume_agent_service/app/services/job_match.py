@@ -0,0 +1,174 @@
+"""
+Resume-to-job-description match scoring.
+
+Each job description is split into requirement lines (bullets, or the
+sentences of long paragraphs). The requirements of every JD in a request
+are embedded in one batch and compared with the thread's stored chunk
+embeddings in a single matrix product, requirements x chunks, so a request
+with hundreds of JDs costs one embedding batch and one GEMM. A requirement
+is matched when its most similar chunk reaches MATCH_THRESHOLD (cosine);
+that chunk is returned as the evidence.
+
+A JD's score blends requirement coverage with its overlap on the ATS
+keyword taxonomy (MATCH_KEYWORD_WEIGHT), the same keyword lists
+`calculate_ats_score` uses.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.metrics import STAGE_LATENCY
+from app.memory.thread_store import get_thread_analysis
+from app.services.resume_service import embed_documents
+from app.storage import chunk_store
+from app.tools.ats_scorer import find_ats_keywords
+
+settings = get_settings()
+
+# Categories a JD can require; action verbs describe the resume, not the job
+_KEYWORD_CATEGORIES = ("technical_skills", "soft_skills")
+_BULLET = re.compile(r"^\s*(?:[-*•▪●>]+|\(?\d{1,2}[.)])\s*")
+_SENTENCE_END = re.compile(r"(?<=[.;!?])\s+")
+# Lowercase words a title-cased heading may contain ("Senior Engineer at Hooli")
+_HEADING_CONNECTORS = {"a", "an", "and", "at", "for", "in", "of", "on", "or", "the", "to", "with", "&", "-", "|"}
+_HEADING_MAX_WORDS = 8
+_EVIDENCE_CHARS = 200
+
+
+def _is_heading(line: str) -> bool:
+    """A short unbulleted line ending in a colon or title-cased throughout, e.g. the job title."""
+    words = line.split()
+    if len(words) > _HEADING_MAX_WORDS or line.endswith((".", ";", "!", "?")):
+        return False
+    if line.endswith(":"):
+        return True
+    return all(word[0].isupper() or word[0].isdigit() or word in _HEADING_CONNECTORS for word in words)
+
+
+def extract_requirements(text: str, limit: Optional[int] = None) -> List[str]:
+    """
+    Split a job description into requirement lines.
+
+    Bullet markers are stripped, long paragraphs are split into sentences,
+    and headings (the job title, "Requirements:"), which are short
+    unbulleted lines ending in a colon or title-cased throughout, are
+    dropped together with fragments under three words.
+
+    Args:
+        text: Job description text
+        limit: Most requirements kept (default MATCH_MAX_REQUIREMENTS)
+
+    Returns:
+        Distinct requirements in document order
+    """
+    limit = limit or settings.MATCH_MAX_REQUIREMENTS
+    requirements: Dict[str, str] = {}
+    for raw in text.splitlines():
+        line = _BULLET.sub("", raw).strip()
+        if not line or (line == raw.strip() and _is_heading(line)):
+            continue
+        for sentence in _SENTENCE_END.split(line) if len(line) > 200 else [line]:
+            sentence = sentence.strip(" .;:")
+            if len(sentence.split()) >= 3:
+                requirements.setdefault(sentence.lower(), sentence)
+        if len(requirements) >= limit:
+            break
+    return list(requirements.values())[:limit]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+@lru_cache(maxsize=1024)
+def _keyword_pattern(keyword: str) -> re.Pattern:
+    return re.compile(rf"(?<!\w){re.escape(keyword)}(?!\w)")
+
+
+def _keywords(text: str) -> List[str]:
+    """ATS keywords in `text` as whole words ("java" doesn't match "javascript", nor "git" "github")."""
+    text = text.lower()
+    found = find_ats_keywords(text)
+    return [
+        kw for category in _KEYWORD_CATEGORIES for kw in found[category]
+        if _keyword_pattern(kw).search(text)
+    ]
+
+
+def score_job_descriptions(
+    thread_id: str,
+    job_descriptions: List[Dict[str, Any]],
+    threshold: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score a thread's resume against job descriptions.
+
+    Args:
+        thread_id: Thread whose stored chunks are matched
+        job_descriptions: Dicts with `text` and an optional `id`
+        threshold: Cosine similarity a requirement needs (default MATCH_THRESHOLD)
+
+    Returns:
+        One result per JD, in input order: `score` (0-100), requirement
+        `coverage`, `keyword_overlap`, matched requirements with their
+        evidence chunk, missing requirements, and matched/missing keywords
+
+    Raises:
+        ValueError: If the thread has no stored chunks
+    """
+    threshold = settings.MATCH_THRESHOLD if threshold is None else threshold
+    texts, chunk_vectors = chunk_store().vectors(str(thread_id))
+    if not texts:
+        raise ValueError(f"No resume chunks stored for thread {thread_id}")
+    resume_keywords = set(_keywords((get_thread_analysis(str(thread_id)) or {}).get("full_text") or "\n".join(texts)))
+
+    per_jd = [extract_requirements(jd["text"]) for jd in job_descriptions]
+    distinct = list(dict.fromkeys(req for requirements in per_jd for req in requirements))
+    with STAGE_LATENCY.time(stage="match_embed"):
+        vectors = embed_documents(distinct) if distinct else []
+
+    with STAGE_LATENCY.time(stage="match_score"):
+        if distinct:
+            # requirements x chunks cosine similarities in one product
+            similarities = _normalize(np.asarray(vectors, dtype=np.float32)) @ _normalize(chunk_vectors).T
+            best_chunk = similarities.argmax(axis=1)
+            best = similarities[np.arange(len(distinct)), best_chunk].astype(np.float64).round(3).tolist()
+            best_chunk = best_chunk.tolist()
+        row = {req: i for i, req in enumerate(distinct)}
+
+        results = []
+        for index, (jd, requirements) in enumerate(zip(job_descriptions, per_jd)):
+            matched, missing = [], []
+            for req in requirements:
+                i = row[req]
+                similarity = best[i]
+                if similarity >= threshold:
+                    matched.append({
+                        "requirement": req,
+                        "similarity": similarity,
+                        "evidence": texts[best_chunk[i]][:_EVIDENCE_CHARS],
+                    })
+                else:
+                    missing.append({"requirement": req, "similarity": similarity})
+            jd_keywords = _keywords(jd["text"])
+            matched_keywords = [kw for kw in jd_keywords if kw in resume_keywords]
+            coverage = len(matched) / len(requirements) if requirements else 0.0
+            overlap = len(matched_keywords) / len(jd_keywords) if jd_keywords else None
+            score = coverage if overlap is None else (
+                (1 - settings.MATCH_KEYWORD_WEIGHT) * coverage + settings.MATCH_KEYWORD_WEIGHT * overlap
+            )
+            results.append({
+                "id": jd.get("id") or str(index),
+                "score": round(score * 100, 1),
+                "coverage": round(coverage, 3),
+                "keyword_overlap": None if overlap is None else round(overlap, 3),
+                "matched_requirements": matched,
+                "missing_requirements": missing,
+                "matched_keywords": matched_keywords,
+                "missing_keywords": [kw for kw in jd_keywords if kw not in resume_keywords],
+            })
+    return results
@@ -0,0 +1,126 @@
+"""
+Per-thread BM25 index over resume chunks.
+
+Built once at ingest from the same chunks that are embedded, and stored
+with the thread metadata so a restarted worker reloads it instead of
+re-tokenizing. Exact-term queries ("AWS", "Kubernetes", "C++") are answered
+from this index; `HybridRetriever` fuses it with the vector search for
+everything else.
+"""
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# Keeps tech terms like "c++", "c#", "node.js" and "ci/cd" as single tokens
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*")
+
+# Question filler that carries no lexical signal ("what are my AWS skills?")
+STOPWORDS = frozenset("""
+    a about an and any are as at be been by can did do does for from had has have how i i'm in is it
+    its me mention mentioned my of on or resume say says show tell that the their there this to was
+    what when where which who whom with would you your list describe give
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms of `text` with stopwords removed."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over a small document set.
+
+    Attributes:
+        texts: Document texts, indexed by position
+        metadatas: Metadata for each document (same order as texts)
+    """
+
+    def __init__(
+        self,
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        postings: Dict[str, List[Tuple[int, int]]],
+        lengths: Sequence[int],
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.texts = list(texts)
+        self.metadatas = list(metadatas)
+        self.postings = postings
+        self.lengths = list(lengths)
+        self.k1 = k1
+        self.b = b
+        self._avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        count = len(self.texts)
+        self._idf = {
+            term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in postings.items()
+        }
+
+    @classmethod
+    def build(cls, texts: Sequence[str], metadatas: Sequence[Dict[str, Any]]) -> "BM25Index":
+        """Tokenize `texts` and build the inverted index."""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = []
+        for position, text in enumerate(texts):
+            terms = tokenize(text)
+            lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                postings.setdefault(term, []).append((position, frequency))
+        return cls(texts, metadatas, postings, lengths)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def search(self, query: str, k: int, allowed: Optional[Set[int]] = None) -> List[Tuple[int, float, float]]:
+        """
+        Rank documents against `query`.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of hits
+            allowed: Optional positions to restrict the search to
+
+        Returns:
+            (position, score, coverage) tuples, best first. Coverage is the
+            fraction of the query's terms that occur in the document.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.texts:
+            return []
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for term in terms:
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for position, frequency in self.postings[term]:
+                if allowed is not None and position not in allowed:
+                    continue
+                norm = 1 - self.b + self.b * self.lengths[position] / (self._avg_length or 1.0)
+                scores[position] = scores.get(position, 0.0) + \
+                    idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                matched[position] = matched.get(position, 0) + 1
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(position, score, matched[position] / len(terms)) for position, score in ranked]
+
+    def positions_in_section(self, section: str) -> Set[int]:
+        """Positions of documents whose `sections` metadata includes `section`."""
+        return {i for i, metadata in enumerate(self.metadatas) if section in (metadata.get("sections") or ())}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for MongoDB (postings as pairs: terms may contain '.')."""
+        return {
+            "texts": self.texts,
+            "metadatas": self.metadatas,
+            "postings": [[term, [list(p) for p in docs]] for term, docs in self.postings.items()],
+            "lengths": self.lengths,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BM25Index":
+        """Rebuild an index stored with to_dict()."""
+        postings = {term: [tuple(p) for p in docs] for term, docs in data.get("postings", [])}
+        return cls(data.get("texts", []), data.get("metadatas", []), postings, data.get("lengths", []))
@@ -0,0 +1,281 @@
+"""
+Shared gateway for every LLM call in the service.
+
+`GatewayChatModel` wraps a provider chat model (or a tool-bound one) and is
+itself a chat model, so call sites keep using `.invoke()` and LangGraph's
+`astream_events` still sees each streamed token. Every call:
+
+- waits on the provider's token bucket (requests per minute + burst),
+- holds an LLM admission slot (app.core.concurrency.llm_admission),
+- is bounded by LLM_CALL_TIMEOUT and the request deadline, if one is bound,
+- retries transient errors (429/5xx/timeouts) with full-jitter backoff, but
+  only before the first chunk so clients never see a token twice,
+- optionally hedges: if no chunk arrives within `hedge_after` seconds a
+  second attempt starts and whichever streams first wins.
+
+Attempts run in daemon threads. A losing or timed-out attempt is told to
+stop at its next chunk; its HTTP call cannot be interrupted mid-flight.
+"""
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel, generate_from_stream
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from app.core.concurrency import (
+    DeadlineExceededError,
+    LLMOverloadedError,
+    current_deadline,
+    llm_admission,
+)
+from app.core.config import get_settings
+from app.core.metrics import LLM_HEDGES, LLM_RATE_LIMIT_WAIT, LLM_REJECTIONS, LLM_RETRIES
+
+logger = logging.getLogger("resume_agent.llm_gateway")
+
+settings = get_settings()
+
+# HTTP statuses and exception names (across google-genai, groq, httpx) that are worth retrying
+_TRANSIENT_STATUS = {408, 429, 500, 502, 503, 504}
+_TRANSIENT_NAMES = (
+    "RateLimit", "ResourceExhausted", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "Timeout", "APIConnectionError", "ConnectError", "RemoteProtocolError",
+)
+
+
+class LLMRateLimitedError(LLMOverloadedError):
+    """No provider rate-limit token became available before the deadline."""
+
+
+def _status_of(exc: BaseException) -> Optional[int]:
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    name = type(exc).__name__
+    return _status_of(exc) == 429 or "RateLimit" in name or "ResourceExhausted" in name
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for errors a retry may fix: rate limits, 5xx, timeouts, dropped connections."""
+    if isinstance(exc, (LLMOverloadedError, DeadlineExceededError)):
+        return False
+    if _status_of(exc) in _TRANSIENT_STATUS:
+        return True
+    name = type(exc).__name__
+    return any(marker in name for marker in _TRANSIENT_NAMES)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, deadline: float) -> bool:
+        """
+        Take a token, sleeping for the refill if needed.
+
+        Args:
+            deadline: Absolute time.monotonic() after which to give up
+
+        Returns:
+            False if no token would be available before the deadline
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the provider itself returned 429."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+
+_BUCKETS: Dict[str, TokenBucket] = {
+    "gemini": TokenBucket(settings.GEMINI_RPM / 60.0, settings.GEMINI_BURST),
+    "groq": TokenBucket(settings.GROQ_RPM / 60.0, settings.GROQ_BURST),
+}
+
+
+def get_bucket(provider: str) -> TokenBucket:
+    """Return the shared rate limiter for `provider` (created on first use)."""
+    bucket = _BUCKETS.get(provider)
+    if bucket is None:
+        bucket = _BUCKETS.setdefault(provider, TokenBucket(1.0, 5))
+    return bucket
+
+
+class _Attempt:
+    """One streaming call to the wrapped model, run in a daemon thread."""
+
+    def __init__(self, runnable: Any, messages: List[Any], kwargs: Dict[str, Any], out: "queue.Queue"):
+        self.cancelled = threading.Event()
+        self._runnable = runnable
+        self._messages = messages
+        self._kwargs = kwargs
+        self._out = out
+        # Deliberately not copying contextvars: LangChain keeps the parent run's
+        # callbacks there, and the inner model must not emit its own stream
+        # events (the gateway re-emits the winning attempt's chunks).
+        threading.Thread(target=self._run, daemon=True, name="llm-attempt").start()
+
+    def _run(self) -> None:
+        try:
+            with llm_admission.admit():
+                if self.cancelled.is_set():
+                    return
+                for chunk in self._runnable.stream(self._messages, **self._kwargs):
+                    if self.cancelled.is_set():
+                        return
+                    self._out.put((self, "chunk", chunk))
+            self._out.put((self, "done", None))
+        except BaseException as exc:
+            self._out.put((self, "error", exc))
+
+
+class GatewayChatModel(BaseChatModel):
+    """
+    Chat model wrapper that routes calls through the gateway.
+
+    Attributes:
+        runnable: Provider chat model, or one with tools already bound
+        provider: Rate-limit bucket name ("gemini", "groq")
+        hedge_after: Seconds without a first chunk before hedging (0 = off)
+    """
+    runnable: Any
+    provider: str
+    hedge_after: float = 0.0
+    call_timeout: float = settings.LLM_CALL_TIMEOUT
+    max_retries: int = settings.LLM_MAX_RETRIES
+    retry_base_delay: float = settings.LLM_RETRY_BASE_DELAY
+    retry_max_delay: float = settings.LLM_RETRY_MAX_DELAY
+
+    @property
+    def _llm_type(self) -> str:
+        return f"gateway-{self.provider}"
+
+    def _deadline(self) -> float:
+        deadline = time.monotonic() + self.call_timeout
+        request_deadline = current_deadline()
+        return min(deadline, request_deadline) if request_deadline is not None else deadline
+
+    def _start_attempt(self, messages, kwargs, out: "queue.Queue", deadline: float) -> _Attempt:
+        start = time.monotonic()
+        acquired = get_bucket(self.provider).acquire(deadline)
+        LLM_RATE_LIMIT_WAIT.observe(time.monotonic() - start, provider=self.provider)
+        if not acquired:
+            LLM_REJECTIONS.inc(reason="rate_limited")
+            raise LLMRateLimitedError(f"{self.provider} rate limit: no request slot before the deadline")
+        return _Attempt(self.runnable, messages, kwargs, out)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        if stop is not None:
+            kwargs["stop"] = stop
+        deadline = self._deadline()
+        retries = 0
+        while True:
+            out: "queue.Queue" = queue.Queue()
+            attempts = [self._start_attempt(messages, kwargs, out, deadline)]
+            hedge_at = time.monotonic() + self.hedge_after if self.hedge_after > 0 else None
+            winner: Optional[_Attempt] = None
+            emitted = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    if now >= deadline:
+                        LLM_REJECTIONS.inc(reason="deadline")
+                        raise DeadlineExceededError(f"{self.provider} call exceeded its deadline")
+                    wake = min(deadline, hedge_at) if hedge_at is not None and winner is None else deadline
+                    try:
+                        attempt, kind, payload = out.get(timeout=max(0.0, wake - now))
+                    except queue.Empty:
+                        if hedge_at is not None and winner is None and time.monotonic() >= hedge_at:
+                            hedge_at = None
+                            self._maybe_hedge(attempts, messages, kwargs, out)
+                        continue
+
+                    if winner is None:
+                        live = [a for a in attempts if not a.cancelled.is_set()]
+                        if kind == "error" and len(live) > 1:
+                            # Let the other attempt carry on
+                            attempt.cancelled.set()
+                            continue
+                        winner = attempt
+                        for other in attempts:
+                            if other is not winner:
+                                other.cancelled.set()
+                        if winner is not attempts[0]:
+                            LLM_HEDGES.inc(provider=self.provider, result="won")
+                    if attempt is not winner:
+                        continue
+
+                    if kind == "chunk":
+                        emitted = True
+                        yield ChatGenerationChunk(message=payload)
+                    elif kind == "done":
+                        return
+                    else:
+                        raise payload
+            except Exception as exc:
+                if emitted or retries >= self.max_retries or not is_transient_error(exc):
+                    raise
+                delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** retries))
+                if time.monotonic() + delay >= deadline:
+                    raise
+                if is_rate_limit_error(exc):
+                    get_bucket(self.provider).drain()
+                retries += 1
+                LLM_RETRIES.inc(provider=self.provider)
+                logger.warning(f"{self.provider} call failed ({type(exc).__name__}: {exc}); "
+                               f"retry {retries}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+            finally:
+                for attempt in attempts:
+                    attempt.cancelled.set()
+
+    def _maybe_hedge(self, attempts: List[_Attempt], messages, kwargs, out: "queue.Queue") -> None:
+        # Hedging doubles load, so only do it with spare rate-limit and admission capacity
+        if llm_admission.waiting or not get_bucket(self.provider).try_acquire():
+            return
+        attempts.append(_Attempt(self.runnable, messages, kwargs, out))
+        LLM_HEDGES.inc(provider=self.provider, result="launched")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return generate_from_stream(self._stream(messages, stop=stop, run_manager=run_manager, **kwargs))
@@ -0,0 +1,198 @@
+"""
+Rule-based extraction of a structured resume profile.
+
+Runs once at ingest (no LLM call) and pulls out the facts users ask about
+most: name, contact details, skills, education and total years of
+experience. The profile is stored with the thread metadata and injected
+into the chat prompt so those questions need no retrieval round-trip.
+"""
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from app.core.state import ResumeProfile
+
+# Canonical section -> headings that introduce it (matched case-insensitively)
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary", "professional summary", "profile", "objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history"),
+    "education": ("education", "academic background", "qualifications"),
+    "skills": ("skills", "technical skills", "core competencies", "key skills", "technologies"),
+    "projects": ("projects", "personal projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "awards", "achievements"),
+}
+
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3,4}[\s.-]?\d{3,4}")
+_LINK = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com)/[\w\-/]+", re.IGNORECASE)
+_DEGREE = re.compile(
+    r"\b(?:B\.?\s?S\.?c?|B\.?\s?A|B\.?\s?Tech|B\.?\s?E|M\.?\s?S\.?c?|M\.?\s?A|M\.?\s?Tech|MBA|Ph\.?\s?D|"
+    r"Bachelor|Master|Doctor|Diploma|Associate)\b",
+)
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+_DATE = r"(?:(?P<{0}m>[A-Za-z]{{3,9}})\.?\s+|(?P<{0}n>\d{{1,2}})/)?(?P<{0}y>(?:19|20)\d{{2}})"
+_RANGE = re.compile(
+    _DATE.format("s") + r"\s*(?:-|–|—|to)\s*(?:" + _DATE.format("e") + r"|(?P<present>present|current|now))",
+    re.IGNORECASE,
+)
+_YEARS_CLAIM = re.compile(r"(\d{1,2}(?:\.\d)?)\+?\s*(?:years|yrs)\b", re.IGNORECASE)
+
+
+def heading_section(line: str) -> Optional[str]:
+    """Return the canonical section a heading line introduces, or None."""
+    cleaned = line.strip().strip(":").strip().lower()
+    if not cleaned or len(cleaned) > 40:
+        return None
+    return _HEADING_LOOKUP.get(cleaned)
+
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """
+    Group resume lines by the section heading they fall under.
+
+    Lines before the first recognized heading go under "header".
+    """
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        section = heading_section(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        if line.strip():
+            sections.setdefault(current, []).append(line.strip())
+    return sections
+
+
+def _extract_name(header: List[str]) -> Optional[str]:
+    for line in header[:5]:
+        if _EMAIL.search(line) or any(ch.isdigit() for ch in line):
+            continue
+        words = line.replace(",", " ").split()
+        if 2 <= len(words) <= 4 and all(w[0].isupper() and w.replace(".", "").replace("-", "").isalpha()
+                                        for w in words):
+            return " ".join(words)
+    return None
+
+
+def _extract_skills(text: str, skill_lines: List[str]) -> List[str]:
+    # Deferred: importing app.tools at module load would cycle through resume_service
+    from app.tools.ats_scorer import ATS_KEYWORDS
+
+    text_lower = text.lower()
+    skills: List[str] = []
+    seen = set()
+    for keyword in ATS_KEYWORDS["technical_skills"] + ATS_KEYWORDS["soft_skills"]:
+        # Whole-word match so "java" isn't found in "javascript" or "git" in "github"
+        # (plain substring check first; the boundary regex only confirms candidates)
+        if keyword not in seen and keyword in text_lower \
+                and re.search(rf"(?<![\w+#]){re.escape(keyword)}(?![\w+#])", text_lower):
+            seen.add(keyword)
+            skills.append(keyword)
+    # Items listed under a Skills heading that the keyword list doesn't know
+    for line in skill_lines:
+        for item in re.split(r"[,|•;·]", line.split(":", 1)[-1]):
+            item = item.strip(" -*\t").strip()
+            if 1 < len(item) <= 40 and item.lower() not in seen:
+                seen.add(item.lower())
+                skills.append(item)
+    return skills
+
+
+def _month_index(match: "re.Match", prefix: str, default_month: int) -> Optional[int]:
+    year = match.group(f"{prefix}y")
+    if not year:
+        return None
+    month = default_month
+    if match.group(f"{prefix}m"):
+        month = _MONTHS.get(match.group(f"{prefix}m")[:3].lower(), default_month)
+    elif match.group(f"{prefix}n"):
+        month = min(max(int(match.group(f"{prefix}n")), 1), 12)
+    return int(year) * 12 + month - 1
+
+
+def _experience_years(experience_lines: List[str], fallback_text: str) -> Optional[float]:
+    """Total years covered by date ranges in the experience section (overlaps merged)."""
+    today = date.today()
+    now = today.year * 12 + today.month - 1
+    intervals = []
+    for match in _RANGE.finditer("\n".join(experience_lines)):
+        start = _month_index(match, "s", 1)
+        end = now if match.group("present") else _month_index(match, "e", 12)
+        if start is not None and end is not None and start <= end <= now + 1:
+            intervals.append((start, end + 1))
+    if intervals:
+        intervals.sort()
+        total, (cur_start, cur_end) = 0, intervals[0]
+        for start, end in intervals[1:]:
+            if start > cur_end:
+                total += cur_end - cur_start
+                cur_start, cur_end = start, end
+            else:
+                cur_end = max(cur_end, end)
+        total += cur_end - cur_start
+        return round(total / 12 * 2) / 2
+
+    # No dated roles: fall back to an explicit "N years of experience" claim
+    claim = _YEARS_CLAIM.search(fallback_text)
+    return float(claim.group(1)) if claim else None
+
+
+def extract_profile(text: str) -> ResumeProfile:
+    """
+    Extract a structured profile from resume text.
+
+    Args:
+        text: Full resume text (pages joined with newlines)
+
+    Returns:
+        ResumeProfile; fields that can't be found are left empty
+    """
+    sections = split_sections(text)
+    header = sections.get("header", [])
+
+    email = _EMAIL.search(text)
+    phone = None
+    for line in header + sections.get("summary", []):
+        match = _PHONE.search(line)
+        if match and sum(ch.isdigit() for ch in match.group()) >= 7:
+            phone = match.group().strip()
+            break
+    links = list(dict.fromkeys(m.group() for m in _LINK.finditer(text)))
+
+    education = sections.get("education") or [line for line in text.splitlines() if _DEGREE.search(line)]
+    experience_lines = sections.get("experience") or [
+        line for name, lines in sections.items() if name != "education" for line in lines
+    ]
+
+    return ResumeProfile(
+        name=_extract_name(header or text.splitlines()),
+        email=email.group() if email else None,
+        phone=phone,
+        links=links,
+        skills=_extract_skills(text, sections.get("skills", [])),
+        education=[line.strip() for line in education[:4]],
+        experience_years=_experience_years(experience_lines, "\n".join(sections.get("summary", []) + header)),
+    )
+
+
+def format_profile(profile: Dict) -> str:
+    """Render a stored profile as compact prompt lines (empty fields omitted)."""
+    lines = []
+    if profile.get("name"):
+        lines.append(f"Name: {profile['name']}")
+    contact = [v for v in (profile.get("email"), profile.get("phone")) if v] + list(profile.get("links") or [])
+    if contact:
+        lines.append(f"Contact: {' | '.join(contact)}")
+    if profile.get("experience_years") is not None:
+        lines.append(f"Total experience: about {profile['experience_years']:g} years")
+    if profile.get("education"):
+        lines.append(f"Education: {'; '.join(profile['education'])}")
+    if profile.get("skills"):
+        lines.append(f"Skills: {', '.join(profile['skills'])}")
+    return "\n".join(lines)
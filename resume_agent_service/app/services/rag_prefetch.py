@@ -0,0 +1,163 @@
+"""
+Speculative resume retrieval, started alongside the first LLM call of a turn.
+
+Resume questions almost always make the model call `resume_rag_tool` with
+a query close to the user's message, so the retrieval would otherwise
+start only after a full LLM round-trip. `chat_node` hands each new user
+message to `rag_prefetcher.start()`, which retrieves for it on a worker
+thread while the LLM is still thinking. When the tool call arrives,
+`take()` returns the prefetched chunks if the tool query is similar
+enough (waiting for the prefetch if it is still running):
+
+- the two share at least RAG_PREFETCH_TERM_OVERLAP of their terms
+  (Jaccard, so a narrower query such as one topic of a two-part message
+  doesn't qualify), or
+- the two embed (cached, MiniLM) to at least RAG_PREFETCH_SIMILARITY cosine.
+
+A prefetch is served at most once; later tool calls in the turn retrieve
+fresh.
+
+Outcomes are counted in resume_agent_rag_prefetch_total{result}: hit,
+miss (tool query too different, or a section was requested) and wasted
+(prefetched but never asked for, e.g. profile questions answered without
+tools).
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.core.config import get_settings
+from app.core.metrics import RAG_PREFETCH
+from app.services.lexical_index import tokenize
+from app.services.resume_service import embed_query, get_retriever
+
+logger = logging.getLogger("resume_agent.rag_prefetch")
+
+settings = get_settings()
+
+
+@dataclass
+class _Prefetch:
+    query: str
+    future: "Future[Optional[List[Document]]]"
+    created: float = field(default_factory=time.monotonic)
+    claimed: bool = False  # a tool call already counted it as a hit or miss
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    denominator = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b)) / denominator if denominator else 0.0
+
+
+class RagPrefetcher:
+    """One speculative retrieval per thread, run on a small worker pool."""
+
+    def __init__(self, max_workers: int, similarity: float, term_overlap: float, ttl_seconds: float):
+        self.similarity = similarity
+        self.term_overlap = term_overlap
+        self.ttl_seconds = ttl_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rag-prefetch")
+        self._entries: Dict[str, _Prefetch] = {}
+        self._lock = threading.Lock()
+
+    def start(self, thread_id: Optional[str], query: str) -> None:
+        """
+        Start retrieving for `query` in the background, replacing the thread's
+        previous prefetch.
+
+        Args:
+            thread_id: Conversation thread (no-op if empty)
+            query: The user's message
+        """
+        if not thread_id or not query.strip():
+            return
+        future = self._pool.submit(self._retrieve, str(thread_id), query)
+        now = time.monotonic()
+        with self._lock:
+            self._discard(self._entries.pop(str(thread_id), None))
+            # Drop entries of threads that went quiet
+            for key in [k for k, e in self._entries.items() if now - e.created > self.ttl_seconds]:
+                self._discard(self._entries.pop(key))
+            self._entries[str(thread_id)] = _Prefetch(query=query, future=future)
+
+    @staticmethod
+    def _discard(entry: Optional[_Prefetch]) -> None:
+        if entry is None or entry.claimed:
+            return
+        # A prefetch for a thread without a resume returns None; that isn't waste
+        if entry.future.done() and (entry.future.exception() or entry.future.result() is None):
+            return
+        RAG_PREFETCH.inc(result="wasted")
+
+    def _retrieve(self, thread_id: str, query: str) -> Optional[List[Document]]:
+        retriever = get_retriever(thread_id)
+        if retriever is None:
+            return None
+        # Embed the message now (usually an LRU hit from the answer-cache lookup)
+        # so take() only has to embed the tool query
+        embed_query(query)
+        return retriever.search(query)
+
+    def take(self, thread_id: Optional[str], query: str, section: Optional[str] = None) -> Optional[List[Document]]:
+        """
+        Return the prefetched chunks if they answer this tool query.
+
+        Args:
+            thread_id: Conversation thread
+            query: Query the model passed to resume_rag_tool
+            section: Section filter requested by the model, if any
+
+        Returns:
+            Prefetched documents, or None if there is no usable prefetch
+            (a prefetch is served to one tool call only)
+        """
+        if not thread_id:
+            return None
+        with self._lock:
+            entry = self._entries.get(str(thread_id))
+        if entry is None or time.monotonic() - entry.created > self.ttl_seconds:
+            return None
+        if section or not self._similar(entry.query, query):
+            entry.claimed = True
+            RAG_PREFETCH.inc(result="miss")
+            return None
+        with self._lock:
+            # Another tool call of the turn may have been served it meanwhile
+            served = self._entries.get(str(thread_id)) is entry
+            if served:
+                del self._entries[str(thread_id)]
+        entry.claimed = True
+        if not served:
+            RAG_PREFETCH.inc(result="miss")
+            return None
+        try:
+            docs = entry.future.result()
+        except Exception as e:
+            logger.warning(f"RAG prefetch failed for thread {thread_id}: {str(e)}")
+            RAG_PREFETCH.inc(result="miss")
+            return None
+        if docs is None:
+            return None
+        RAG_PREFETCH.inc(result="hit")
+        return docs
+
+    def _similar(self, message: str, query: str) -> bool:
+        query_terms, message_terms = set(tokenize(query)), set(tokenize(message))
+        if query_terms and len(query_terms & message_terms) / len(query_terms | message_terms) >= self.term_overlap:
+            return True
+        return _cosine(embed_query(message), embed_query(query)) >= self.similarity
+
+
+rag_prefetcher = RagPrefetcher(
+    max_workers=settings.RAG_PREFETCH_WORKERS,
+    similarity=settings.RAG_PREFETCH_SIMILARITY,
+    term_overlap=settings.RAG_PREFETCH_TERM_OVERLAP,
+    ttl_seconds=settings.RAG_PREFETCH_TTL_SECONDS,
+)
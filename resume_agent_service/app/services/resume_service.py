@@ -1,45 +1,151 @@
 from __future__ import annotations
 import os
 import tempfile
+from functools import partial
 from typing import Any, Dict, Optional, List
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import numpy as np
+
 from langchain_community.document_loaders import PyPDFLoader
-from langchain_mongodb.vectorstores import MongoDBAtlasVectorSearch
 from langchain_huggingface import HuggingFaceEmbeddings
-from pymongo import MongoClient
 
+from app.core.config import get_settings
+from app.core.embedding_pool import PooledEmbeddings
+from app.core.metrics import STAGE_LATENCY, CACHE_REQUESTS
+from app.core.shared_state import shared_state
+from app.services.hybrid_retriever import HybridRetriever
+from app.services.lexical_index import BM25Index
+from app.services.profile_extractor import extract_profile
+from app.services.resume_splitter import ResumeSectionSplitter
+from app.storage import chunk_store
 from app.memory.thread_store import (
     save_thread_metadata,
     get_thread_metadata_from_db,
+    get_lexical_index,
+    update_lexical_index,
+    get_user_threads,
     thread_exists
 )
 
-# In-memory cache for retrievers (reconstructed from DB on cache miss)
+settings = get_settings()
+
+# Per-process cache of built retrievers (they hold Mongo handles, so they can't
+# be shared). Their BM25 indexes, the structured profiles and query embeddings
+# are cached in the shared state tier; see app/core/shared_state.py.
 _THREAD_RETRIEVERS: Dict[str, Any] = {}
 
+
+def _forget_thread(thread_id: str) -> None:
+    """Drop this worker's retriever for a thread re-ingested by any worker."""
+    _THREAD_RETRIEVERS.pop(str(thread_id), None)
+
+
+shared_state.on_invalidate(_forget_thread)
+
 # Embeddings model (loaded once)
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 _embeddings = None
 
 
 def _get_embeddings():
-    """Get or initialize the embeddings model."""
+    """Get or initialize the embeddings model (in worker processes if EMBEDDING_WORKERS > 0)."""
     global _embeddings
     if _embeddings is None:
-        _embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+        if settings.EMBEDDING_WORKERS > 0:
+            _embeddings = PooledEmbeddings(
+                partial(HuggingFaceEmbeddings, model_name=EMBEDDING_MODEL),
+                workers=settings.EMBEDDING_WORKERS,
+                batch_size=settings.EMBEDDING_WORKER_BATCH,
+            )
+        else:
+            _embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
     return _embeddings
 
 
-def _get_mongo_collection():
-    """Get the MongoDB collection for vector storage."""
-    client = MongoClient(os.getenv("MONGODB_URI"))
-    db = client[os.getenv("DB_NAME", "test")]
-    return db[os.getenv("COLLECTION_NAME", "vectorstore")]
+def embed_query(text: str) -> List[float]:
+    """
+    Embed a user question with the same model as the resume chunks.
+    
+    Results are cached in the shared state tier (LRU of
+    QUERY_EMBEDDING_CACHE_SIZE, keyed by normalized text since MiniLM is
+    uncased), so the answer-cache lookup and the retriever embed the same
+    question only once, and repeated tool queries skip the model entirely,
+    on every worker.
+    
+    Args:
+        text: Question text
+        
+    Returns:
+        Embedding vector (float32 precision, cached or not)
+    """
+    key = " ".join(text.lower().split())
+    cached = shared_state.get("query_embedding", key)
+    if cached is not None:
+        CACHE_REQUESTS.inc(cache="query_embedding", result="hit")
+        return np.frombuffer(cached, dtype=np.float32).tolist()
+    CACHE_REQUESTS.inc(cache="query_embedding", result="miss")
+    
+    vector = np.asarray(_get_embeddings().embed_query(text), dtype=np.float32)
+    shared_state.set("query_embedding", key, vector.tobytes())
+    return vector.tolist()
+
+
+def embed_documents(texts: List[str]) -> List[List[float]]:
+    """
+    Embed a batch of texts with the resume chunks' model, uncached.
+    
+    Args:
+        texts: Texts to embed
+        
+    Returns:
+        One embedding vector per text
+    """
+    return _get_embeddings().embed_documents(texts)
+
+
+def get_vector_collection():
+    """The MongoDB collection holding every thread's chunks (mongo backend only)."""
+    return chunk_store().collection
+
+
+def _build_retriever(thread_id: str, lexical: Optional[BM25Index]) -> HybridRetriever:
+    """Create the thread's retriever over the chunk store and its BM25 index."""
+    store = chunk_store()
+    # Vector searches are pre-filtered by thread_id so only this thread's chunks match
+    return HybridRetriever(
+        thread_id=str(thread_id),
+        vector_store=store.vector_search(_get_embeddings()),
+        embed_query=embed_query,
+        lexical=lexical,
+        latency=store.latency,
+    )
+
+
+def _backfill_lexical_index(thread_id: str) -> BM25Index:
+    """Build and store a BM25 index for a thread ingested before indexes existed."""
+    docs = chunk_store().chunks(thread_id)
+    texts = [doc.pop("text", "") for doc in docs]
+    lexical = BM25Index.build(texts, docs)
+    update_lexical_index(thread_id, lexical.to_dict())
+    return lexical
+
+
+def _load_lexical_index(thread_id: str) -> BM25Index:
+    """The thread's BM25 index from the shared tier, else storage (building it if missing)."""
+    stored = shared_state.get("lexical_index", thread_id)
+    if stored is not None:
+        CACHE_REQUESTS.inc(cache="lexical_index", result="hit")
+        return BM25Index.from_dict(stored)
+    CACHE_REQUESTS.inc(cache="lexical_index", result="miss")
+    stored = get_lexical_index(thread_id)
+    lexical = BM25Index.from_dict(stored) if stored else _backfill_lexical_index(thread_id)
+    shared_state.set("lexical_index", thread_id, lexical.to_dict())
+    return lexical
 
 
 def _reconstruct_retriever(thread_id: str) -> Optional[Any]:
     """
-    Reconstruct a retriever from MongoDB vector store.
+    Reconstruct a retriever from the stored chunks.
     Called when retriever not in cache but thread exists in DB.
     
     Args:
@@ -51,27 +157,11 @@ def _reconstruct_retriever(thread_id: str) -> Optional[Any]:
     if not thread_exists(thread_id):
         return None
     
-    collection = _get_mongo_collection()
-    embeddings = _get_embeddings()
+    lexical = None
+    if settings.HYBRID_RETRIEVAL_ENABLED:
+        lexical = _load_lexical_index(str(thread_id))
     
-    # Create vector store from existing collection
-    # Note: embedding_key must match your Atlas Search index path ("embedding")
-    vector_store = MongoDBAtlasVectorSearch(
-        collection=collection,
-        embedding=embeddings,
-        index_name="vector_index",
-        embedding_key="embedding",  # Match your Atlas index field name
-    )
-    
-    # Create retriever with thread_id pre-filter
-    # This ensures we only search documents belonging to this thread
-    retriever = vector_store.as_retriever(
-        search_type="similarity",
-        search_kwargs={
-            "k": 5,
-            "pre_filter": {"thread_id": {"$eq": thread_id}}
-        }
-    )
+    retriever = _build_retriever(thread_id, lexical)
     
     # Cache it for future use
     _THREAD_RETRIEVERS[str(thread_id)] = retriever
@@ -81,7 +171,7 @@ def _reconstruct_retriever(thread_id: str) -> Optional[Any]:
 def get_retriever(thread_id: Optional[str]) -> Optional[Any]:
     """
     Fetch the retriever for a specific thread.
-    Checks cache first, then attempts to reconstruct from MongoDB.
+    Checks cache first, then attempts to reconstruct from storage.
     
     Args:
         thread_id: The thread ID to get retriever for
@@ -94,15 +184,17 @@ def get_retriever(thread_id: Optional[str]) -> Optional[Any]:
     
     # Check cache first
     if thread_id in _THREAD_RETRIEVERS:
+        CACHE_REQUESTS.inc(cache="retriever", result="hit")
         return _THREAD_RETRIEVERS[thread_id]
+    CACHE_REQUESTS.inc(cache="retriever", result="miss")
     
-    # Try to reconstruct from MongoDB
+    # Try to reconstruct from storage
     return _reconstruct_retriever(thread_id)
 
 
 def get_thread_metadata(thread_id: str) -> dict:
     """
-    Get metadata for a thread's resume from MongoDB.
+    Get metadata for a thread's resume from storage.
     
     Args:
         thread_id: The thread ID to get metadata for
@@ -113,6 +205,31 @@ def get_thread_metadata(thread_id: str) -> dict:
     return get_thread_metadata_from_db(str(thread_id)) or {}
 
 
+def get_resume_profile(thread_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Get the structured profile extracted from a thread's resume at ingest.
+    
+    Args:
+        thread_id: The thread ID to get the profile for
+        
+    Returns:
+        Profile dict (see ResumeProfile) or empty dict if none was stored
+    """
+    if not thread_id:
+        return {}
+    thread_id = str(thread_id)
+    profile = shared_state.get("profile", thread_id)
+    if profile is not None:
+        CACHE_REQUESTS.inc(cache="profile", result="hit")
+        return profile
+    CACHE_REQUESTS.inc(cache="profile", result="miss")
+    
+    profile = get_thread_metadata(thread_id).get("profile") or {}
+    if profile:
+        shared_state.set("profile", thread_id, profile)
+    return profile
+
+
 def ingest_resume_pdf(
     file_bytes: bytes, 
     thread_id: str, 
@@ -120,7 +237,7 @@ def ingest_resume_pdf(
     filename: Optional[str] = None
 ) -> dict:
     """
-    Parse a PDF resume, build a MongoDB vector store, and store metadata.
+    Parse a PDF resume, store its embedded chunks, and store metadata.
     
     Args:
         file_bytes: Raw PDF file bytes
@@ -140,62 +257,73 @@ def ingest_resume_pdf(
     
     try:
         # Load and parse PDF
-        loader = PyPDFLoader(temp_path)
-        docs = loader.load()
-        
-        # Split into chunks
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=800,
-            chunk_overlap=150,
-            separators=["\n\n", "\n", " ", ""]
-        )
-        chunks = splitter.split_documents(docs)
+        with STAGE_LATENCY.time(stage="pdf_parse"):
+            loader = PyPDFLoader(temp_path)
+            docs = loader.load()
+        
+        # Split into chunks along section and entry boundaries
+        with STAGE_LATENCY.time(stage="split"):
+            splitter = ResumeSectionSplitter(chunk_size=1000)
+            chunks = splitter.split_documents(docs)
+        
+        # Full text straight from the pages (not rejoined from chunks), used for ATS scoring
+        # and stored with the thread so it never has to be rebuilt from the vector store
+        full_text = "\n".join(doc.page_content for doc in docs)
+        
+        # Extract the structured profile once so chat can answer simple facts tool-free
+        with STAGE_LATENCY.time(stage="profile_extract"):
+            profile = extract_profile(full_text).model_dump()
         
         # Add thread_id and user_id to each chunk's metadata for filtering
         for chunk in chunks:
             chunk.metadata["thread_id"] = thread_id
             chunk.metadata["user_id"] = user_id
         
-        # Create vector store in MongoDB
-        collection = _get_mongo_collection()
+        # Embed and insert separately so each stage is measured on its own
         embeddings = _get_embeddings()
-        vector_store = MongoDBAtlasVectorSearch.from_documents(
-            documents=chunks,
-            embedding=embeddings,
-            collection=collection,
-            index_name="vector_index",
-            embedding_key="embedding",  # Match your Atlas index field name
-        )
+        texts = [chunk.page_content for chunk in chunks]
+        with STAGE_LATENCY.time(stage="embed"):
+            vectors = embeddings.embed_documents(texts)
         
-        # Create and cache retriever with thread_id pre-filter
-        retriever = vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={
-                "k": 5,
-                "pre_filter": {"thread_id": {"$eq": thread_id}}
-            }
-        )
-        _THREAD_RETRIEVERS[str(thread_id)] = retriever
+        if chunks:
+            with STAGE_LATENCY.time(stage="vector_insert"):
+                chunk_store().add(texts, vectors, [chunk.metadata for chunk in chunks])
+        
+        # BM25 index over the same chunks, so keyword queries can skip embedding
+        lexical = None
+        if settings.HYBRID_RETRIEVAL_ENABLED:
+            with STAGE_LATENCY.time(stage="lexical_index"):
+                lexical = BM25Index.build(texts, [chunk.metadata for chunk in chunks])
         
-        # Save metadata to MongoDB (persistent storage)
+        # Save metadata (persistent storage)
         final_filename = filename or os.path.basename(temp_path)
         save_thread_metadata(
             thread_id=thread_id,
             user_id=user_id,
             filename=final_filename,
             pages=len(docs),
-            chunks=len(chunks)
+            chunks=len(chunks),
+            profile=profile,
+            full_text=full_text,
+            lexical_index=lexical.to_dict() if lexical else None
         )
         
-        # Return full text along with metadata for immediate ATS scoring
-        # (MongoDB Atlas Vector Search is eventually consistent, so retriever may not work immediately)
-        full_text = "\n".join([chunk.page_content for chunk in chunks])
+        # Everything cached for a previous upload on this thread (answers, profile,
+        # BM25 index, other workers' retrievers) is now stale
+        shared_state.invalidate_thread(str(thread_id))
+        
+        # Create and cache the thread's retriever, and share what other workers can reuse
+        _THREAD_RETRIEVERS[str(thread_id)] = _build_retriever(thread_id, lexical)
+        shared_state.set("profile", str(thread_id), profile)
+        if lexical is not None:
+            shared_state.set("lexical_index", str(thread_id), lexical.to_dict())
         
         return {
             "filename": final_filename,
             "pages": len(docs),
             "chunks": len(chunks),
             "full_text": full_text,  # Include for immediate ATS scoring
+            "profile": profile,
         }
     finally:
         try:
@@ -204,10 +332,93 @@ def ingest_resume_pdf(
             pass
 
 
+def search_user_resumes(
+    user_id: str,
+    query: str,
+    k: Optional[int] = None,
+    per_resume: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search every resume a user has uploaded with one vector query, grouped by thread.
+    
+    The query is pre-filtered on `user_id` instead of `thread_id` (backed by
+    the chunks' (user_id, thread_id) index, and on Atlas by `user_id` as a
+    filter field of `vector_index`), so comparing resume versions costs one
+    search however many there are.
+    
+    Args:
+        user_id: Owner of the resumes
+        query: Search text
+        k: Chunks fetched across all resumes (default USER_SEARCH_K)
+        per_resume: Best chunks kept per resume (default USER_SEARCH_PER_RESUME)
+        
+    Returns:
+        One entry per resume with a matching chunk, best first: `thread_id`,
+        `filename`, `updated_at`, `score` (cosine of its best chunk) and
+        `chunks` (`text`, `score`, `sections`, `page`, `start_index`)
+    """
+    k = k or settings.USER_SEARCH_K
+    per_resume = per_resume or settings.USER_SEARCH_PER_RESUME
+    store = chunk_store()
+    vector = embed_query(query)
+    with STAGE_LATENCY.time(stage="user_search"):
+        with store.latency.time(collection="vectorstore", operation="vector_search"):
+            docs = store.vector_search(_get_embeddings()).similarity_search_by_vector(
+                vector, k=k, pre_filter={"user_id": {"$eq": user_id}}, include_embeddings=True
+            )
+        if not docs:
+            return []
+        # Backends score differently (Atlas reports (1 + cosine) / 2), so score from the embeddings
+        matrix = np.asarray([doc.metadata.pop("embedding") for doc in docs], dtype=np.float32)
+        query_vector = np.asarray(vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query_vector) or 1.0)
+        scores = (matrix @ query_vector / np.where(norms == 0, 1.0, norms)).astype(float).round(4).tolist()
+        
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for doc, score in sorted(zip(docs, scores), key=lambda pair: -pair[1]):
+            chunks = groups.setdefault(str(doc.metadata.get("thread_id")), [])
+            if len(chunks) < per_resume:
+                chunks.append({
+                    "text": doc.page_content,
+                    "score": score,
+                    "sections": doc.metadata.get("sections", []),
+                    "page": doc.metadata.get("page", 0),
+                    "start_index": doc.metadata.get("start_index"),
+                })
+    
+    threads = {doc["thread_id"]: doc for doc in get_user_threads(user_id)}
+    return [
+        {
+            "thread_id": thread_id,
+            "filename": threads.get(thread_id, {}).get("filename"),
+            "updated_at": threads.get(thread_id, {}).get("updated_at"),
+            "score": chunks[0]["score"],
+            "chunks": chunks,
+        }
+        for thread_id, chunks in groups.items()
+    ]
+
+
+def delete_thread_vectors(thread_ids: List[str]) -> int:
+    """
+    Delete the stored chunks of `thread_ids` and drop their cached state on every worker.
+    
+    Args:
+        thread_ids: Thread IDs to delete
+        
+    Returns:
+        Number of chunk documents deleted
+    """
+    deleted = chunk_store().delete_threads(thread_ids)
+    for thread_id in thread_ids:
+        shared_state.invalidate_thread(str(thread_id))
+    return deleted
+
+
 def thread_has_resume(thread_id: str) -> bool:
     """
     Check if a thread has an ingested resume.
-    Checks both in-memory cache and MongoDB.
+    Checks both in-memory cache and storage.
     
     Args:
         thread_id: Thread ID to check
@@ -0,0 +1,173 @@
+"""
+Resume-aware chunking along section and entry boundaries.
+
+A generic character splitter cuts wherever the size limit falls, so one
+chunk often ends an Experience entry and starts Education. This splitter:
+
+- tracks the current section (profile_extractor.heading_section) across
+  lines and pages; a chunk holds part of one section or several whole
+  ones, never the end of one section and the start of the next,
+- groups lines into entries: a job or degree line plus its bullets, with
+  wrapped bullet lines kept on their bullet,
+- packs whole entries into chunks up to `chunk_size`, without overlap,
+- packs short sections that fit on a page whole (contact header, skills,
+  education) together, so they don't each cost a chunk; a section that
+  continues from the previous page or onto the next one is never merged.
+
+Each chunk is an exact slice of its page text, with `sections` (the
+sections it covers, usually one) and `start_index` metadata. An entry
+longer than `chunk_size` on its own is split with
+RecursiveCharacterTextSplitter as a fallback.
+"""
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.services.profile_extractor import heading_section
+
+_BULLET = re.compile(r"^\s*(?:[-*•●▪◦‣–]|\d{1,2}[.)])\s+")
+
+
+class ResumeSectionSplitter:
+    """
+    Split resume pages into section-scoped chunks.
+
+    Attributes:
+        chunk_size: Maximum characters per chunk
+        fallback_overlap: Overlap used only when an oversized entry is split
+    """
+
+    def __init__(self, chunk_size: int = 1000, fallback_overlap: int = 150):
+        self.chunk_size = chunk_size
+        self._fallback = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=fallback_overlap,
+            separators=["\n\n", "\n", " ", ""],
+        )
+
+    def split_documents(self, docs: Iterable[Document]) -> List[Document]:
+        """
+        Split page documents, carrying the current section across pages.
+
+        Args:
+            docs: One Document per PDF page, in page order
+
+        Returns:
+            Chunk Documents with the page's metadata plus `sections` and `start_index`
+        """
+        docs = list(docs)
+        chunks: List[Document] = []
+        section = "header"
+        for number, doc in enumerate(docs):
+            carried_in = section if number else None
+            entries, section = self._entries(doc.page_content, section)
+            continues = number < len(docs) - 1
+            for sections, start, end in self._pack_sections(self._pack(entries), carried_in, continues):
+                for offset, text in self._split_oversized(doc.page_content[start:end]):
+                    chunks.append(Document(
+                        page_content=text,
+                        metadata={**doc.metadata, "sections": sections, "start_index": start + offset},
+                    ))
+        return chunks
+
+    def _entries(self, text: str, section: str) -> Tuple[List[Tuple[str, int, int]], str]:
+        """Return (section, start, end) spans of entries on the page, and the section it ends in."""
+        entries: List[Tuple[str, int, int]] = []
+        current = None  # [section, start, end, heading_only] of the entry being built
+        previous_bullet = False
+        previous_blank = True
+        position = 0
+        for line in text.splitlines(keepends=True):
+            start, position = position, position + len(line)
+            stripped = line.strip()
+            if not stripped:
+                previous_blank = True
+                continue
+            end = start + len(line.rstrip("\r\n"))
+
+            heading = heading_section(stripped)
+            is_bullet = bool(_BULLET.match(line))
+            if heading:
+                section = heading
+                new_entry = True
+            else:
+                # A capitalized, non-bullet line after bullets starts the next job/degree;
+                # a lowercase one is a wrapped bullet.
+                new_entry = current is None or current[0] != section or previous_blank or (
+                    previous_bullet and not is_bullet and stripped[0].isupper()
+                )
+                # Consecutive headingless lines right after a heading stay with it
+                if current is not None and current[0] == section and current[3]:
+                    new_entry = False
+            if new_entry:
+                if current is not None:
+                    entries.append((current[0], current[1], current[2]))
+                current = [section, start, end, bool(heading)]
+            else:
+                current[2] = end
+                current[3] = False
+            previous_bullet = is_bullet
+            previous_blank = False
+        if current is not None:
+            entries.append((current[0], current[1], current[2]))
+        return entries, section
+
+    def _pack(self, entries: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+        """Merge consecutive entries of the same section while they fit in chunk_size."""
+        packed: List[Tuple[str, int, int]] = []
+        for section, start, end in entries:
+            if packed:
+                last_section, last_start, last_end = packed[-1]
+                if last_section == section and end - last_start <= self.chunk_size:
+                    packed[-1] = (section, last_start, end)
+                    continue
+            packed.append((section, start, end))
+        return packed
+
+    def _pack_sections(
+        self,
+        units: List[Tuple[str, int, int]],
+        carried_in: Optional[str] = None,
+        continues: bool = False,
+    ) -> List[Tuple[List[str], int, int]]:
+        """
+        Combine consecutive sections that are whole on this page while they fit in chunk_size.
+
+        Args:
+            units: Packed (section, start, end) spans of the page
+            carried_in: Section the previous page ended in (None on the first page)
+            continues: Whether another page follows, which the page's last section may run onto
+        """
+        units_per_section = Counter(section for section, _, _ in units)
+        # A section started on the previous page, or running onto the next, isn't whole here
+        partial = set()
+        if units and units[0][0] == carried_in:
+            partial.add(carried_in)
+        if units and continues:
+            partial.add(units[-1][0])
+        packed: List[Tuple[List[str], int, int]] = []
+        previous_whole = False
+        for section, start, end in units:
+            whole = units_per_section[section] == 1 and section not in partial
+            if packed and whole and previous_whole and end - packed[-1][1] <= self.chunk_size:
+                sections, last_start, _ = packed[-1]
+                packed[-1] = (sections + [section], last_start, end)
+            else:
+                packed.append(([section], start, end))
+            previous_whole = whole
+        return packed
+
+    def _split_oversized(self, text: str) -> List[Tuple[int, str]]:
+        if len(text) <= self.chunk_size:
+            return [(0, text)]
+        pieces = []
+        search_from = 0
+        for piece in self._fallback.split_text(text):
+            offset = text.find(piece, search_from)
+            offset = offset if offset >= 0 else search_from
+            pieces.append((offset, piece))
+            search_from = offset + 1
+        return pieces
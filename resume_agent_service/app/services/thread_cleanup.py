@@ -0,0 +1,211 @@
+"""
+Thread deletion and orphan garbage collection.
+
+A thread's data is spread over four places: its chunks in the vector
+store, its document in `threads`, its LangGraph checkpoints and pending
+writes, and per-worker caches (retriever, profile, BM25 index, cached
+answers). `delete_threads` removes all of them for a batch of threads at
+a time, with one `delete_many` per collection per THREAD_DELETE_BATCH
+threads: pending writes and checkpoints first, then chunks (which also
+invalidates the caches on every worker), and the thread document last,
+so a delete that fails halfway can simply be retried.
+
+`collect_orphans` finds data whose thread has no `threads` document, e.g.
+the chunks of an upload that failed before its metadata was saved. It
+groups each collection by thread_id and checks the ids against the
+unique thread_id index of `threads` one batch at a time. Anything newer
+than ORPHAN_GC_GRACE_SECONDS is skipped (an upload may still be saving),
+and deletes are bounded by the newest document seen during the scan, so
+a thread id reused in the meantime keeps its new data.
+
+Run the GC from cron (prints a JSON report):
+    python -m app.services.thread_cleanup [--dry-run]
+"""
+import argparse
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.metrics import CLEANUP_DOCUMENTS
+from app.memory.checkpoint_compaction import checkpoint_time
+from app.memory.checkpointer import get_checkpointer
+from app.memory.thread_store import delete_thread_metadata, existing_thread_ids, get_user_thread_ids
+from app.services.resume_service import delete_thread_vectors, get_vector_collection
+from app.storage import chunk_store
+
+logger = logging.getLogger("resume_agent.thread_cleanup")
+
+settings = get_settings()
+
+
+@dataclass
+class CleanupReport:
+    """Documents removed by a thread delete or a GC pass (or found, on a dry run)."""
+
+    dry_run: bool = False
+    threads: int = 0            # thread ids deleted, or holding orphaned data
+    thread_documents: int = 0
+    vectors: int = 0
+    checkpoints: int = 0
+    checkpoint_writes: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def documents(self) -> int:
+        return self.thread_documents + self.vectors + self.checkpoints + self.checkpoint_writes
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _count(report: CleanupReport, reason: str, **deleted: int) -> None:
+    for collection, count in deleted.items():
+        setattr(report, collection, getattr(report, collection) + count)
+        if count and not report.dry_run:
+            CLEANUP_DOCUMENTS.inc(count, collection=collection, reason=reason)
+
+
+def delete_threads(thread_ids: List[str], batch_size: Optional[int] = None) -> CleanupReport:
+    """
+    Delete every artifact of the given threads.
+
+    Args:
+        thread_ids: Threads to delete
+        batch_size: Threads per delete_many round (default THREAD_DELETE_BATCH)
+
+    Returns:
+        CleanupReport with the documents deleted per collection
+    """
+    start = time.monotonic()
+    report = CleanupReport()
+    checkpointer = get_checkpointer()
+    for batch in _batches(dict.fromkeys(str(t) for t in thread_ids), batch_size or settings.THREAD_DELETE_BATCH):
+        checkpoints, checkpoint_writes = checkpointer.delete_threads(batch)
+        _count(report, "deleted", checkpoint_writes=checkpoint_writes, checkpoints=checkpoints)
+        _count(report, "deleted", vectors=delete_thread_vectors(batch))
+        _count(report, "deleted", thread_documents=delete_thread_metadata(batch))
+        report.threads += len(batch)
+    report.duration_seconds = round(time.monotonic() - start, 3)
+    logger.info(f"Deleted {report.threads} threads ({report.documents} documents) in {report.duration_seconds}s")
+    return report
+
+
+def delete_user_threads(user_id: str) -> CleanupReport:
+    """
+    Delete every thread of a user, including uploads whose metadata was never saved.
+
+    Args:
+        user_id: Owner of the threads
+
+    Returns:
+        CleanupReport with the documents deleted per collection
+    """
+    thread_ids = set(get_user_thread_ids(user_id))
+    thread_ids.update(chunk_store().thread_ids_for_user(user_id))
+    logger.info(f"Deleting {len(thread_ids)} threads of user {user_id}")
+    return delete_threads(sorted(thread_ids))
+
+
+def _thread_newest(collection, newest_field: str) -> Iterator[Tuple[str, Any]]:
+    """(thread_id, newest value of `newest_field`) for every thread in `collection`."""
+    pipeline = [{"$group": {"_id": "$thread_id", "newest": {"$max": f"${newest_field}"}}}]
+    for row in collection.aggregate(pipeline, allowDiskUse=True):
+        if row["_id"] is not None:
+            yield row["_id"], row["newest"]
+
+
+def _collect(
+    report: CleanupReport,
+    orphaned: set,
+    collections: Dict[str, Any],
+    newest_field: str,
+    created_at: Callable[[Any], Optional[float]],
+    grace_before: float,
+    batch_size: int,
+) -> None:
+    """GC one kind of per-thread data; `collections` maps report field -> collection, scanned via the first."""
+    scanned = next(iter(collections.values()))
+    for batch in _batches(_thread_newest(scanned, newest_field), batch_size):
+        existing = existing_thread_ids([thread_id for thread_id, _ in batch])
+        for thread_id, newest in batch:
+            created = created_at(newest)
+            if thread_id in existing or created is None or created >= grace_before:
+                continue
+            orphaned.add(thread_id)
+            query = {"thread_id": thread_id, newest_field: {"$lte": newest}}
+            for field, collection in collections.items():
+                count = collection.count_documents(query) if report.dry_run else collection.delete_many(query).deleted_count
+                _count(report, "orphan", **{field: count})
+
+
+def collect_orphans(
+    grace_seconds: Optional[float] = None,
+    dry_run: bool = False,
+    batch_size: Optional[int] = None,
+) -> CleanupReport:
+    """
+    Delete chunks, checkpoints and pending writes of threads that have no thread document.
+
+    Args:
+        grace_seconds: Data newer than this is kept (default ORPHAN_GC_GRACE_SECONDS)
+        dry_run: Count orphaned documents without deleting them
+        batch_size: Thread ids checked against `threads` per query (default THREAD_DELETE_BATCH)
+
+    Returns:
+        CleanupReport with the orphaned documents per collection
+
+    Raises:
+        RuntimeError: If STORAGE_BACKEND is not mongo
+    """
+    if settings.STORAGE_BACKEND != "mongo":
+        # SQLite deletes a thread's rows in one transaction per table, so it leaves no orphans to scan for
+        raise RuntimeError(f"Orphan GC runs on the mongo backend only (STORAGE_BACKEND={settings.STORAGE_BACKEND})")
+    start = time.monotonic()
+    report = CleanupReport(dry_run=dry_run)
+    grace = settings.ORPHAN_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    grace_before = time.time() - grace
+    batch_size = batch_size or settings.THREAD_DELETE_BATCH
+    checkpointer = get_checkpointer()
+    orphaned: set = set()
+
+    # Chunk _ids are ObjectIds, which carry their insert time
+    _collect(report, orphaned, {"vectors": get_vector_collection()}, "_id",
+             lambda oid: oid.generation_time.timestamp(), grace_before, batch_size)
+    # Writes are scanned on their own: they can outlive their checkpoints
+    _collect(report, orphaned, {"checkpoint_writes": checkpointer.writes_collection}, "checkpoint_id",
+             checkpoint_time, grace_before, batch_size)
+    _collect(report, orphaned, {"checkpoints": checkpointer.checkpoint_collection}, "checkpoint_id",
+             checkpoint_time, grace_before, batch_size)
+
+    report.threads = len(orphaned)
+    report.duration_seconds = round(time.monotonic() - start, 3)
+    logger.info(
+        f"Orphan GC{' (dry run)' if dry_run else ''}: {report.documents} documents of "
+        f"{report.threads} threads without metadata in {report.duration_seconds}s"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete data of threads that have no thread document.")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be deleted")
+    parser.add_argument("--grace-seconds", type=float, default=settings.ORPHAN_GC_GRACE_SECONDS)
+    parser.add_argument("--batch-size", type=int, default=settings.THREAD_DELETE_BATCH)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    report = collect_orphans(args.grace_seconds, dry_run=args.dry_run, batch_size=args.batch_size)
+    print(json.dumps(report.as_dict(), indent=2))
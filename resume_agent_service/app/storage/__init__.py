@@ -0,0 +1,69 @@
+"""
+Storage backends for thread documents, resume chunks and checkpoints.
+
+STORAGE_BACKEND selects where the service keeps its data:
+
+- mongo (default): MongoDB / Atlas (MONGODB_URI, DB_NAME). Chunks are
+  searched with Atlas `$vectorSearch`.
+- sqlite: one embedded database file (SQLITE_PATH) in WAL mode, for
+  single-node and edge deployments and for CI. Needs no network service.
+
+app/memory/thread_store.py, app/services/resume_service.py and
+app/memory/checkpointer.py use the backend through `thread_documents()`,
+`chunk_store()` and `sqlite_database()`. Each is created on first use.
+"""
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from app.core.config import get_settings
+from app.storage.base import ChunkStore, ThreadDocuments
+
+load_dotenv()
+
+settings = get_settings()
+
+_thread_documents: Optional[ThreadDocuments] = None
+_chunk_store: Optional[ChunkStore] = None
+_sqlite_database = None
+
+
+def sqlite_database():
+    """The SQLite database shared by all SQLite stores (SQLITE_PATH)."""
+    global _sqlite_database
+    if _sqlite_database is None:
+        from app.storage.sqlite import SqliteDatabase
+        _sqlite_database = SqliteDatabase(settings.SQLITE_PATH, busy_timeout=settings.SQLITE_BUSY_TIMEOUT)
+    return _sqlite_database
+
+
+def _mongo_db():
+    from pymongo import MongoClient
+    return MongoClient(os.getenv("MONGODB_URI"))[os.getenv("DB_NAME", "test")]
+
+
+def thread_documents() -> ThreadDocuments:
+    """The configured backend's thread documents."""
+    global _thread_documents
+    if _thread_documents is None:
+        if settings.STORAGE_BACKEND == "sqlite":
+            from app.storage.sqlite import SqliteThreadDocuments
+            _thread_documents = SqliteThreadDocuments(sqlite_database())
+        else:
+            from app.storage.mongo import MongoThreadDocuments
+            _thread_documents = MongoThreadDocuments(_mongo_db()["threads"])
+    return _thread_documents
+
+
+def chunk_store() -> ChunkStore:
+    """The configured backend's chunk store."""
+    global _chunk_store
+    if _chunk_store is None:
+        if settings.STORAGE_BACKEND == "sqlite":
+            from app.storage.sqlite import SqliteChunkStore
+            _chunk_store = SqliteChunkStore(sqlite_database())
+        else:
+            from app.storage.mongo import MongoChunkStore
+            _chunk_store = MongoChunkStore(_mongo_db()[os.getenv("COLLECTION_NAME", "vectorstore")])
+    return _chunk_store
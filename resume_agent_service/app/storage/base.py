@@ -0,0 +1,79 @@
+"""
+Interfaces of the storage backends (see app/storage/__init__.py).
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class ThreadDocuments(ABC):
+    """
+    One document per thread: upload metadata, profile, ATS results, full
+    resume text and BM25 index.
+    """
+
+    @abstractmethod
+    def get(
+        self,
+        thread_id: str,
+        fields: Optional[Iterable[str]] = None,
+        exclude: Iterable[str] = (),
+    ) -> Optional[Dict[str, Any]]:
+        """The thread's document (only `fields` if given, without `exclude`), or None."""
+
+    @abstractmethod
+    def set(self, thread_id: str, fields: Dict[str, Any], upsert: bool = False) -> None:
+        """Set `fields` on the thread's document (creating it, with `created_at`, if `upsert`)."""
+
+    @abstractmethod
+    def list_for_user(
+        self,
+        user_id: str,
+        fields: Optional[Iterable[str]] = None,
+        exclude: Iterable[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """A user's thread documents (projected like `get`), most recently updated first."""
+
+    @abstractmethod
+    def existing(self, thread_ids: Iterable[str]) -> Set[str]:
+        """The subset of `thread_ids` that have a document."""
+
+    @abstractmethod
+    def delete(self, thread_ids: Iterable[str]) -> int:
+        """Delete the documents of `thread_ids`; returns how many were deleted."""
+
+
+class ChunkStore(ABC):
+    """
+    Embedded resume chunks, searched one thread at a time.
+
+    Attributes:
+        latency: Histogram that vector searches are timed with
+    """
+
+    latency: Any
+
+    @abstractmethod
+    def add(self, texts: List[str], vectors: List[List[float]], metadatas: List[Dict[str, Any]]) -> None:
+        """Store chunks with their embeddings and metadata (thread_id, user_id, sections, ...)."""
+
+    @abstractmethod
+    def vector_search(self, embeddings: Any) -> Any:
+        """Object with `similarity_search_by_vector(vector, k, pre_filter)` over the chunks."""
+
+    @abstractmethod
+    def chunks(self, thread_id: str) -> List[Dict[str, Any]]:
+        """A thread's chunks as metadata dicts with their `text`, without embeddings."""
+
+    @abstractmethod
+    def vectors(self, thread_id: str) -> Tuple[List[str], np.ndarray]:
+        """A thread's chunk texts and their embeddings as a float32 matrix (one row per chunk)."""
+
+    @abstractmethod
+    def thread_ids_for_user(self, user_id: str) -> List[str]:
+        """Threads that have chunks uploaded by `user_id`."""
+
+    @abstractmethod
+    def delete_threads(self, thread_ids: Iterable[str]) -> int:
+        """Delete the chunks of `thread_ids`; returns how many were deleted."""
@@ -0,0 +1,133 @@
+"""
+MongoDB / Atlas storage backend.
+
+Thread documents live in the `threads` collection and chunks in the
+vector store collection (COLLECTION_NAME), searched with Atlas
+`$vectorSearch` through MongoDBAtlasVectorSearch.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+from langchain_mongodb.vectorstores import MongoDBAtlasVectorSearch
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+from app.core.metrics import MONGO_LATENCY
+from app.storage.base import ChunkStore, ThreadDocuments
+
+logger = logging.getLogger("resume_agent.storage")
+
+
+def _projection(fields: Optional[Iterable[str]], exclude: Iterable[str]) -> Dict[str, int]:
+    if fields is not None:
+        return {"_id": 0, **{field: 1 for field in fields}}
+    return {"_id": 0, **{field: 0 for field in exclude}}
+
+
+class MongoThreadDocuments(ThreadDocuments):
+    """Thread documents in a MongoDB collection (indexes created on first use)."""
+
+    def __init__(self, collection: Collection):
+        self._collection = collection
+        self._indexed = False
+
+    @property
+    def collection(self) -> Collection:
+        if not self._indexed:
+            try:
+                with MONGO_LATENCY.time(collection="threads", operation="create_index"):
+                    self._collection.create_index("user_id")
+                    self._collection.create_index("thread_id", unique=True)
+            except PyMongoError as e:
+                # Existing duplicate thread docs block a unique index; lookups still work
+                logger.warning(f"Could not create unique thread_id index: {str(e)}")
+            self._indexed = True
+        return self._collection
+
+    def get(self, thread_id, fields=None, exclude=()):
+        with MONGO_LATENCY.time(collection="threads", operation="find_one"):
+            return self.collection.find_one({"thread_id": thread_id}, _projection(fields, exclude))
+
+    def set(self, thread_id, fields, upsert=False):
+        update: Dict[str, Any] = {"$set": fields}
+        if upsert:
+            update["$setOnInsert"] = {"created_at": datetime.utcnow()}
+        with MONGO_LATENCY.time(collection="threads", operation="update_one"):
+            self.collection.update_one({"thread_id": thread_id}, update, upsert=upsert)
+
+    def list_for_user(self, user_id, fields=None, exclude=()):
+        with MONGO_LATENCY.time(collection="threads", operation="find"):
+            cursor = self.collection.find({"user_id": user_id}, _projection(fields, exclude)).sort("updated_at", -1)
+            return list(cursor)
+
+    def existing(self, thread_ids):
+        with MONGO_LATENCY.time(collection="threads", operation="find"):
+            cursor = self.collection.find({"thread_id": {"$in": list(thread_ids)}}, {"_id": 0, "thread_id": 1})
+            return {doc["thread_id"] for doc in cursor}
+
+    def delete(self, thread_ids):
+        with MONGO_LATENCY.time(collection="threads", operation="delete_many"):
+            return self.collection.delete_many({"thread_id": {"$in": list(thread_ids)}}).deleted_count
+
+
+class MongoChunkStore(ChunkStore):
+    """
+    Chunks in the Atlas vector store collection, in the layout
+    MongoDBAtlasVectorSearch writes (text + embedding + flattened metadata).
+    """
+
+    latency = MONGO_LATENCY
+
+    def __init__(self, collection: Collection):
+        self._collection = collection
+        self._indexed = False
+
+    @property
+    def collection(self) -> Collection:
+        if not self._indexed:
+            # Regular indexes for deleting a thread's or user's chunks, listing a user's
+            # threads and orphan GC (the Atlas vector index only serves $vectorSearch)
+            with MONGO_LATENCY.time(collection="vectorstore", operation="create_index"):
+                self._collection.create_index("thread_id")
+                self._collection.create_index([("user_id", 1), ("thread_id", 1)])
+            self._indexed = True
+        return self._collection
+
+    def add(self, texts, vectors, metadatas):
+        if not texts:
+            return
+        with MONGO_LATENCY.time(collection="vectorstore", operation="insert_many"):
+            self.collection.insert_many([
+                {"text": text, "embedding": vector, **metadata}
+                for text, vector, metadata in zip(texts, vectors, metadatas)
+            ])
+
+    def vector_search(self, embeddings):
+        # Note: embedding_key must match your Atlas Search index path ("embedding")
+        return MongoDBAtlasVectorSearch(
+            collection=self.collection,
+            embedding=embeddings,
+            index_name="vector_index",
+            embedding_key="embedding",  # Match your Atlas index field name
+        )
+
+    def chunks(self, thread_id):
+        with MONGO_LATENCY.time(collection="vectorstore", operation="find"):
+            return list(self.collection.find({"thread_id": thread_id}, {"_id": 0, "embedding": 0}))
+
+    def vectors(self, thread_id):
+        with MONGO_LATENCY.time(collection="vectorstore", operation="find"):
+            docs = list(self.collection.find({"thread_id": thread_id}, {"_id": 0, "text": 1, "embedding": 1}))
+        if not docs:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return [doc["text"] for doc in docs], np.array([doc["embedding"] for doc in docs], dtype=np.float32)
+
+    def thread_ids_for_user(self, user_id):
+        with MONGO_LATENCY.time(collection="vectorstore", operation="distinct"):
+            return self.collection.distinct("thread_id", {"user_id": user_id})
+
+    def delete_threads(self, thread_ids):
+        with MONGO_LATENCY.time(collection="vectorstore", operation="delete_many"):
+            return self.collection.delete_many({"thread_id": {"$in": list(thread_ids)}}).deleted_count
@@ -0,0 +1,299 @@
+"""
+Embedded SQLite storage backend for single-node deployments, edge installs and CI.
+
+Thread documents, resume chunks and LangGraph checkpoints share one
+database file in WAL mode, so readers never wait for the writer and a
+crash loses at most the last commits (synchronous=NORMAL). Each OS thread
+gets its own connection; writers queue on SQLite's lock for up to
+`busy_timeout` seconds.
+
+Chunk embeddings are stored as float32 BLOBs. A vector search reads the
+thread's chunks through the thread_id index and ranks them exactly by
+cosine similarity with one NumPy matrix product, which is fast for the
+few dozen chunks of a resume and needs no vector index. Searches across
+all of a user's resumes read through the (user_id, thread_id) index.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.core.metrics import SQLITE_LATENCY
+from app.storage.base import ChunkStore, ThreadDocuments
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    user_id TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    full_text TEXT,
+    lexical_index TEXT,
+    data TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS threads_user ON threads (user_id, updated_at);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    user_id TEXT,
+    text TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_thread ON chunks (thread_id);
+DROP INDEX IF EXISTS chunks_user;
+CREATE INDEX IF NOT EXISTS chunks_user_thread ON chunks (user_id, thread_id);
+"""
+
+# Thread document fields stored in their own columns; everything else goes in `data` (JSON)
+_DATE_COLUMNS = ("created_at", "updated_at")
+_TEXT_COLUMNS = ("user_id", "full_text")
+_JSON_COLUMNS = ("lexical_index",)
+
+
+class SqliteDatabase:
+    """
+    One SQLite database file in WAL mode, with a connection per thread.
+
+    Attributes:
+        path: Database file
+        busy_timeout: Seconds a write waits for the database lock
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self.conn.executescript(_SCHEMA)
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a new connection with the service's pragmas."""
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection (rows as sqlite3.Row)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self.connect()
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """This thread's connection inside a write transaction (committed on exit)."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def _placeholders(values: List[Any]) -> str:
+    return ",".join("?" * len(values))
+
+
+def _to_column(field: str, value: Any) -> Any:
+    if field in _DATE_COLUMNS and isinstance(value, datetime):
+        return value.isoformat()
+    if field in _JSON_COLUMNS and value is not None:
+        return json.dumps(value)
+    return value
+
+
+class SqliteThreadDocuments(ThreadDocuments):
+    """Thread documents as rows of the `threads` table."""
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def _row_to_doc(self, row: sqlite3.Row) -> Dict[str, Any]:
+        doc = json.loads(row["data"])
+        doc["thread_id"] = row["thread_id"]
+        doc["user_id"] = row["user_id"]
+        for field in _DATE_COLUMNS:
+            doc[field] = datetime.fromisoformat(row[field])
+        if "full_text" in row.keys():
+            doc["full_text"] = row["full_text"]
+        if "lexical_index" in row.keys():
+            doc["lexical_index"] = json.loads(row["lexical_index"]) if row["lexical_index"] else None
+        return doc
+
+    def _select(self, where: str, params: List[Any], fields, exclude, order: str = "") -> List[Dict[str, Any]]:
+        wanted = set(fields) if fields is not None else None
+        columns = ["thread_id", "user_id", "created_at", "updated_at", "data"]
+        columns += [
+            column for column in ("full_text", "lexical_index")
+            if (column in wanted if wanted is not None else column not in exclude)
+        ]
+        rows = self.db.conn.execute(f"SELECT {', '.join(columns)} FROM threads WHERE {where} {order}", params).fetchall()
+        docs = [self._row_to_doc(row) for row in rows]
+        if wanted is not None:
+            return [{field: doc[field] for field in wanted if field in doc} for doc in docs]
+        return [{k: v for k, v in doc.items() if k not in exclude} for doc in docs]
+
+    def get(self, thread_id, fields=None, exclude=()):
+        with SQLITE_LATENCY.time(collection="threads", operation="select"):
+            docs = self._select("thread_id = ?", [thread_id], fields, exclude)
+        return docs[0] if docs else None
+
+    def set(self, thread_id, fields, upsert=False):
+        columns = {k: _to_column(k, v) for k, v in fields.items() if k in _DATE_COLUMNS + _TEXT_COLUMNS + _JSON_COLUMNS}
+        data = {k: v for k, v in fields.items() if k not in columns and k != "thread_id"}
+        assignments = [f"{column} = ?" for column in columns]
+        params: List[Any] = list(columns.values())
+        if data:
+            paths = ", ".join(f"'$.\"{key}\"', json(?)" for key in data)
+            assignments.append(f"data = json_set(data, {paths})")
+            params += [json.dumps(value, default=str) for value in data.values()]
+        with SQLITE_LATENCY.time(collection="threads", operation="update"), self.db.transaction() as conn:
+            if upsert:
+                now = datetime.utcnow().isoformat()
+                conn.execute(
+                    "INSERT INTO threads (thread_id, created_at, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (thread_id) DO NOTHING",
+                    (thread_id, now, now),
+                )
+            if assignments:
+                conn.execute(f"UPDATE threads SET {', '.join(assignments)} WHERE thread_id = ?", params + [thread_id])
+
+    def list_for_user(self, user_id, fields=None, exclude=()):
+        with SQLITE_LATENCY.time(collection="threads", operation="select"):
+            return self._select("user_id = ?", [user_id], fields, exclude, order="ORDER BY updated_at DESC")
+
+    def existing(self, thread_ids):
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return set()
+        with SQLITE_LATENCY.time(collection="threads", operation="select"):
+            rows = self.db.conn.execute(
+                f"SELECT thread_id FROM threads WHERE thread_id IN ({_placeholders(thread_ids)})", thread_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def delete(self, thread_ids):
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return 0
+        with SQLITE_LATENCY.time(collection="threads", operation="delete"), self.db.transaction() as conn:
+            return conn.execute(
+                f"DELETE FROM threads WHERE thread_id IN ({_placeholders(thread_ids)})", thread_ids
+            ).rowcount
+
+
+class SqliteVectorSearch:
+    """Exact cosine search over a thread's or a user's chunks (the MongoDBAtlasVectorSearch calls the retriever uses)."""
+
+    def __init__(self, db: SqliteDatabase, embedding: Any):
+        self.db = db
+        self.embedding = embedding
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        pre_filter: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+        **kwargs: Any,
+    ) -> List[Document]:
+        """
+        Rank the chunks matching `pre_filter` by cosine similarity.
+
+        Args:
+            embedding: Query vector
+            k: Number of chunks to return
+            pre_filter: `{"thread_id": {"$eq": ...}}` or `{"user_id": {"$eq": ...}}`,
+                optionally with `{"sections": {"$eq": ...}}`
+            include_embeddings: Return each chunk's embedding in its metadata (`embedding`)
+        """
+        pre_filter = pre_filter or {}
+        column = "user_id" if "user_id" in pre_filter and "thread_id" not in pre_filter else "thread_id"
+        section = pre_filter.get("sections", {}).get("$eq")
+        rows = self.db.conn.execute(
+            f"SELECT text, metadata, embedding FROM chunks WHERE {column} = ?", (pre_filter.get(column, {}).get("$eq"),)
+        ).fetchall()
+        metadatas = [json.loads(metadata) for _, metadata, _ in rows]
+        keep = [i for i, metadata in enumerate(metadatas) if section is None or section in metadata.get("sections", ())]
+        if not keep:
+            return []
+        matrix = np.frombuffer(b"".join(rows[i][2] for i in keep), dtype=np.float32).reshape(len(keep), -1)
+        query = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = matrix @ query / np.where(norms == 0, 1.0, norms)
+        top = np.argsort(-scores)[:k]
+        if include_embeddings:
+            for i in top:
+                metadatas[keep[i]]["embedding"] = matrix[i].tolist()
+        return [Document(page_content=rows[keep[i]][0], metadata=metadatas[keep[i]]) for i in top]
+
+
+class SqliteChunkStore(ChunkStore):
+    """Chunks as rows of the `chunks` table, embeddings as float32 BLOBs."""
+
+    latency = SQLITE_LATENCY
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def add(self, texts, vectors, metadatas):
+        if not texts:
+            return
+        now = time.time()
+        rows = [
+            (metadata.get("thread_id"), metadata.get("user_id"), text, json.dumps(metadata, default=str),
+             np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector, metadata in zip(texts, vectors, metadatas)
+        ]
+        with SQLITE_LATENCY.time(collection="chunks", operation="insert"), self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO chunks (thread_id, user_id, text, metadata, embedding, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def vector_search(self, embeddings):
+        return SqliteVectorSearch(self.db, embeddings)
+
+    def chunks(self, thread_id):
+        with SQLITE_LATENCY.time(collection="chunks", operation="select"):
+            rows = self.db.conn.execute(
+                "SELECT text, metadata FROM chunks WHERE thread_id = ? ORDER BY id", (thread_id,)
+            ).fetchall()
+        return [{**json.loads(metadata), "text": text} for text, metadata in rows]
+
+    def vectors(self, thread_id):
+        with SQLITE_LATENCY.time(collection="chunks", operation="select"):
+            rows = self.db.conn.execute(
+                "SELECT text, embedding FROM chunks WHERE thread_id = ? ORDER BY id", (thread_id,)
+            ).fetchall()
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        return [row[0] for row in rows], matrix
+
+    def thread_ids_for_user(self, user_id):
+        with SQLITE_LATENCY.time(collection="chunks", operation="select"):
+            rows = self.db.conn.execute("SELECT DISTINCT thread_id FROM chunks WHERE user_id = ?", (user_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def delete_threads(self, thread_ids):
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return 0
+        with SQLITE_LATENCY.time(collection="chunks", operation="delete"), self.db.transaction() as conn:
+            return conn.execute(
+                f"DELETE FROM chunks WHERE thread_id IN ({_placeholders(thread_ids)})", thread_ids
+            ).rowcount
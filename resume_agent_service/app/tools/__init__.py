@@ -1,12 +1,14 @@
 from app.tools.rag_tool import resume_rag_tool
 from app.tools.ats_scorer import ats_score_tool
 from app.tools.web_search_tool import job_search_tool, career_advice_search
+from app.tools.job_recommendation_tool import job_recommendation_tool
 
 # All registered tools for the Resume Agent
 tools = [
     resume_rag_tool,
     ats_score_tool,
     job_search_tool,
+    job_recommendation_tool,
     career_advice_search,
 ]
 
@@ -15,5 +17,6 @@ __all__ = [
     "resume_rag_tool", 
     "ats_score_tool",
     "job_search_tool",
+    "job_recommendation_tool",
     "career_advice_search",
 ]
@@ -6,6 +6,10 @@ from dotenv import load_dotenv
 import re
 import json
 
+from app.core.config import get_settings
+from app.core.metrics import STAGE_LATENCY, LLM_CALL_LATENCY, TOOL_LATENCY, timed
+from app.services.llm_gateway import GatewayChatModel
+
 load_dotenv()
 
 # Common ATS keywords by category
@@ -34,7 +38,16 @@ _llm = None
 def _get_llm():
     global _llm
     if _llm is None:
-        _llm = ChatGroq(model="openai/gpt-oss-120b", temperature=0.7)
+        settings = get_settings()
+        _llm = GatewayChatModel(
+            runnable=ChatGroq(
+                model="openai/gpt-oss-120b",
+                temperature=0.7,
+                request_timeout=settings.LLM_CALL_TIMEOUT,
+                max_retries=0,
+            ),
+            provider="groq",
+        )
     return _llm
 
 
@@ -72,10 +85,12 @@ Action Verbs Found: {', '.join(found_verbs[:10]) if found_verbs else 'None'}
 Based on this analysis, provide 5-7 specific improvement suggestions as a JSON array."""
 
     try:
-        response = llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ])
+        # Overload, rate limits and deadlines fall back to rule-based suggestions
+        with LLM_CALL_LATENCY.time(call="ats_suggestions"):
+            response = llm.invoke([
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=user_prompt)
+            ])
         
         # Parse JSON from response
         content = response.content.strip()
@@ -111,23 +126,41 @@ def _generate_fallback_suggestions(breakdown: Dict) -> List[str]:
     return suggestions
 
 
-def calculate_ats_score(resume_text: str) -> Dict:
+def find_ats_keywords(text_lower: str) -> Dict[str, List[str]]:
     """
-    Calculate an ATS compatibility score based on keyword presence and formatting.
-    Uses LLM for personalized suggestions.
+    ATS taxonomy keywords present in a lowercased text, per category.
+    
+    Args:
+        text_lower: Lowercased resume or job description text.
+    
+    Returns:
+        dict: Category -> matched keywords, in taxonomy order.
+    """
+    return {
+        category: [kw for kw in keywords if kw in text_lower]
+        for category, keywords in ATS_KEYWORDS.items()
+    }
+
+
+def score_resume_rules(resume_text: str) -> Dict:
+    """
+    Rule-based part of the ATS score: keyword matching and format checks.
+    
+    Pure CPU with no LLM call, so it can be benchmarked and reused on its own.
     
     Args:
         resume_text: Full text content of the resume.
     
     Returns:
-        dict: Score breakdown and LLM-generated suggestions.
+        dict: Total score, per-category breakdown and the matched keywords.
     """
     text_lower = resume_text.lower()
     
     # Keyword matching
-    found_technical = [kw for kw in ATS_KEYWORDS["technical_skills"] if kw in text_lower]
-    found_soft = [kw for kw in ATS_KEYWORDS["soft_skills"] if kw in text_lower]
-    found_verbs = [v for v in ATS_KEYWORDS["action_verbs"] if v in text_lower]
+    found = find_ats_keywords(text_lower)
+    found_technical = found["technical_skills"]
+    found_soft = found["soft_skills"]
+    found_verbs = found["action_verbs"]
     
     # Score calculation (simple rule-based)
     technical_score = min(len(found_technical) * 5, 35)  # Max 35 points
@@ -143,31 +176,46 @@ def calculate_ats_score(resume_text: str) -> Dict:
     
     total_score = technical_score + soft_score + verb_score + format_score
     
-    breakdown = {
-        "technical_skills": technical_score,
-        "soft_skills": soft_score,
-        "action_verbs": verb_score,
-        "formatting": format_score
+    return {
+        "total_score": min(total_score, 100),
+        "breakdown": {
+            "technical_skills": technical_score,
+            "soft_skills": soft_score,
+            "action_verbs": verb_score,
+            "formatting": format_score
+        },
+        "found_skills": found_technical + found_soft,
+        "found_verbs": found_verbs,
     }
+
+
+def calculate_ats_score(resume_text: str) -> Dict:
+    """
+    Calculate an ATS compatibility score based on keyword presence and formatting.
+    Uses LLM for personalized suggestions.
+    
+    Args:
+        resume_text: Full text content of the resume.
+    
+    Returns:
+        dict: Score breakdown and LLM-generated suggestions.
+    """
+    with STAGE_LATENCY.time(stage="ats_rule_scoring"):
+        rules = score_resume_rules(resume_text)
     
     # Generate LLM-powered suggestions
     suggestions = _generate_llm_suggestions(
         resume_text, 
-        breakdown, 
-        found_technical + found_soft, 
-        found_verbs
+        rules["breakdown"], 
+        rules["found_skills"], 
+        rules["found_verbs"]
     )
     
-    return {
-        "total_score": min(total_score, 100),
-        "breakdown": breakdown,
-        "found_skills": found_technical + found_soft,
-        "found_verbs": found_verbs,
-        "suggestions": suggestions
-    }
+    return {**rules, "suggestions": suggestions}
 
 
 @tool
+@timed(TOOL_LATENCY, tool="ats_score_tool")
 def ats_score_tool(resume_text: str) -> dict:
     """
     Analyze resume text and calculate an ATS (Applicant Tracking System) compatibility score.
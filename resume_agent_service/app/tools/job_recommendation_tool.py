@@ -0,0 +1,56 @@
+"""
+Job recommendations from the local job index, with web search as fallback.
+
+Ranks the postings imported with `python -m app.services.job_index`
+against the resume's chunk embeddings (and the user's request, if any) in
+milliseconds. Without an index, or without an uploaded resume, it answers
+with a live web search like job_search_tool.
+"""
+from typing import Optional
+
+from langchain_core.tools import tool
+
+from app.core.metrics import JOB_RECOMMENDATIONS, TOOL_LATENCY, timed
+from app.services.job_index import recommend_jobs
+from app.services.resume_service import embed_query, get_resume_profile
+from app.storage import chunk_store
+from app.tools.web_search_tool import search_jobs_web
+
+
+def _format(match) -> str:
+    posting = match.posting
+    head = " | ".join(filter(None, (posting.get("title"), posting.get("company"), posting.get("location"))))
+    lines = [f"- {head} (match {match.score:.2f})"]
+    if posting.get("url"):
+        lines.append(f"  {posting['url']}")
+    if posting.get("description"):
+        lines.append(f"  {' '.join(posting['description'].split())[:200]}")
+    return "\n".join(lines)
+
+
+@tool
+@timed(TOOL_LATENCY, tool="job_recommendation_tool")
+def job_recommendation_tool(thread_id: Optional[str] = None, query: str = "") -> str:
+    """
+    Recommend job postings that match the uploaded resume.
+
+    Use this tool when the user asks which jobs fit them, for job recommendations,
+    or for openings matching their background. Always include the thread_id.
+
+    Args:
+        thread_id: The unique identifier for the current chat thread.
+        query: Optional preferences to steer the ranking, e.g. "remote", "data engineering roles".
+
+    Returns:
+        str: Ranked job postings with their match score, or web search results.
+    """
+    texts, vectors = chunk_store().vectors(str(thread_id)) if thread_id else ([], None)
+    if texts:
+        matches = recommend_jobs(vectors, embed_query(query) if query.strip() else None)
+        if matches:
+            JOB_RECOMMENDATIONS.inc(source="index")
+            return "Job postings ranked by fit with the resume:\n" + "\n".join(_format(m) for m in matches)
+
+    JOB_RECOMMENDATIONS.inc(source="web")
+    skills = ", ".join(get_resume_profile(thread_id).get("skills", [])[:5])
+    return search_jobs_web(query.strip() or "jobs hiring", skills)
@@ -1,9 +1,27 @@
 from typing import Optional, List, Dict
+from langchain_core.documents import Document
 from langchain_core.tools import tool
-from app.services.resume_service import get_retriever, get_thread_metadata
+from app.core.config import get_settings
+from app.core.metrics import TOOL_LATENCY, timed
+from app.services.context_assembler import assemble_context, estimate_tokens
+from app.services.profile_extractor import SECTION_HEADINGS
+from app.services.rag_prefetch import rag_prefetcher
+from app.services.resume_service import get_retriever, get_thread_metadata, search_user_resumes
+
+settings = get_settings()
+
+# Smallest excerpt budget worth giving a resume when comparing versions
+_MIN_RESUME_TOKENS = 100
+
 
 @tool
-def resume_rag_tool(query: str, thread_id: Optional[str] = None) -> str:
+@timed(TOOL_LATENCY, tool="resume_rag_tool")
+def resume_rag_tool(
+    query: str,
+    thread_id: Optional[str] = None,
+    section: Optional[str] = None,
+    all_resumes: bool = False,
+) -> str:
     """
     Retrieve relevant information from the uploaded resume for this chat thread.
     Always include the thread_id when calling this tool.
@@ -11,21 +29,79 @@ def resume_rag_tool(query: str, thread_id: Optional[str] = None) -> str:
     Args:
         query: The search query to find relevant resume sections.
         thread_id: The unique identifier for the current chat thread.
+        section: Optional resume section to search only: "summary", "experience",
+            "education", "skills", "projects" or "certifications". Use it when the
+            question is clearly about one section (e.g. "summarize my experience").
+        all_resumes: Search every resume version this user has uploaded, grouped by
+            resume. Use it to compare versions (e.g. "which version highlights
+            Kubernetes best?").
     
     Returns:
         str: Resume content relevant to the query, or an error message.
     """
+    if all_resumes:
+        return _search_all_resumes(query, thread_id)
+    
     retriever = get_retriever(thread_id)
     if retriever is None:
         return "No resume has been uploaded for this session. Please upload a resume first."
     
-    results = retriever.invoke(query)
+    # Unknown section names are ignored rather than returning nothing
+    section = section.strip().lower() if section else None
+    if section not in SECTION_HEADINGS:
+        section = None
+    
+    # Reuse the retrieval chat_node started for the user's message, if the query matches;
+    # otherwise hybrid BM25 + vector retrieval (keyword queries are served from BM25 alone)
+    results = rag_prefetcher.take(thread_id, query, section)
+    if results is None:
+        results = retriever.search(query, section=section)
     
     # Handle empty results
     if not results:
         return "I couldn't find specific information about that in your resume. Could you rephrase your question?"
     
-    # Return only the text content as a simple string
-    resume_text = "\n\n".join([doc.page_content for doc in results])
-    return resume_text
+    # Merge overlapping chunks, keep the best ones within the token budget, in resume order
+    return assemble_context(results, settings.RAG_CONTEXT_MAX_TOKENS)
+
 
+def _search_all_resumes(query: str, thread_id: Optional[str]) -> str:
+    """
+    Search all resumes of the thread's user in one vector query, formatted per resume.
+    
+    Every resume gets a heading with its best score. Their excerpts share
+    RAG_CONTEXT_MAX_TOKENS, so comparing many versions costs no more
+    checkpoint space than a single-resume answer. Resumes beyond what the
+    budget can show are listed with their heading only.
+    """
+    user_id = get_thread_metadata(thread_id).get("user_id") if thread_id else None
+    if not user_id:
+        return "No resume has been uploaded for this session. Please upload a resume first."
+    
+    resumes = search_user_resumes(user_id, query)
+    if not resumes:
+        return "I couldn't find anything about that in any of your resumes. Could you rephrase your question?"
+    
+    headings = []
+    for resume in resumes:
+        label = resume["filename"] or resume["thread_id"]
+        current = " (this chat)" if resume["thread_id"] == str(thread_id) else ""
+        headings.append(f"### {label}{current}, best match {resume['score']:.2f}")
+    
+    budget = settings.RAG_CONTEXT_MAX_TOKENS
+    shown, share = len(resumes), 0
+    if budget > 0:
+        budget = max(budget - sum(estimate_tokens(heading) for heading in headings), 0)
+        shown = max(1, min(len(resumes), budget // _MIN_RESUME_TOKENS))
+        share = max(budget // shown, 1)
+    
+    parts = []
+    for index, (resume, heading) in enumerate(zip(resumes, headings)):
+        parts.append(heading)
+        if index < shown:
+            docs = [
+                Document(page_content=chunk["text"], metadata={"page": chunk["page"], "start_index": chunk["start_index"]})
+                for chunk in resume["chunks"]
+            ]
+            parts.append(assemble_context(docs, share))
+    return "\n\n".join(parts)
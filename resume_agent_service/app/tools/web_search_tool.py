@@ -8,6 +8,8 @@ Uses DuckDuckGo for free, API-key-free searches.
 
 from langchain_core.tools import tool
 
+from app.core.metrics import TOOL_LATENCY, timed
+
 try:
     from langchain_community.tools import DuckDuckGoSearchRun
     SEARCH_AVAILABLE = True
@@ -15,27 +17,16 @@ except ImportError:
     SEARCH_AVAILABLE = False
 
 
-@tool
-def job_search_tool(query: str, skills: str = "") -> str:
+def search_jobs_web(query: str, skills: str = "") -> str:
     """
-    Search the web for job opportunities, companies, and career resources.
-    
-    Use this tool when the user asks about:
-    - Job roles they can apply for
-    - Where to find job postings
-    - Companies hiring for specific skills
-    - Remote work opportunities
-    - Salary information
-    - Career advice
+    Search the web for jobs (job_search_tool, and job_recommendation_tool's fallback).
     
     Args:
-        query: The search query describing what the user is looking for.
-               Examples: "remote python developer jobs", "companies hiring React developers"
-        skills: Optional comma-separated skills from the resume to enhance the search.
-               Will be appended to the query for more relevant results.
+        query: What the user is looking for
+        skills: Optional comma-separated skills appended to the query
     
     Returns:
-        str: Search results containing job listings, company info, or career resources.
+        str: Search results, or a message saying why there are none.
     """
     if not SEARCH_AVAILABLE:
         return "Web search is currently unavailable. Please install 'duckduckgo-search' package."
@@ -61,7 +52,34 @@ def job_search_tool(query: str, skills: str = "") -> str:
         return f"Search failed: {str(e)}. Please try again with a different query."
 
 
-@tool  
+@tool
+@timed(TOOL_LATENCY, tool="job_search_tool")
+def job_search_tool(query: str, skills: str = "") -> str:
+    """
+    Search the web for job opportunities, companies, and career resources.
+    
+    Use this tool when the user asks about:
+    - Job roles they can apply for
+    - Where to find job postings
+    - Companies hiring for specific skills
+    - Remote work opportunities
+    - Salary information
+    - Career advice
+    
+    Args:
+        query: The search query describing what the user is looking for.
+               Examples: "remote python developer jobs", "companies hiring React developers"
+        skills: Optional comma-separated skills from the resume to enhance the search.
+               Will be appended to the query for more relevant results.
+    
+    Returns:
+        str: Search results containing job listings, company info, or career resources.
+    """
+    return search_jobs_web(query, skills)
+
+
+@tool
+@timed(TOOL_LATENCY, tool="career_advice_search")
 def career_advice_search(topic: str, context: str = "") -> str:
     """
     Search for career advice, interview tips, and professional development resources.
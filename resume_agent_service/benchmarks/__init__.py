@@ -0,0 +1 @@
+"""Offline benchmark and load-testing suites for the Resume Agent service."""
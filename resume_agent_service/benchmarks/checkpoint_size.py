@@ -0,0 +1,78 @@
+"""
+Checkpoint payload size and serializer cost per compression codec.
+
+Builds chat threads shaped like the agent's real turns (resume excerpts
+and web search results as tool outputs, see
+benchmarks.corpus.synthetic_chat_history), serializes the checkpoint the
+way MongoDBSaver stores it, and reports for each codec the stored size,
+the reduction against uncompressed msgpack and the encode/decode time.
+
+Usage:
+    python -m benchmarks.checkpoint_size
+    python -m benchmarks.checkpoint_size --turns 10,50 --json sizes.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+from benchmarks import fakes
+from benchmarks.corpus import synthetic_chat_history
+from benchmarks.micro import measure
+
+
+def run(turns: List[int], codecs: List[str], seeds: int) -> List[Dict]:
+    from langgraph.checkpoint.base import empty_checkpoint
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from app.memory.checkpoint_serde import CompressedSerializer
+
+    rows = []
+    for count in turns:
+        checkpoints = []
+        for seed in range(seeds):
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": synthetic_chat_history(count, seed=seed)}
+            checkpoints.append(checkpoint)
+        raw_size = None
+        for codec in codecs:
+            serde = CompressedSerializer(JsonPlusSerializer(), codec=None if codec == "none" else codec)
+            payloads = [serde.dumps_typed(checkpoint) for checkpoint in checkpoints]
+            size = sum(len(data) for _, data in payloads) / seeds
+            raw_size = raw_size or size
+            encode = measure(lambda: [serde.dumps_typed(c) for c in checkpoints], repeat=5)
+            decode = measure(lambda: [serde.loads_typed(p) for p in payloads], repeat=5)
+            rows.append({
+                "turns": count,
+                "codec": codec,
+                "bytes": round(size),
+                "reduction": round(1 - size / raw_size, 3),
+                "encode_us": round(encode["min_us"] / seeds, 1),
+                "decode_us": round(decode["min_us"] / seeds, 1),
+            })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Checkpoint size and serde cost per compression codec.")
+    parser.add_argument("--turns", default="5,25,100", help="Comma-separated thread lengths.")
+    parser.add_argument("--codecs", default="none,zlib,zstd")
+    parser.add_argument("--seeds", type=int, default=5, help="Threads averaged per length.")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file.")
+    args = parser.parse_args(argv)
+    fakes.install()
+
+    rows = run([int(t) for t in args.turns.split(",")], args.codecs.split(","), args.seeds)
+    print(f"{'turns':>5} {'codec':<6} {'bytes':>10} {'reduction':>10} {'encode':>12} {'decode':>12}")
+    for row in rows:
+        print(f"{row['turns']:>5} {row['codec']:<6} {row['bytes']:>10} {row['reduction']:>10.1%} "
+              f"{row['encode_us']:>10.1f}us {row['decode_us']:>10.1f}us")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
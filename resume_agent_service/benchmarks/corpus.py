@@ -0,0 +1,216 @@
+"""
+Synthetic resume corpus for benchmarks.
+
+Resumes are generated deterministically from a seed so every run (and every
+machine) benchmarks the same text. `resume_pdf` renders the lines into a
+minimal multi-page PDF that PyPDFLoader can parse, which avoids shipping
+binary fixtures or depending on a PDF writer library.
+
+App modules are imported lazily so callers can install the offline fakes
+(see benchmarks.fakes) before anything touches MongoDB.
+"""
+from __future__ import annotations
+
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ["Jane", "Arjun", "Maria", "Wei", "Fatima", "Liam", "Aiko", "Noah", "Priya", "Diego"]
+LAST_NAMES = ["Doe", "Sharma", "Garcia", "Chen", "Khan", "Murphy", "Tanaka", "Smith", "Iyer", "Lopez"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Analyst", "Backend Developer",
+          "Platform Engineer", "Machine Learning Engineer", "Tech Lead"]
+DEGREES = ["B.S. Computer Science", "M.S. Data Science", "B.Tech Information Technology", "MBA"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+OBJECTS = ["payment service", "data pipeline", "recommendation engine", "CI/CD workflow",
+           "customer dashboard", "search index", "billing platform", "monitoring stack"]
+RESULTS = ["reducing latency by {n}%", "increasing throughput {n}x", "saving ${n}k per year",
+           "cutting build times by {n}%", "serving {n}M requests per day"]
+
+# Named sizes used by the benchmark suites: (roles, bullets per role, projects)
+SIZES: Dict[str, tuple] = {
+    "small": (2, 3, 1),
+    "medium": (4, 5, 3),
+    "large": (8, 8, 6),
+}
+
+
+def synthetic_resume(seed: int = 0, size: str = "medium") -> List[str]:
+    """
+    Generate the lines of a plausible resume.
+
+    Args:
+        seed: Random seed; the same seed always yields the same resume.
+        size: One of SIZES ("small", "medium", "large").
+
+    Returns:
+        List of text lines, with section headings in upper case.
+    """
+    from app.tools.ats_scorer import ATS_KEYWORDS
+
+    rng = random.Random(seed)
+    roles, bullets, projects = SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(ATS_KEYWORDS["technical_skills"], 8) + rng.sample(ATS_KEYWORDS["soft_skills"], 3)
+
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)} "
+        f"| linkedin.com/in/{first.lower()}{last.lower()}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {roles * 2} years of experience building {rng.choice(OBJECTS)}s "
+        f"using {skills[0]} and {skills[1]}.",
+        "",
+        "EXPERIENCE",
+    ]
+    year = 2024
+    for _ in range(roles):
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)}, {start} - {year}")
+        for _ in range(bullets):
+            verb = rng.choice(ATS_KEYWORDS["action_verbs"]).capitalize()
+            result = rng.choice(RESULTS).format(n=rng.randint(2, 60))
+            lines.append(f"- {verb} the {rng.choice(OBJECTS)} with {rng.choice(skills)}, {result}")
+        year = start
+    lines += ["", "PROJECTS"]
+    for i in range(projects):
+        lines.append(f"- Project {i + 1}: {rng.choice(OBJECTS).title()} built with {rng.choice(skills)} "
+                     f"and {rng.choice(skills)}")
+    lines += [
+        "",
+        "EDUCATION",
+        f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {year - rng.randint(0, 2)}",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+    ]
+    return lines
+
+
+def synthetic_resume_text(seed: int = 0, size: str = "medium") -> str:
+    """Return a synthetic resume as a single newline-joined string."""
+    return "\n".join(synthetic_resume(seed, size))
+
+
+def synthetic_job_description(seed: int = 0, requirements: int = 12) -> str:
+    """
+    Generate a job posting: a title line, then one bullet per requirement
+    drawing on the same skills and objects as synthetic_resume.
+    """
+    from app.tools.ats_scorer import ATS_KEYWORDS
+
+    rng = random.Random(seed)
+    templates = [
+        "{n}+ years of experience with {skill}",
+        "Hands-on experience building a {obj} with {skill}",
+        "Strong {soft} and {soft2} skills",
+        "Experience operating a {obj} in production using {skill} and {skill2}",
+        "Familiarity with {skill} is a plus",
+    ]
+    lines = [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}", "", "Requirements:"]
+    for _ in range(requirements):
+        skill, skill2 = rng.sample(ATS_KEYWORDS["technical_skills"], 2)
+        soft, soft2 = rng.sample(ATS_KEYWORDS["soft_skills"], 2)
+        lines.append("- " + rng.choice(templates).format(
+            n=rng.randint(2, 8), skill=skill, skill2=skill2, soft=soft, soft2=soft2, obj=rng.choice(OBJECTS),
+        ))
+    return "\n".join(lines)
+
+
+def synthetic_job_posting(seed: int = 0) -> Dict[str, str]:
+    """A job posting as imported by app.services.job_index (one JSONL line)."""
+    rng = random.Random(seed)
+    description = synthetic_job_description(seed, requirements=rng.randint(4, 10))
+    title, _, company = description.splitlines()[0].partition(" at ")
+    return {
+        "id": f"job-{seed}",
+        "title": title,
+        "company": company,
+        "location": rng.choice(["Remote", "New York, NY", "Austin, TX", "Berlin", "Bangalore", "London"]),
+        "url": f"https://jobs.example.com/{seed}",
+        "description": description,
+    }
+
+
+QUESTIONS = ["What are my strongest skills?", "Summarize my experience.", "Which jobs should I apply for?",
+             "How can I improve my resume?", "Find remote roles that match my background.",
+             "What should I highlight in interviews?", "Is my education section strong enough?"]
+
+
+def synthetic_chat_history(turns: int, seed: int = 0, size: str = "medium") -> list:
+    """
+    Generate a chat thread's messages about a synthetic resume, shaped like
+    the agent's real turns: question, tool call, tool output (resume
+    excerpts or web search results, 1-3 KB) and a prose answer.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+    rng = random.Random(seed)
+    lines = synthetic_resume(seed, size)
+    messages = []
+    for i in range(turns):
+        question = rng.choice(QUESTIONS)
+        call_id = f"call_{seed}_{i}"
+        if rng.random() < 0.7:
+            start = rng.randrange(max(1, len(lines) - 20))
+            tool, output = "resume_rag_tool", "\n".join(lines[start:start + rng.randint(10, 25)])
+        else:
+            company, title = rng.choice(COMPANIES), rng.choice(TITLES)
+            tool, output = "job_search_tool", " ".join(
+                f"{title} at {rng.choice(COMPANIES)} - {rng.choice(['Remote', 'Hybrid', 'On-site'])}. "
+                f"Work on the {rng.choice(OBJECTS)} with {company} alumni; "
+                f"{rng.choice(RESULTS).format(n=rng.randint(2, 90))} expected. Apply at jobs.example.com/{rng.randint(1000, 9999)}."
+                for _ in range(rng.randint(8, 16))
+            )
+        answer = "Based on your resume, " + " ".join(rng.sample(lines, min(6, len(lines))))
+        messages += [
+            HumanMessage(content=question),
+            AIMessage(content="", tool_calls=[{"name": tool, "args": {"query": question}, "id": call_id}]),
+            ToolMessage(content=output, name=tool, tool_call_id=call_id),
+            AIMessage(content=answer),
+        ]
+    return messages
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def resume_pdf(lines: List[str], lines_per_page: int = 55) -> bytes:
+    """
+    Render text lines into a minimal PDF (Helvetica, one text object per page).
+
+    Args:
+        lines: Text lines to render; non-Latin-1 characters are replaced.
+        lines_per_page: Lines before starting a new page.
+
+    Returns:
+        PDF file bytes.
+    """
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    # Object layout: 1 catalog, 2 pages, 3 font, then (page, content) pairs
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        stream = "BT /F1 10 Tf 50 760 Td 13 TL\n" + "".join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {5 + 2 * i} 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream.encode('latin-1', 'replace'))} >>\nstream\n{stream}\nendstream")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out.encode("latin-1", "replace")))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out.encode("latin-1", "replace"))
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF"
+    return out.encode("latin-1", "replace")
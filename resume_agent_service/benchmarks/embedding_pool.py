@@ -0,0 +1,120 @@
+"""
+Embedding throughput and event-loop lag, in process vs. the worker pool.
+
+For each configuration (the model in the API process, then
+app.core.embedding_pool with 1..N workers) it embeds a batch of resume
+chunks from a thread, as ingest does under `asyncio.to_thread`, while a
+probe on the event loop sleeps 5 ms at a time and records how late it
+wakes up. Reports texts/s and the probe's p50/p95/max lag: with the
+model in process the lag grows with the GIL held by the model; with the
+pool it should stay near zero while throughput scales with cores.
+
+The default model is CpuBoundEmbeddings (pure-Python CPU per text, holding
+the GIL like tokenization); --model minilm runs the real
+sentence-transformers model (needs it installed and downloaded).
+
+Usage:
+    python -m benchmarks.embedding_pool
+    python -m benchmarks.embedding_pool --workers 1,2,4 --texts 512 --model minilm --json pool.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import fakes
+from benchmarks.corpus import synthetic_resume_text
+from benchmarks.fakes import CpuBoundEmbeddings
+
+_PROBE_INTERVAL = 0.005
+
+
+def _factory(model: str, seconds_per_text: float) -> Callable[[], Any]:
+    if model == "minilm":
+        from langchain_huggingface import HuggingFaceEmbeddings
+        from app.services.resume_service import EMBEDDING_MODEL
+        return partial(HuggingFaceEmbeddings, model_name=EMBEDDING_MODEL)
+    return partial(CpuBoundEmbeddings, seconds_per_text)
+
+
+def _texts(count: int) -> List[str]:
+    text = synthetic_resume_text(0, size="large")
+    chunks = [text[i:i + 800] for i in range(0, len(text), 800)]
+    return [f"{i} {chunks[i % len(chunks)]}" for i in range(count)]
+
+
+async def _measure(embeddings: Any, texts: List[str]) -> Dict[str, float]:
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(_PROBE_INTERVAL)
+            lags.append(time.perf_counter() - start - _PROBE_INTERVAL)
+
+    task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.to_thread(embeddings.embed_documents, texts)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    lags.sort()
+    return {
+        "texts_per_s": round(len(texts) / elapsed, 1),
+        "lag_p50_ms": round(statistics.median(lags) * 1000, 2),
+        "lag_p95_ms": round(lags[int(0.95 * (len(lags) - 1))] * 1000, 2),
+        "lag_max_ms": round(lags[-1] * 1000, 2),
+    }
+
+
+def run(workers: List[int], texts: int, model: str, seconds_per_text: float) -> List[Dict]:
+    from app.core.embedding_pool import PooledEmbeddings
+
+    batch = _texts(texts)
+    factory = _factory(model, seconds_per_text)
+    rows = []
+    configurations = [("in_process", 0)] + [(f"pool[{count}]", count) for count in workers]
+    for name, count in configurations:
+        embeddings = PooledEmbeddings(factory, workers=count) if count else factory()
+        try:
+            # Warm up: model load (and worker start-up) isn't what is measured
+            embeddings.embed_documents(batch[:count or 1] * 2)
+            rows.append({"config": name, "workers": count, **asyncio.run(_measure(embeddings, batch))})
+        finally:
+            if count:
+                embeddings.shutdown()
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Embedding throughput and loop lag per worker count.")
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({1, 2, os.cpu_count() or 1})),
+                        help="Comma-separated pool sizes.")
+    parser.add_argument("--texts", type=int, default=256, help="Texts in the embedded batch.")
+    parser.add_argument("--model", choices=["cpu", "minilm"], default="cpu")
+    parser.add_argument("--seconds-per-text", type=float, default=0.002, help="CPU per text of the cpu model.")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file.")
+    args = parser.parse_args(argv)
+    fakes.install()
+
+    rows = run([int(n) for n in args.workers.split(",")], args.texts, args.model, args.seconds_per_text)
+    print(f"{'config':<12} {'texts/s':>10} {'lag p50':>10} {'lag p95':>10} {'lag max':>10}")
+    for row in rows:
+        print(f"{row['config']:<12} {row['texts_per_s']:>10.1f} {row['lag_p50_ms']:>8.2f}ms "
+              f"{row['lag_p95_ms']:>8.2f}ms {row['lag_max_ms']:>8.2f}ms")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
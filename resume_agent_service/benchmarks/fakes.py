@@ -0,0 +1,307 @@
+"""
+Deterministic offline stand-ins for every external dependency of the service.
+
+- MongoDB / Atlas: `mongomock` provides an in-memory client; Atlas
+  `$vectorSearch` is replaced by an in-process cosine search over the same
+  collection, so ingest writes and retrieval reads go through the real
+  service code paths.
+- Gemini / Groq: `FakeChatModel` streams a canned answer token by token with
+  configurable first-token and inter-token latency, and can emit tool calls.
+  It replaces the provider model *inside* the LLM gateway, so rate limiting,
+  admission, retries and hedging are exercised; `error_rate` injects
+  transient 503s.
+- HuggingFace embeddings: `FakeEmbeddings` hashes words into a fixed-size
+  unit vector (same dimension as all-MiniLM-L6-v2).
+- DuckDuckGo: `FakeSearch` returns canned results after a configurable delay.
+
+Call `install()` BEFORE importing any `app.*` module: the checkpointer opens
+its MongoDB connection at import time.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+import random
+from typing import Any, Dict, List, Optional
+
+EMBEDDING_DIM = 384
+
+# Questions the fake model answers from the prompt's resume profile without tools
+_PROFILE_QUESTION = re.compile(r"\b(whose|name|contact|email|phone|skills?|education|degree|years)\b", re.I)
+
+
+@dataclass
+class FakeConfig:
+    """Latency and behaviour knobs for the fake dependencies (seconds)."""
+    first_token_latency: float = 0.3
+    token_latency: float = 0.02
+    answer_tokens: int = 60
+    tool_calls: List[str] = field(default_factory=lambda: ["resume_rag_tool"])
+    suggestion_latency: float = 0.5
+    embed_latency_per_text: float = 0.0
+    search_latency: float = 0.4
+    vector_search_latency: float = 0.0
+    error_rate: float = 0.0
+
+
+_config = FakeConfig()
+_installed = False
+
+
+def _hash_vector(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    vector = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()):
+        digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class CpuBoundEmbeddings:
+    """
+    Embedding stand-in that spends `seconds_per_text` of pure-Python CPU on
+    each text, holding the GIL the way tokenization does. Module-level (unlike
+    FakeEmbeddings) so it can be sent to embedding worker processes.
+    """
+
+    def __init__(self, seconds_per_text: float = 0.002):
+        self.seconds_per_text = seconds_per_text
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            deadline = time.perf_counter() + self.seconds_per_text
+            while time.perf_counter() < deadline:
+                pass
+            vectors.append(_hash_vector(text))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class FakeProviderError(Exception):
+    """Transient provider failure (looks like an HTTP 503 to the gateway)."""
+    status_code = 503
+
+
+def _build_fakes():
+    """Define the LangChain-based fakes (imports deferred until install)."""
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+    from langchain_core.retrievers import BaseRetriever
+
+    class FakeEmbeddings(Embeddings):
+        """Bag-of-words hashing embeddings; similar texts get similar vectors."""
+
+        def embed_documents(self, texts: List[str]) -> List[List[float]]:
+            if _config.embed_latency_per_text:
+                time.sleep(_config.embed_latency_per_text * len(texts))
+            return [_hash_vector(t) for t in texts]
+
+        def embed_query(self, text: str) -> List[float]:
+            return self.embed_documents([text])[0]
+
+    class FakeChatModel(BaseChatModel):
+        """
+        Chat model that answers from a fixed script.
+
+        On the first call of a turn (last message is the user's) it requests
+        the configured tools; once tool results are in, it streams an answer.
+        Without bound tools (the ATS suggestion call) it returns a JSON list.
+        """
+        tools_bound: bool = False
+
+        @property
+        def _llm_type(self) -> str:
+            return "fake-chat"
+
+        def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+            return FakeChatModel(tools_bound=True)
+
+        def _reply(self, messages: List[Any]) -> Any:
+            if not self.tools_bound:
+                return AIMessage(content=json.dumps([f"Suggestion {i + 1}" for i in range(5)]))
+            last = messages[-1]
+            system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+            # Like the real model, answer profile facts straight from the prompt
+            answer_from_profile = "RESUME PROFILE" in system and isinstance(last, HumanMessage) \
+                and _PROFILE_QUESTION.search(last.content)
+            if isinstance(last, HumanMessage) and _config.tool_calls and not answer_from_profile:
+                match = re.search(r'thread_id="([^"]+)"', system)
+                thread_id = match.group(1) if match else None
+                calls = []
+                for name in _config.tool_calls:
+                    args = {"query": last.content, "thread_id": thread_id} \
+                        if name in ("resume_rag_tool", "job_recommendation_tool") \
+                        else {"query": last.content} if name == "job_search_tool" \
+                        else {"topic": last.content} if name == "career_advice_search" \
+                        else {"resume_text": last.content}
+                    calls.append({"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:12]}"})
+                return AIMessage(content="", tool_calls=calls)
+            words = ["Based", "on", "your", "resume,"] + [f"word{i}" for i in range(_config.answer_tokens)]
+            return AIMessage(content=" ".join(words))
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            delay = _config.first_token_latency if self.tools_bound else _config.suggestion_latency
+            time.sleep(delay)
+            return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+        def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+            message = self._reply(messages)
+            time.sleep(_config.first_token_latency if self.tools_bound else _config.suggestion_latency)
+            if _config.error_rate and random.random() < _config.error_rate:
+                raise FakeProviderError("503 Service Unavailable (injected)")
+            if message.tool_calls:
+                yield ChatGenerationChunk(message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                        for i, c in enumerate(message.tool_calls)
+                    ],
+                ))
+                return
+            tokens = message.content.split(" ")
+            for i, token in enumerate(tokens):
+                if i:
+                    time.sleep(_config.token_latency)
+                text = token if i == 0 else " " + token
+                # BaseChatModel reports each yielded chunk to the callbacks itself
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+
+    class InMemoryRetriever(BaseRetriever):
+        """Retriever facade over InMemoryVectorSearch (as_retriever())."""
+        store: Any
+        k: int = 5
+        pre_filter: Dict[str, Any] = {}
+
+        def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Any]:
+            vector = self.store.embedding.embed_query(query)
+            return self.store.similarity_search_by_vector(vector, k=self.k, pre_filter=self.pre_filter)
+
+    class InMemoryVectorSearch:
+        """Drop-in for MongoDBAtlasVectorSearch: brute-force cosine search over the collection."""
+
+        def __init__(self, collection, embedding, index_name: str = "vector_index",
+                     embedding_key: str = "embedding", **kwargs):
+            self.collection = collection
+            self.embedding = embedding
+
+        def similarity_search_by_vector(self, embedding: List[float], k: int = 4,
+                                        pre_filter: Optional[Dict[str, Any]] = None,
+                                        include_embeddings: bool = False, **kwargs) -> List[Any]:
+            if _config.vector_search_latency:
+                time.sleep(_config.vector_search_latency)
+            scored = []
+            hidden = ("_id", "text") if include_embeddings else ("_id", "text", "embedding")
+            for doc in self.collection.find(pre_filter or {}):
+                vector = doc.get("embedding") or []
+                score = sum(a * b for a, b in zip(embedding, vector))
+                metadata = {k: v for k, v in doc.items() if k not in hidden}
+                scored.append((score, Document(page_content=doc.get("text", ""), metadata=metadata)))
+            scored.sort(key=lambda pair: pair[0], reverse=True)
+            return [doc for _, doc in scored[:k]]
+
+        def as_retriever(self, search_type: str = "similarity", search_kwargs: Optional[Dict] = None):
+            search_kwargs = search_kwargs or {}
+            return InMemoryRetriever(
+                store=self,
+                k=search_kwargs.get("k", 5),
+                pre_filter=search_kwargs.get("pre_filter", {}),
+            )
+
+    class FakeSearch:
+        """Stand-in for DuckDuckGoSearchRun."""
+
+        def run(self, query: str) -> str:
+            time.sleep(_config.search_latency)
+            return " ".join(f"Result {i} for {query}: example.com/jobs/{i}" for i in range(5))
+
+    return FakeEmbeddings, FakeChatModel, InMemoryVectorSearch, FakeSearch
+
+
+def _install_mongomock() -> None:
+    import mongomock
+    import mongomock.collection
+    import pymongo
+
+    # langchain_mongodb subscripts MongoClient in annotations at import time,
+    # so import it before swapping the client class.
+    import langchain_mongodb  # noqa: F401
+
+    client = mongomock.MongoClient()
+
+    class _FakeMongoClient:
+        def __new__(cls, *args, **kwargs):
+            return client
+
+        def __class_getitem__(cls, item):
+            return cls
+
+    pymongo.MongoClient = _FakeMongoClient
+
+    # Recent pymongo passes `sort` to bulk update builders; mongomock predates it.
+    original_add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+    def add_update(self, *args, sort=None, **kwargs):
+        return original_add_update(self, *args, **kwargs)
+
+    mongomock.collection.BulkOperationBuilder.add_update = add_update
+
+
+def install(config: Optional[FakeConfig] = None) -> FakeConfig:
+    """
+    Replace MongoDB, the LLMs, embeddings and web search with offline fakes.
+
+    Safe to call more than once; later calls only update the configuration.
+
+    Args:
+        config: Latency/behaviour settings; defaults to FakeConfig().
+
+    Returns:
+        The active FakeConfig (mutable; changes apply to subsequent calls).
+    """
+    global _installed
+    if config is not None:
+        _config.__dict__.update(config.__dict__)
+    if _installed:
+        return _config
+
+    os.environ.setdefault("GOOGLE_API_KEY", "offline")
+    os.environ.setdefault("GROQ_API_KEY", "offline")
+    os.environ.setdefault("MONGODB_URI", "mongodb://offline")
+    # Fake providers have no quota; keep the token buckets out of the way
+    # unless the caller sets these explicitly to benchmark the limiter.
+    for name, value in (("GEMINI_RPM", "1000000"), ("GEMINI_BURST", "10000"),
+                        ("GROQ_RPM", "1000000"), ("GROQ_BURST", "10000")):
+        os.environ.setdefault(name, value)
+    _install_mongomock()
+
+    FakeEmbeddings, FakeChatModel, InMemoryVectorSearch, FakeSearch = _build_fakes()
+
+    from app.services import resume_service
+    from app.storage import mongo as mongo_storage
+    from app.graph import nodes
+    from app.tools import ats_scorer, web_search_tool
+
+    resume_service._embeddings = FakeEmbeddings()
+    mongo_storage.MongoDBAtlasVectorSearch = InMemoryVectorSearch
+    # Swap the provider model under the gateway, keeping its limits and policies
+    nodes.llm = FakeChatModel()
+    nodes.llm_with_tools = nodes.llm_with_tools.model_copy(update={"runnable": nodes.llm.bind_tools([])})
+    ats_scorer._llm = ats_scorer._get_llm().model_copy(update={"runnable": FakeChatModel()})
+    web_search_tool.DuckDuckGoSearchRun = FakeSearch
+    web_search_tool.SEARCH_AVAILABLE = True
+
+    _installed = True
+    return _config
@@ -0,0 +1,95 @@
+"""
+Job index build time, search latency and recall.
+
+Generates a synthetic posting corpus (benchmarks.corpus), imports it the
+way `python -m app.services.job_index` does (JSONL -> embeddings -> IVF
+index on disk), reloads it memory-mapped, and ranks postings for
+synthetic resumes. For each nprobe it reports search p50/p95 and
+recall@k against an exact search over every posting.
+
+Embeddings come from the offline fakes (hashed bag of words), so absolute
+recall differs from MiniLM's; latency and the recall/nprobe trade-off are
+what the benchmark compares.
+
+Usage:
+    python -m benchmarks.job_index
+    python -m benchmarks.job_index --postings 100000 --nprobe 1,4,8,32 --json job_index.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks import fakes
+from benchmarks.corpus import synthetic_job_posting, synthetic_resume
+
+
+def run(postings: int, nprobes: List[int], queries: int, k: int, lists: Optional[int]) -> Dict:
+    import numpy as np
+    from app.services.job_index import JobIndex, build_index
+    from app.services.resume_service import embed_documents
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, "postings.jsonl")
+        with open(source, "w") as f:
+            for seed in range(postings):
+                f.write(json.dumps(synthetic_job_posting(seed)) + "\n")
+        start = time.perf_counter()
+        build_index(source, os.path.join(workdir, "index"), lists)
+        build_seconds = time.perf_counter() - start
+        index = JobIndex.load(os.path.join(workdir, "index"))
+
+        resumes = [np.asarray(embed_documents(synthetic_resume(seed)), dtype=np.float32) for seed in range(queries)]
+        vectors = [r / np.maximum(np.linalg.norm(r, axis=1, keepdims=True), 1e-9) for r in resumes]
+        query_vectors = [v.mean(axis=0) for v in vectors]
+        lists_count = len(index.centroids)
+        exact = [{m.posting["id"] for m in index.search(q, k, nprobe=lists_count)} for q in query_vectors]
+
+        rows = []
+        for nprobe in nprobes + [lists_count]:
+            samples, hits = [], 0
+            for query, truth in zip(query_vectors, exact):
+                t = time.perf_counter()
+                found = index.search(query, k, nprobe=nprobe)
+                samples.append(time.perf_counter() - t)
+                hits += len(truth & {m.posting["id"] for m in found})
+            samples.sort()
+            rows.append({
+                "nprobe": nprobe if nprobe < lists_count else f"{nprobe} (exact)",
+                "p50_ms": round(statistics.median(samples) * 1000, 3),
+                "p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 3),
+                f"recall@{k}": round(hits / (len(exact) * k), 3),
+            })
+    return {"postings": postings, "lists": lists_count, "build_seconds": round(build_seconds, 2), "searches": rows}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Job index build time, search latency and recall.")
+    parser.add_argument("--postings", type=int, default=20000)
+    parser.add_argument("--nprobe", default="1,4,8,16", help="Comma-separated cells scanned per search.")
+    parser.add_argument("--queries", type=int, default=50, help="Synthetic resumes searched.")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--lists", type=int, default=None, help="IVF cells (default about sqrt(postings)).")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file.")
+    args = parser.parse_args(argv)
+    fakes.install()
+
+    result = run(args.postings, [int(n) for n in args.nprobe.split(",")], args.queries, args.k, args.lists)
+    print(f"{result['postings']} postings in {result['lists']} cells, built in {result['build_seconds']}s")
+    print(f"{'nprobe':<14} {'p50':>10} {'p95':>10} {'recall@' + str(args.k):>10}")
+    for row in result["searches"]:
+        print(f"{str(row['nprobe']):<14} {row['p50_ms']:>8.3f}ms {row['p95_ms']:>8.3f}ms {row[f'recall@{args.k}']:>10.3f}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
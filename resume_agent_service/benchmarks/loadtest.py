@@ -0,0 +1,242 @@
+"""
+Offline load test for the Resume Agent service.
+
+Runs the real FastAPI app on a loopback uvicorn server with every external
+dependency replaced by the deterministic fakes in benchmarks.fakes, then
+drives /resume/upload, /chat and /chat/stream at a fixed concurrency and
+reports throughput, p50/p95/p99 latency and (for streaming) time to first
+token. No network access is needed beyond 127.0.0.1.
+
+Usage:
+    python -m benchmarks.loadtest --scenarios upload,chat,stream \\
+        --concurrency 16 --requests 200 --first-token-latency 0.3 --token-latency 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from benchmarks import fakes
+from benchmarks.corpus import SIZES, resume_pdf, synthetic_resume
+
+QUESTIONS = [
+    "Whose resume is this?",
+    "What are my key skills?",
+    "Why is my ATS score low?",
+    "Summarize my experience.",
+    "Which jobs should I apply for?",
+]
+
+
+@dataclass
+class ScenarioResult:
+    """Raw samples collected for one scenario."""
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    ttfts: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        done = len(self.latencies)
+        return {
+            "scenario": self.name,
+            "requests": done + self.errors,
+            "errors": self.errors,
+            "throughput_rps": round(done / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": _ms(percentile(self.latencies, 50)),
+            "p95_ms": _ms(percentile(self.latencies, 95)),
+            "p99_ms": _ms(percentile(self.latencies, 99)),
+            "ttft_p50_ms": _ms(percentile(self.ttfts, 50)),
+            "ttft_p95_ms": _ms(percentile(self.ttfts, 95)),
+            "ttft_p99_ms": _ms(percentile(self.ttfts, 99)),
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; None for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def start_server(app) -> int:
+    """Serve `app` on an ephemeral loopback port in a daemon thread."""
+    import uvicorn
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.01)
+    return port
+
+
+async def _upload(client, index: int, size: str, thread_id: Optional[str] = None) -> str:
+    pdf = resume_pdf(synthetic_resume(seed=index, size=size))
+    params = {"user_id": f"user-{index % 50}"}
+    if thread_id:
+        params["thread_id"] = thread_id
+    response = await client.post("/resume/upload", params=params,
+                                 files={"file": (f"resume-{index}.pdf", pdf, "application/pdf")})
+    response.raise_for_status()
+    return response.json()["thread_id"]
+
+
+async def _chat(client, thread_id: str, message: str) -> None:
+    response = await client.post("/chat", json={"thread_id": thread_id, "message": message})
+    response.raise_for_status()
+
+
+async def _chat_stream(client, thread_id: str, message: str) -> float:
+    """Run one streaming request; return seconds to the first token event."""
+    start = time.perf_counter()
+    ttft = None
+    async with client.stream("POST", "/chat/stream",
+                             json={"thread_id": thread_id, "message": message}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if ttft is None and line.startswith("data: {\"token\""):
+                ttft = time.perf_counter() - start
+            if line.startswith("data: {\"error\""):
+                raise RuntimeError(line)
+    return ttft if ttft is not None else time.perf_counter() - start
+
+
+async def run_scenario(client, name: str, requests: int, concurrency: int,
+                       threads: List[str], size: str) -> ScenarioResult:
+    """Issue `requests` calls with at most `concurrency` in flight."""
+    result = ScenarioResult(name=name)
+    counter = iter(range(requests))
+
+    async def worker(worker_id: int) -> None:
+        # Each worker owns one thread so a thread never has two turns in flight
+        thread_id = threads[worker_id % len(threads)] if threads else None
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                if name == "upload":
+                    await _upload(client, 10_000 + i, size)
+                elif name == "chat":
+                    await _chat(client, thread_id, QUESTIONS[i % len(QUESTIONS)])
+                else:
+                    result.ttfts.append(await _chat_stream(client, thread_id, QUESTIONS[i % len(QUESTIONS)]))
+                result.latencies.append(time.perf_counter() - start)
+            except Exception as exc:
+                logging.getLogger("benchmarks.loadtest").warning("%s request failed: %s", name, exc)
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict]:
+    import httpx
+    from app.main import app
+
+    # app.main configures INFO logging on import; per-request logs would
+    # dominate the measurement, so apply the requested level afterwards.
+    logging.getLogger().setLevel(args.log_level)
+    port = start_server(app)
+    summaries = []
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout, limits=limits) as client:
+        scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+        threads: List[str] = []
+        if any(s in ("chat", "stream") for s in scenarios):
+            threads = list(await asyncio.gather(
+                *(_upload(client, i, args.size) for i in range(args.concurrency))))
+        for name in scenarios:
+            if name not in ("upload", "chat", "stream"):
+                raise SystemExit(f"Unknown scenario: {name}")
+            result = await run_scenario(client, name, args.requests, args.concurrency, threads, args.size)
+            summaries.append(result.summary())
+    return summaries
+
+
+def _print_table(summaries: List[Dict]) -> None:
+    columns = ["scenario", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms",
+               "ttft_p50_ms", "ttft_p95_ms", "ttft_p99_ms"]
+    widths = {c: max(len(c), *(len(str(s[c])) for s in summaries)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for summary in summaries:
+        print("  ".join(str(summary[c] if summary[c] is not None else "-").ljust(widths[c]) for c in columns))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline load test for the Resume Agent service.")
+    parser.add_argument("--scenarios", default="upload,chat,stream",
+                        help="Comma-separated list of upload, chat, stream.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario.")
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium", help="Synthetic resume size.")
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.02)
+    parser.add_argument("--answer-tokens", type=int, default=60)
+    parser.add_argument("--tool-calls", default="resume_rag_tool",
+                        help="Comma-separated tools the fake LLM calls each turn ('' for none).")
+    parser.add_argument("--suggestion-latency", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=0.4)
+    parser.add_argument("--vector-search-latency", type=float, default=0.0,
+                        help="Added latency of each vector search (Atlas round-trip).")
+    parser.add_argument("--no-rag-prefetch", action="store_true",
+                        help="Disable the speculative retrieval started with the first LLM call.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of fake LLM calls that fail with a transient 503.")
+    parser.add_argument("--answer-cache", action="store_true",
+                        help="Keep the semantic answer cache on (repeated questions then skip the LLM).")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", dest="json_path", help="Also write the summary to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # The scenarios cycle through a handful of questions, so with the cache on
+    # nearly every chat turn would be a hit; measure the full loop by default.
+    os.environ.setdefault("ANSWER_CACHE_ENABLED", "true" if args.answer_cache else "false")
+    if args.no_rag_prefetch:
+        os.environ["RAG_PREFETCH_ENABLED"] = "false"
+    fakes.install(fakes.FakeConfig(
+        first_token_latency=args.first_token_latency,
+        token_latency=args.token_latency,
+        answer_tokens=args.answer_tokens,
+        tool_calls=[t for t in args.tool_calls.split(",") if t],
+        suggestion_latency=args.suggestion_latency,
+        search_latency=args.search_latency,
+        vector_search_latency=args.vector_search_latency,
+        error_rate=args.error_rate,
+    ))
+    summaries = asyncio.run(main_async(args))
+    _print_table(summaries)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
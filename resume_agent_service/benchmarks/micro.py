@@ -0,0 +1,345 @@
+"""
+Micro-benchmarks for the service's pure-CPU hot paths, with regression gates.
+
+Cases run over the synthetic resume corpus (benchmarks.corpus) at several
+sizes and parameter scales, so growing the ATS keyword list, the streamed
+answer or the chat history shows up as a measured cost:
+
+- ats_rules:        score_resume_rules keyword matching + format regexes
+- clean_output:     clean_tool_output_from_response on a tool-prefixed answer
+- answer_scan:      find_answer_start re-run per streamed token (chat_stream)
+- section_split:    ResumeSectionSplitter(1000) on a resume (ingest chunking), one page and paged
+- profile_extract:  rule-based structured profile extraction at ingest
+- bm25_build:       per-thread BM25 index construction at ingest
+- bm25_search:      BM25 query ranking (the embedding-free retrieval path)
+- context_assemble: merging/budgeting the top-5 chunks into resume_rag_tool output
+- checkpoint_serde: checkpoint serializer round-trip for a chat history, with and without zstd
+- embed:            embedding throughput (real MiniLM model when available)
+
+Usage:
+    python -m benchmarks.micro                 # run and print
+    python -m benchmarks.micro --save          # store as the new baseline
+    python -m benchmarks.micro --compare       # exit 1 on regressions
+
+Baselines are machine-specific: regenerate them with --save on the machine
+(or CI runner class) that runs --compare.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks import fakes
+from benchmarks.corpus import SIZES, synthetic_chat_history, synthetic_resume, synthetic_resume_text
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+
+# name -> zero-argument callable to time
+Case = Tuple[str, Callable[[], object]]
+
+
+@contextmanager
+def _scaled_keywords(factor: int) -> Iterator[None]:
+    """Temporarily grow every ATS keyword list `factor`-fold with synthetic terms."""
+    from app.tools import ats_scorer
+
+    original = {k: list(v) for k, v in ats_scorer.ATS_KEYWORDS.items()}
+    for category, words in ats_scorer.ATS_KEYWORDS.items():
+        words.extend(f"{category}-term-{i}" for i in range(len(words) * (factor - 1)))
+    try:
+        yield
+    finally:
+        for category, words in original.items():
+            ats_scorer.ATS_KEYWORDS[category][:] = words
+
+
+def _ats_cases() -> List[Case]:
+    from app.tools.ats_scorer import score_resume_rules
+
+    cases = []
+    for size in SIZES:
+        text = synthetic_resume_text(seed=1, size=size)
+        cases.append((f"ats_rules[{size}]", lambda text=text: score_resume_rules(text)))
+    return cases
+
+
+def _ats_scaled_case(factor: int) -> Case:
+    from app.tools.ats_scorer import score_resume_rules
+
+    text = synthetic_resume_text(seed=1, size="large")
+
+    def run():
+        with _scaled_keywords(factor):
+            return score_resume_rules(text)
+    return (f"ats_rules[large,keywords_x{factor}]", run)
+
+
+def _clean_output_cases() -> List[Case]:
+    from app.main import clean_tool_output_from_response
+
+    cases = []
+    for size in SIZES:
+        resume = synthetic_resume_text(seed=2, size=size)
+        tool_json = json.dumps({"found": True, "content": resume[:400], "query": "skills"})
+        answer = "Based on the resume, " + resume.replace("\n", " ")
+        text = tool_json + "\n" + answer
+        cases.append((f"clean_output[{size}]", lambda text=text: clean_tool_output_from_response(text)))
+    return cases
+
+
+def _answer_scan_cases() -> List[Case]:
+    from app.main import find_answer_start
+
+    cases = []
+    for tokens in (100, 500, 2000):
+        # Worst case: no indicator ever appears, so every token rescans the buffer
+        stream = [f"word{i} " for i in range(tokens)]
+
+        def run(stream=stream):
+            buffered = ""
+            for token in stream:
+                buffered += token
+                find_answer_start(buffered.lower())
+        cases.append((f"answer_scan[tokens={tokens}]", run))
+    return cases
+
+
+def _sse_cases() -> List[Case]:
+    from app.core.sse import SSEWriter
+
+    tokens = [f" word{i}" for i in range(2000)]
+    cases = []
+    # flush_interval is large so only the size policy applies (deterministic framing)
+    for name, flush_bytes in (("per_token", 0), ("coalesced", 256)):
+        def run(flush_bytes=flush_bytes):
+            writer = SSEWriter(flush_bytes=flush_bytes, flush_interval=60.0)
+            frames = [writer.token(token) for token in tokens]
+            frames.extend(writer.flush())
+        cases.append((f"sse_frames[{name},tokens=2000]", run))
+    return cases
+
+
+def _split_cases() -> List[Case]:
+    from langchain_core.documents import Document
+    from app.services.resume_splitter import ResumeSectionSplitter
+
+    splitter = ResumeSectionSplitter(chunk_size=1000)
+    cases = []
+    for size in SIZES:
+        docs = [Document(page_content=synthetic_resume_text(seed=3, size=size))]
+        cases.append((f"section_split[{size}]", lambda docs=docs: splitter.split_documents(docs)))
+
+    # Sections running across page breaks (tests/test_resume_splitter.py checks the chunks)
+    lines = synthetic_resume(seed=3, size="large")
+    pages = [Document(page_content="\n".join(lines[i:i + 20])) for i in range(0, len(lines), 20)]
+    cases.append((f"section_split[large,pages={len(pages)}]", lambda: splitter.split_documents(pages)))
+    return cases
+
+
+def _profile_cases() -> List[Case]:
+    from app.services.profile_extractor import extract_profile
+
+    cases = []
+    for size in SIZES:
+        text = synthetic_resume_text(seed=6, size=size)
+        cases.append((f"profile_extract[{size}]", lambda text=text: extract_profile(text)))
+    return cases
+
+
+def _bm25_cases() -> List[Case]:
+    from langchain_core.documents import Document
+    from app.services.lexical_index import BM25Index
+    from app.services.resume_splitter import ResumeSectionSplitter
+
+    splitter = ResumeSectionSplitter(chunk_size=1000)
+    cases = []
+    for size in SIZES:
+        docs = splitter.split_documents([Document(page_content=synthetic_resume_text(seed=7, size=size))])
+        chunks = [doc.page_content for doc in docs]
+        metadatas = [doc.metadata for doc in docs]
+        index = BM25Index.build(chunks, metadatas)
+        cases.append((f"bm25_build[{size}]", lambda c=chunks, m=metadatas: BM25Index.build(c, m)))
+        cases.append((f"bm25_search[{size}]", lambda index=index: index.search("kubernetes experience", 10)))
+    return cases
+
+
+def _context_assemble_cases() -> List[Case]:
+    from langchain_core.documents import Document
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from app.services.context_assembler import assemble_context
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=800, chunk_overlap=150, separators=["\n\n", "\n", " ", ""], add_start_index=True
+    )
+    chunks = splitter.split_documents([Document(page_content=synthetic_resume_text(seed=8, size="large"))])
+    picked = [chunks[i % len(chunks)] for i in (3, 1, 2, 7, 5)]
+    # Same chunks as older threads store them (no offsets): merged by text matching
+    legacy = [Document(page_content=doc.page_content) for doc in picked]
+    return [
+        ("context_assemble[offsets]", lambda: assemble_context(picked, 600)),
+        ("context_assemble[text_match]", lambda: assemble_context(legacy, 600)),
+    ]
+
+
+def _checkpoint_serde_cases() -> List[Case]:
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from app.memory.checkpoint_serde import CompressedSerializer
+
+    cases = []
+    for codec in (None, "zstd"):
+        serde = CompressedSerializer(JsonPlusSerializer(), codec=codec)
+        for turns in (5, 25, 100):
+            checkpoint = {"channel_values": {"messages": synthetic_chat_history(turns, seed=4)}}
+
+            def run(serde=serde, checkpoint=checkpoint):
+                serde.loads_typed(serde.dumps_typed(checkpoint))
+            cases.append((f"checkpoint_serde[turns={turns},codec={codec or 'none'}]", run))
+    return cases
+
+
+def _embed_cases() -> List[Case]:
+    try:
+        from langchain_huggingface import HuggingFaceEmbeddings
+        embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    except Exception as exc:  # model or sentence-transformers unavailable offline
+        print(f"skipping embed cases: {exc}", file=sys.stderr)
+        return []
+    text = synthetic_resume_text(seed=5, size="large")
+    chunks = [text[i:i + 800] for i in range(0, len(text), 650)]
+    return [(f"embed[minilm,chunks={len(chunks)}]", lambda: embeddings.embed_documents(chunks))]
+
+
+def collect_cases() -> List[Case]:
+    """Build every benchmark case (imports app modules; fakes must be installed)."""
+    cases: List[Case] = []
+    cases += _ats_cases()
+    cases += [_ats_scaled_case(4), _ats_scaled_case(16)]
+    cases += _clean_output_cases()
+    cases += _answer_scan_cases()
+    cases += _sse_cases()
+    cases += _split_cases()
+    cases += _profile_cases()
+    cases += _bm25_cases()
+    cases += _context_assemble_cases()
+    cases += _checkpoint_serde_cases()
+    cases += _embed_cases()
+    return cases
+
+
+def measure(func: Callable[[], object], repeat: int = 9, min_time: float = 0.1) -> Dict[str, float]:
+    """
+    Time `func` like timeit: calibrate a loop count so one repeat takes at
+    least `min_time`, then report the best and median per-call time.
+
+    Regression gates use the best time, which is the least sensitive to
+    scheduler noise on shared machines.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "loops": loops,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Return a description of every case slower than baseline * (1 + tolerance)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["min_us"] > base["min_us"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {result['min_us']:.1f}us vs baseline {base['min_us']:.1f}us "
+                f"(+{(result['min_us'] / base['min_us'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CPU hot-path micro-benchmarks with regression gates.")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this string.")
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per repeat.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline.")
+    parser.add_argument("--compare", action="store_true", help="Fail if any case regressed past tolerance.")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown (0.3 = 30%%).")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    fakes.install()
+
+    baseline: Dict[str, Dict] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("cases", {})
+
+    results: Dict[str, Dict] = {}
+    for name, func in collect_cases():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(func, repeat=args.repeat, min_time=args.min_time)
+        base = baseline.get(name)
+        delta = f"{(results[name]['min_us'] / base['min_us'] - 1) * 100:+.0f}%" if base else "new"
+        print(f"{name:<40} {results[name]['min_us']:>12.1f} us   {delta}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        merged = {**baseline, **results}
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "processor": platform.processor(),
+                    "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                },
+                "cases": dict(sorted(merged.items())),
+            }, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+
+    if args.compare:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nno regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
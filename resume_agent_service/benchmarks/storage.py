@@ -0,0 +1,156 @@
+"""
+Round-trip latency of the storage backends (STORAGE_BACKEND).
+
+Runs the same operations against each backend's stores and checkpointer,
+built directly rather than through the configured singletons: a thread
+document update and read, a checkpoint put and get_tuple (the two calls
+of every graph step), a chunk insert of one resume, and a thread-scoped
+vector search. Reports p50/p95 per operation.
+
+SQLite uses a fresh database file in a temporary directory. Mongo uses
+--mongo-uri when given, otherwise the in-process mongomock client, which
+has no network hop and so shows the floor of the driver path rather than
+a deployment's latency. The Mongo vector search is the benchmarks'
+stand-in for Atlas `$vectorSearch` (a find plus ranking in Python), not
+Atlas itself.
+
+Usage:
+    python -m benchmarks.storage
+    python -m benchmarks.storage --iterations 500 --mongo-uri mongodb://localhost:27017 --json storage.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import pymongo
+
+from benchmarks import fakes
+from benchmarks.corpus import synthetic_chat_history, synthetic_resume_text
+
+# Captured before fakes.install() swaps the client for mongomock
+_MongoClient = pymongo.MongoClient
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50_us": round(statistics.median(samples) * 1e6, 1),
+        "p95_us": round(samples[int(0.95 * (len(samples) - 1))] * 1e6, 1),
+    }
+
+
+def _time(func: Callable[[int], object], iterations: int) -> Dict[str, float]:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return _percentiles(samples)
+
+
+def _backends(mongo_uri: Optional[str], workdir: str):
+    """(name, thread documents, chunk store, checkpointer) per backend."""
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from app.memory.checkpoint_serde import create_serde
+    from app.memory.checkpointer import InstrumentedMongoDBSaver, InstrumentedSqliteSaver
+    from app.storage.mongo import MongoChunkStore, MongoThreadDocuments
+    from app.storage.sqlite import SqliteChunkStore, SqliteDatabase, SqliteThreadDocuments
+
+    db = SqliteDatabase(os.path.join(workdir, "bench.db"))
+    yield (
+        "sqlite",
+        SqliteThreadDocuments(db),
+        SqliteChunkStore(db),
+        InstrumentedSqliteSaver(db.connect(), serde=create_serde(JsonPlusSerializer())),
+    )
+
+    client = _MongoClient(mongo_uri) if mongo_uri else pymongo.MongoClient()
+    db_name = f"storage_bench_{uuid.uuid4().hex[:8]}"
+    try:
+        yield (
+            "mongo" if mongo_uri else "mongomock",
+            MongoThreadDocuments(client[db_name]["threads"]),
+            MongoChunkStore(client[db_name]["vectorstore"]),
+            InstrumentedMongoDBSaver(client=client, db_name=db_name, serde=create_serde(JsonPlusSerializer())),
+        )
+    finally:
+        client.drop_database(db_name)
+
+
+def run(iterations: int, turns: int, mongo_uri: Optional[str]) -> List[Dict]:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+    from app.services import resume_service
+
+    embeddings = resume_service._get_embeddings()
+    chunks = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50).split_text(synthetic_resume_text(0))
+    vectors = embeddings.embed_documents(chunks)
+    query = embeddings.embed_query("python backend experience")
+    messages = synthetic_chat_history(turns)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, threads, store, saver in _backends(mongo_uri, workdir):
+            thread_ids = [f"bench-{i}" for i in range(iterations)]
+
+            def save_thread(i):
+                threads.set(thread_ids[i], {"user_id": "bench", "filename": "r.pdf", "chunks": len(chunks)}, upsert=True)
+
+            def put_checkpoint(i):
+                checkpoint = create_checkpoint(empty_checkpoint(), None, i)
+                checkpoint["channel_values"] = {"messages": messages}
+                config = {"configurable": {"thread_id": thread_ids[i], "checkpoint_ns": ""}}
+                saver.put(config, checkpoint, {"source": "loop", "step": i}, {})
+
+            def add_chunks(i):
+                store.add(chunks, vectors, [{"thread_id": thread_ids[i], "user_id": "bench"}] * len(chunks))
+
+            search = store.vector_search(embeddings)
+            results = {
+                "thread_save": _time(save_thread, iterations),
+                "thread_get": _time(lambda i: threads.get(thread_ids[i], exclude=("full_text",)), iterations),
+                "checkpoint_put": _time(put_checkpoint, iterations),
+                "checkpoint_get": _time(
+                    lambda i: saver.get_tuple({"configurable": {"thread_id": thread_ids[i], "checkpoint_ns": ""}}),
+                    iterations,
+                ),
+                "chunks_add": _time(add_chunks, iterations),
+                "vector_search": _time(
+                    lambda i: search.similarity_search_by_vector(query, k=5, pre_filter={"thread_id": {"$eq": thread_ids[i]}}),
+                    iterations,
+                ),
+            }
+            for operation, stats in results.items():
+                rows.append({"backend": name, "operation": operation, **stats})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Round-trip latency per storage backend.")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per operation (one thread each).")
+    parser.add_argument("--turns", type=int, default=10, help="Chat turns in each stored checkpoint.")
+    parser.add_argument("--mongo-uri", help="Benchmark this MongoDB instead of in-process mongomock.")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file.")
+    args = parser.parse_args(argv)
+    fakes.install()
+
+    rows = run(args.iterations, args.turns, args.mongo_uri)
+    print(f"{'backend':<10} {'operation':<15} {'p50':>12} {'p95':>12}")
+    for row in rows:
+        print(f"{row['backend']:<10} {row['operation']:<15} {row['p50_us']:>10.1f}us {row['p95_us']:>10.1f}us")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""
+Tests run offline: benchmarks.fakes replaces MongoDB (mongomock), the LLMs,
+embeddings and web search before any app module is imported.
+"""
+from benchmarks import fakes
+
+fakes.install()
@@ -0,0 +1,114 @@
+import time
+from uuid import UUID
+
+import mongomock
+import pytest
+
+from app.memory.checkpoint_compaction import CheckpointCompactor, checkpoint_time
+
+_DAY = 86400
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def checkpoint_id(created: float, sequence: int = 0) -> str:
+    """uuid6 checkpoint id created at Unix time `created`, as LangGraph writes them."""
+    timestamp = int(created * 1e7) + _UUID_EPOCH_OFFSET
+    value = (timestamp >> 12) << 80 | 6 << 76 | (timestamp & 0x0FFF) << 64 | 0b10 << 62 | sequence
+    return str(UUID(int=value))
+
+
+def add_checkpoints(collections, thread_id: str, created: list, checkpoint_ns: str = "") -> list:
+    """Insert one checkpoint and two pending writes per creation time; returns the checkpoint ids."""
+    checkpoints, writes = collections
+    ids = [checkpoint_id(t, i) for i, t in enumerate(created)]
+    for cid in ids:
+        scope = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": cid}
+        checkpoints.insert_one({**scope, "checkpoint": b"x" * 64})
+        writes.insert_many([{**scope, "task_id": "t", "idx": idx} for idx in range(2)])
+    return ids
+
+
+def remaining(collection, thread_id: str) -> list:
+    return sorted(doc["checkpoint_id"] for doc in collection.find({"thread_id": thread_id}))
+
+
+@pytest.fixture
+def collections():
+    db = mongomock.MongoClient().checkpointing_db
+    return db.checkpoints, db.checkpoint_writes
+
+
+def compactor(collections, **options) -> CheckpointCompactor:
+    options = {"keep_latest": 3, "max_age_seconds": 0, "batch_size": 2, **options}
+    return CheckpointCompactor(*collections, **options)
+
+
+def test_checkpoint_time_decodes_uuid6():
+    now = time.time()
+    assert checkpoint_time(checkpoint_id(now)) == pytest.approx(now, abs=1e-3)
+    assert checkpoint_time(str(UUID(int=1))) is None
+    assert checkpoint_time("not-a-uuid") is None
+
+
+def test_keeps_latest_checkpoints_per_thread_and_namespace(collections):
+    checkpoints, writes = collections
+    now = time.time()
+    long_ids = add_checkpoints(collections, "long", [now - 60 + i for i in range(6)])
+    nested_ids = add_checkpoints(collections, "long", [now - 30 + i for i in range(5)], checkpoint_ns="tool")
+    short_ids = add_checkpoints(collections, "short", [now - 10, now - 5])
+
+    report = compactor(collections).run()
+
+    assert remaining(checkpoints, "long") == sorted(long_ids[-3:] + nested_ids[-3:])
+    assert remaining(writes, "long") == sorted(2 * (long_ids[-3:] + nested_ids[-3:]))
+    assert remaining(checkpoints, "short") == short_ids
+    assert report.threads_compacted == 1 and report.threads_expired == 0
+    assert report.checkpoints_deleted == 5 and report.writes_deleted == 10
+
+
+def test_dry_run_counts_without_deleting(collections):
+    checkpoints, writes = collections
+    add_checkpoints(collections, "t", [time.time() - 60 + i for i in range(5)])
+
+    report = compactor(collections, keep_latest=1).run(dry_run=True)
+
+    assert report.checkpoints_deleted == 4 and report.writes_deleted == 8
+    assert checkpoints.count_documents({}) == 5 and writes.count_documents({}) == 10
+
+
+def test_expiry_follows_the_newest_checkpoint(collections):
+    checkpoints, writes = collections
+    now = time.time()
+    add_checkpoints(collections, "stale", [now - 40 * _DAY, now - 31 * _DAY])
+    # Old history, but used yesterday: only trimmed to the newest checkpoints
+    active_ids = add_checkpoints(collections, "active", [now - 90 * _DAY, now - 60 * _DAY, now - 50 * _DAY, now - _DAY])
+
+    report = compactor(collections, keep_latest=2, max_age_seconds=30 * _DAY).run()
+
+    assert remaining(checkpoints, "stale") == [] and remaining(writes, "stale") == []
+    assert remaining(checkpoints, "active") == active_ids[-2:]
+    assert report.threads_expired == 1 and report.threads_compacted == 1
+
+
+def test_expiry_never_reaches_newer_checkpoints(collections):
+    checkpoints, _ = collections
+    now = time.time()
+    add_checkpoints(collections, "t", [now - 40 * _DAY])
+    compaction = compactor(collections, max_age_seconds=30 * _DAY)
+    scan = compaction._threads
+
+    def scan_then_write():
+        # A turn commits a checkpoint between the scan and the delete
+        rows = list(scan())
+        add_checkpoints(collections, "t", [now])
+        yield from rows
+
+    compaction._threads = scan_then_write
+    compaction.run()
+
+    assert remaining(checkpoints, "t") == [checkpoint_id(now)]
+
+
+def test_keep_latest_must_be_positive(collections):
+    with pytest.raises(ValueError):
+        compactor(collections, keep_latest=0)
@@ -0,0 +1,42 @@
+from app.services.job_match import _keywords, extract_requirements
+from benchmarks.corpus import synthetic_job_description
+
+JD = """Senior Software Engineer at Hooli
+Mountain View, CA
+
+About the role:
+We are looking for an engineer to own our payments platform.
+Requirements
+- 5+ years of experience with Java and Spring
+- Experience With Kubernetes In Production
+* Strong communication skills
+- Python
+"""
+
+
+def test_extract_requirements_skips_headings_and_fragments():
+    assert extract_requirements(JD) == [
+        "We are looking for an engineer to own our payments platform",
+        "5+ years of experience with Java and Spring",
+        "Experience With Kubernetes In Production",
+        "Strong communication skills",
+    ]
+
+
+def test_extract_requirements_splits_long_paragraphs_and_limits():
+    paragraph = " ".join(f"You will build service number {i} end to end." for i in range(30))
+    requirements = extract_requirements(paragraph, limit=5)
+    assert requirements == [f"You will build service number {i} end to end" for i in range(5)]
+
+
+def test_synthetic_posting_yields_only_its_bullets():
+    text = synthetic_job_description(seed=1, requirements=6)
+    bullets = [line[2:] for line in text.splitlines() if line.startswith("- ")]
+    assert extract_requirements(text) == list(dict.fromkeys(bullets))
+
+
+def test_keywords_match_whole_words():
+    assert "java" not in _keywords("Built single-page apps in JavaScript")
+    assert "git" not in _keywords("Open source work on GitHub")
+    found = _keywords("Java, Git and C++ (plus node.js) with strong communication")
+    assert {"java", "git", "c++", "node.js", "communication"} <= set(found)
@@ -0,0 +1,38 @@
+from collections import Counter
+
+import pytest
+from langchain_core.documents import Document
+
+from app.services.resume_splitter import ResumeSectionSplitter
+from benchmarks.corpus import SIZES, synthetic_resume
+
+
+def _pages(seed: int, size: str, lines_per_page: int) -> list:
+    lines = synthetic_resume(seed=seed, size=size)
+    return [
+        Document(page_content="\n".join(lines[i:i + lines_per_page]), metadata={"page": i // lines_per_page})
+        for i in range(0, len(lines), lines_per_page)
+    ]
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("lines_per_page", [8, 20, 55])
+def test_chunks_only_combine_whole_sections(size, lines_per_page):
+    splitter = ResumeSectionSplitter(chunk_size=1000)
+    chunks = splitter.split_documents(_pages(3, size, lines_per_page))
+    chunks_per_section = Counter(section for chunk in chunks for section in chunk.metadata["sections"])
+    for chunk in chunks:
+        sections = chunk.metadata["sections"]
+        if len(sections) > 1:
+            assert all(chunks_per_section[section] == 1 for section in sections), sections
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_chunks_are_bounded_slices_of_their_page(seed):
+    pages = _pages(seed, "large", 20)
+    splitter = ResumeSectionSplitter(chunk_size=500)
+    for chunk in splitter.split_documents(pages):
+        page = pages[chunk.metadata["page"]].page_content
+        start = chunk.metadata["start_index"]
+        assert page[start:start + len(chunk.page_content)] == chunk.page_content
+        assert len(chunk.page_content) <= 500
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.core.sse import SSEWriter, encode_event
+from app.core.stream_replay import StreamExpiredError, StreamRegistry, parse_last_event_id
+
+
+async def _frames(count: int):
+    for i in range(count):
+        yield [encode_event({"token": str(i)})]
+
+
+async def _read(iterator) -> bytes:
+    return b"".join([frame async for frame in iterator])
+
+
+def _generation(registry: StreamRegistry, key=None, frames: int = 3):
+    generation = registry.create("thread", SSEWriter(flush_bytes=0, flush_interval=0.0), key)
+    generation.start(_frames(frames))
+    return generation
+
+
+def test_parse_last_event_id():
+    assert parse_last_event_id("abc:12") == ("abc", 12)
+    assert parse_last_event_id("a:b:3") == ("a:b", 3)
+    assert parse_last_event_id("abc") is None
+    assert parse_last_event_id(None) is None
+
+
+def test_replays_frames_after_the_last_event_id():
+    async def run():
+        registry = StreamRegistry(max_events=10, ttl_seconds=60)
+        generation = _generation(registry, key="k")
+        body = await _read(registry.resume(generation, 1))
+        generation.succeeded = True  # set by the chat producer after its done frame
+        assert registry.get(generation.stream_id) is generation
+        assert registry.for_key("k") is generation
+        return generation.stream_id, body
+
+    stream_id, body = asyncio.run(run())
+    assert f"id: {stream_id}:1\n".encode() not in body
+    assert f"id: {stream_id}:2\n".encode() in body and f"id: {stream_id}:3\n".encode() in body
+
+
+def test_finished_generations_are_evicted_without_new_streams():
+    async def run():
+        registry = StreamRegistry(max_events=10, ttl_seconds=0.05)
+        generation = _generation(registry, key="k")
+        await _read(generation.events())
+        assert registry.get(generation.stream_id) is generation
+        await asyncio.sleep(0.1)
+        # The eviction timer ran with no create or lookup in between
+        assert registry._streams == {} and registry._by_key == {}
+        with pytest.raises(StreamExpiredError):
+            registry.resume(generation, 0)
+        assert registry.get(generation.stream_id) is None
+        assert registry.for_key("k") is None
+
+    asyncio.run(run())
+
+
+def test_lookups_sweep_expired_generations():
+    async def run():
+        registry = StreamRegistry(max_events=10, ttl_seconds=60)
+        stale, live = _generation(registry), _generation(registry)
+        await _read(stale.events())
+        stale.finished_at -= 120
+        assert registry.get(live.stream_id) is live
+        assert stale.stream_id not in registry._streams
+
+    asyncio.run(run())
+
+
+def test_lagging_reader_gets_an_error_frame():
+    async def run():
+        registry = StreamRegistry(max_events=2, ttl_seconds=60)
+        generation = _generation(registry, frames=5)
+        await asyncio.sleep(0)
+        iterator = generation._follow(1)
+        await asyncio.sleep(0.01)
+        return await _read(iterator)
+
+    assert b"stream_expired" in asyncio.run(run())
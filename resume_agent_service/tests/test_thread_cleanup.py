@@ -0,0 +1,132 @@
+import asyncio
+import os
+import struct
+import time
+import uuid
+
+import httpx
+import pytest
+from bson import ObjectId
+
+from app.main import app
+from app.memory.checkpointer import get_checkpointer
+from app.memory.thread_store import delete_thread_metadata, get_user_thread_ids, save_thread_metadata, thread_exists
+from app.services.resume_service import get_vector_collection
+from app.services.thread_cleanup import collect_orphans
+from tests.test_checkpoint_compaction import add_checkpoints
+
+_HOUR = 3600
+
+
+def object_id(created: float) -> ObjectId:
+    """Chunk _id inserted at Unix time `created`."""
+    return ObjectId(struct.pack(">I", int(created)) + os.urandom(8))
+
+
+def add_thread(user_id: str, created: float, metadata: bool = True) -> str:
+    """A thread with two chunks, two checkpoints and their writes, all created at `created`."""
+    thread_id = f"thread-{uuid.uuid4().hex}"
+    if metadata:
+        save_thread_metadata(thread_id, user_id, "resume.pdf", pages=1, chunks=2)
+    get_vector_collection().insert_many([
+        {"_id": object_id(created), "thread_id": thread_id, "user_id": user_id, "text": "Python", "embedding": [0.0]}
+        for _ in range(2)
+    ])
+    checkpointer = get_checkpointer()
+    add_checkpoints((checkpointer.checkpoint_collection, checkpointer.writes_collection), thread_id, [created - 1, created])
+    return thread_id
+
+
+def stored(thread_id: str) -> dict:
+    checkpointer = get_checkpointer()
+    return {
+        "metadata": thread_exists(thread_id),
+        "vectors": get_vector_collection().count_documents({"thread_id": thread_id}),
+        "checkpoints": checkpointer.checkpoint_collection.count_documents({"thread_id": thread_id}),
+        "checkpoint_writes": checkpointer.writes_collection.count_documents({"thread_id": thread_id}),
+    }
+
+
+_KEPT = {"metadata": True, "vectors": 2, "checkpoints": 2, "checkpoint_writes": 4}
+_GONE = {"metadata": False, "vectors": 0, "checkpoints": 0, "checkpoint_writes": 0}
+
+
+def delete(path: str) -> httpx.Response:
+    async def send():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.delete(path)
+    return asyncio.run(send())
+
+
+def test_delete_thread_leaves_other_threads_of_the_user():
+    user_id = f"user-{uuid.uuid4().hex}"
+    now = time.time()
+    deleted, kept = add_thread(user_id, now), add_thread(user_id, now)
+
+    response = delete(f"/threads/{deleted}")
+
+    assert response.status_code == 200
+    assert response.json()["deleted"]["vectors"] == 2
+    assert stored(deleted) == _GONE
+    assert stored(kept) == _KEPT
+    assert get_user_thread_ids(user_id) == [kept]
+    assert delete(f"/threads/{deleted}").status_code == 404
+
+
+def test_delete_user_threads_includes_uploads_without_metadata():
+    user_id = f"user-{uuid.uuid4().hex}"
+    other = add_thread(f"user-{uuid.uuid4().hex}", time.time())
+    threads = [add_thread(user_id, time.time()), add_thread(user_id, time.time(), metadata=False)]
+
+    response = delete(f"/users/{user_id}/threads")
+
+    assert response.status_code == 200
+    assert response.json()["deleted"]["threads"] == 2
+    assert all(stored(thread_id) == _GONE for thread_id in threads)
+    assert stored(other) == _KEPT
+
+
+def test_orphan_gc_respects_grace_period():
+    now = time.time()
+    old_orphan = add_thread("u", now - 2 * _HOUR)
+    delete_thread_metadata([old_orphan])
+    new_orphan = add_thread("u", now - 60, metadata=False)
+    owned = add_thread("u", now - 2 * _HOUR)
+
+    dry_run = collect_orphans(grace_seconds=_HOUR, dry_run=True)
+    assert dry_run.dry_run and dry_run.vectors >= 2
+    assert stored(old_orphan) == {**_KEPT, "metadata": False}
+
+    collect_orphans(grace_seconds=_HOUR)
+
+    assert stored(old_orphan) == _GONE
+    assert stored(new_orphan) == {**_KEPT, "metadata": False}
+    assert stored(owned) == _KEPT
+
+
+def test_orphan_gc_keeps_data_written_after_the_scan(monkeypatch):
+    from app.services import thread_cleanup
+
+    now = time.time()
+    orphan = add_thread("u", now - 2 * _HOUR, metadata=False)
+    scan = thread_cleanup._thread_newest
+
+    def scan_then_write(collection, newest_field):
+        # The thread id is reused by a new upload between the scan and the delete
+        rows = list(scan(collection, newest_field))
+        get_vector_collection().insert_one({"_id": object_id(now + 5), "thread_id": orphan, "text": "new"})
+        yield from rows
+
+    monkeypatch.setattr(thread_cleanup, "_thread_newest", scan_then_write)
+    collect_orphans(grace_seconds=_HOUR)
+
+    assert get_vector_collection().count_documents({"thread_id": orphan}) >= 1
+    assert stored(orphan)["checkpoints"] == 0
+
+
+def test_orphan_gc_requires_mongo(monkeypatch):
+    from app.services import thread_cleanup
+
+    monkeypatch.setattr(thread_cleanup.settings, "STORAGE_BACKEND", "sqlite")
+    with pytest.raises(RuntimeError):
+        collect_orphans()